@@ -9,7 +9,7 @@ with proper error handling and logging.
 import asyncio
 import os
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 from openai import AsyncAzureOpenAI
 
@@ -62,7 +62,8 @@ class AzureOpenAITextClient:
         self,
         messages: List[Dict[str, Any]],
         max_tokens: int = 1000,
-        temperature: float = 0.1
+        temperature: float = 0.1,
+        response_format: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         Send a chat completion request to Azure OpenAI.
@@ -71,6 +72,7 @@ class AzureOpenAITextClient:
             messages: List of message dictionaries
             max_tokens: Maximum tokens to generate
             temperature: Temperature for generation
+            response_format: Optional structured-output request (e.g. a JSON schema)
             
         Returns:
             The AI response content as a string
@@ -82,11 +84,13 @@ class AzureOpenAITextClient:
         logger.info(f"   Max tokens: {max_tokens}")
         
         try:
+            extra_kwargs = {"response_format": response_format} if response_format else {}
             response = await self.client.chat.completions.create(
                 model=self.deployment,  # Use deployment name as model
                 messages=messages,  # type: ignore
                 max_tokens=max_tokens,
-                temperature=temperature
+                temperature=temperature,
+                **extra_kwargs
             )
             
             content = response.choices[0].message.content
@@ -120,7 +124,8 @@ async def get_azure_text_client() -> AzureOpenAITextClient:
 async def azure_text_completion(
     messages: List[Dict[str, Any]],
     max_tokens: int = 1000,
-    temperature: float = 0.1
+    temperature: float = 0.1,
+    response_format: Optional[Dict[str, Any]] = None
 ) -> str:
     """
     Convenience function for Azure OpenAI text completion.
@@ -129,9 +134,10 @@ async def azure_text_completion(
         messages: List of message dictionaries
         max_tokens: Maximum tokens to generate
         temperature: Temperature for generation
+        response_format: Optional structured-output request (e.g. a JSON schema)
         
     Returns:
         The AI response content as a string
     """
     client = await get_azure_text_client()
-    return await client.chat_completion(messages, max_tokens, temperature)
\ No newline at end of file
+    return await client.chat_completion(messages, max_tokens, temperature, response_format)
\ No newline at end of file
@@ -1,8 +1,15 @@
 import sqlite3
+import zlib
 
 def check_database():
     try:
         conn = sqlite3.connect('gum.db')
+        # observations_fts reads the observation_texts view, which inflates cold
+        # bodies with GUM's gum_inflate (see gum.models.register_sql_functions)
+        conn.create_function(
+            "gum_inflate", 1,
+            lambda body: None if body is None else zlib.decompress(body).decode("utf-8"),
+        )
         cursor = conn.cursor()
         
         # Check tables
@@ -27,7 +27,7 @@ import pytz
 import json
 
 import uvicorn
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile, status, Request
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile, status, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
 try:
@@ -37,6 +37,7 @@ except ImportError:
     EventSourceResponse = None
 from PIL import Image
 from pydantic import BaseModel, Field
+from sqlalchemy.exc import DBAPIError
 from rate_limiter import rate_limiter
 
 from dotenv import load_dotenv
@@ -50,8 +51,10 @@ from gum.schemas import (
     SelfReflectionResponse,
     SpecificInsight
 )
-from gum.observers import Observer
-from unified_ai_client import UnifiedAIClient
+from gum.observers import Observer, get_api_observer
+from gum.search_profile import SearchProfile
+from gum.structured_output import decode_json, get_parse_stats
+from unified_ai_client import UnifiedAIClient, get_unified_client
 
 # Gumbo (intelligent suggestions) imports with graceful fallback
 try:
@@ -151,7 +154,8 @@ class QueryRequest(BaseModel):
     query: str = Field(..., description="The search query", min_length=1)
     user_name: Optional[str] = Field(None, description="User name (optional)")
     limit: Optional[int] = Field(10, description="Maximum number of results to return", ge=1, le=100)
-    mode: Optional[str] = Field("OR", description="Search mode (OR/AND)")
+    mode: Optional[str] = Field("OR", description="Search mode (OR/AND/PHRASE/HYBRID)")
+    debug: Optional[bool] = Field(False, description="Include per-stage timings and the query plan")
 
 
 class ObservationResponse(BaseModel):
@@ -178,6 +182,7 @@ class QueryResponse(BaseModel):
     total_results: int = Field(..., description="Total number of results found")
     query: str = Field(..., description="The original query")
     execution_time_ms: float = Field(..., description="Query execution time in milliseconds")
+    debug: Optional[dict] = Field(None, description="Search profile (only when debug was requested)")
 
 
 class HealthResponse(BaseModel):
@@ -238,21 +243,6 @@ class ChatResponse(BaseModel):
     conversation_id: str = Field(..., description="Unique identifier for this conversation")
 
 
-# === Mock Observer Class ===
-
-class APIObserver(Observer):
-    """Mock observer for API-submitted observations."""
-    
-    def __init__(self, name: Optional[str] = None):
-        super().__init__(name or "api_controller")
-    
-    async def _worker(self):
-        """Required abstract method - not used for API submissions."""
-        # API observer doesn't need a background worker since observations are submitted directly
-        while self._running:
-            await asyncio.sleep(1)
-
-
 # === Helper Functions ===
 
 def parse_datetime(date_value) -> datetime:
@@ -694,6 +684,67 @@ async def reset_rate_limits(endpoint: Optional[str] = None):
             detail="Error resetting rate limits"
         )
 
+# LLM response cache monitoring endpoint
+@app.get("/admin/llm-cache", response_model=dict)
+async def get_llm_cache_stats():
+    """Get hit/miss statistics of the LLM response cache"""
+    try:
+        client = await get_unified_client()
+        return {
+            "enabled": client.cache is not None,
+            "stats": client.cache_stats(),
+            "parse_stats": get_parse_stats(),
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except Exception as e:
+        logger.error(f"Error getting LLM cache stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error retrieving LLM cache statistics"
+        )
+
+@app.get("/admin/query-cache", response_model=dict)
+async def get_query_cache_stats():
+    """Get hit/miss statistics of the /query result cache"""
+    try:
+        gum_inst = await ensure_gum_instance()
+        return {
+            "enabled": bool(gum_inst.query_cache_stats),
+            "stats": gum_inst.query_cache_stats,
+            "data_generation": gum_inst.data_generation,
+            "timestamp": serialize_datetime(datetime.now(timezone.utc))
+        }
+    except Exception as e:
+        logger.error(f"Error getting query cache stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error retrieving query cache statistics"
+        )
+
+@app.post("/admin/fts/reindex", response_model=dict)
+async def reindex_fts(tokenizer: str):
+    """Rebuild the full-text indexes with another tokenizer while serving queries"""
+    gum_inst = await ensure_gum_instance()
+    try:
+        rebuilt = await gum_inst.reindex_fts(tokenizer)
+    except (ValueError, DBAPIError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid tokenizer {tokenizer!r}: {e}"
+        )
+    except Exception as e:
+        logger.error(f"Error re-indexing FTS tables: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error re-indexing full-text search tables"
+        )
+    logger.info(f"FTS re-index to '{tokenizer}' rebuilt: {rebuilt or 'nothing'}")
+    return {
+        "tokenizer": tokenizer,
+        "rebuilt": rebuilt,
+        "timestamp": serialize_datetime(datetime.now(timezone.utc))
+    }
+
 # === API Endpoints ===
 
 @app.get("/health", response_model=HealthResponse)
@@ -735,38 +786,48 @@ async def cleanup_database(user_name: Optional[str] = None):
         propositions_deleted = 0
         junction_records_deleted = 0
         
-        # Clean up database
-        async with gum_inst._session() as session:
-            from gum.models import Observation, Proposition, observation_proposition, proposition_parent
-            from sqlalchemy import delete, text
-            
+        from gum.models import Observation, Proposition, observation_proposition, proposition_parent
+        from sqlalchemy import delete, text
+
+        # Clean up database (through the writer, so it lands between ingest commits)
+        async def _delete_all(session):
             # Delete in proper order to avoid foreign key constraints
             
             # First, delete all junction table entries
             junction_obs_result = await session.execute(delete(observation_proposition))
             junction_prop_result = await session.execute(delete(proposition_parent))
-            junction_records_deleted = junction_obs_result.rowcount + junction_prop_result.rowcount
             
             # Then delete all observations
             obs_result = await session.execute(delete(Observation))
-            observations_deleted = obs_result.rowcount
             
             # Then delete all propositions
             prop_result = await session.execute(delete(Proposition))
-            propositions_deleted = prop_result.rowcount
             
             # Clear the FTS tables as well
             await session.execute(text("DELETE FROM propositions_fts"))
             await session.execute(text("DELETE FROM observations_fts"))
-            
-            # Commit the transaction
-            await session.commit()
+            return (
+                obs_result.rowcount,
+                prop_result.rowcount,
+                junction_obs_result.rowcount + junction_prop_result.rowcount,
+            )
+
+        observations_deleted, propositions_deleted, junction_records_deleted = (
+            await gum_inst.write(_delete_all)
+        )
+
+        # proposition ids start over at 1, so the dense vectors no longer match
+        if gum_inst.embedding_index is not None:
+            await gum_inst.embedding_index.reset()
         
-        # Run VACUUM outside of the session/transaction context
+        # VACUUM cannot run inside a write batch; the writer runs it between two
+        async def _vacuum(conn):
+            # converts older databases so retention can reclaim space incrementally
+            await conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+            await conn.exec_driver_sql("VACUUM")
+
         try:
-            async with gum_inst._session() as vacuum_session:
-                await vacuum_session.execute(text("VACUUM"))
-                await vacuum_session.commit()
+            await gum_inst._writer.run_exclusive(_vacuum)
         except Exception as vacuum_error:
             logger.warning(f"VACUUM operation failed: {vacuum_error}")
             # Continue anyway as the cleanup was successful
@@ -887,10 +948,8 @@ async def submit_text_observation(request: TextObservationRequest):
         gum_inst = await ensure_gum_instance(request.user_name)
         logger.info("GUM instance obtained successfully")
         
-        # Create mock observer
-        logger.info(" Creating API observer...")
-        observer = APIObserver(request.observer_name)
-        logger.info(f"API observer created: {observer._name}")
+        # Shared, task-free observer for this source
+        observer = get_api_observer(request.observer_name)
         
         # Create update
         logger.info("Creating update object...")
@@ -907,7 +966,7 @@ async def submit_text_observation(request: TextObservationRequest):
         logger.info(f"    Observer: {request.observer_name}")
         
         try:
-            await gum_inst._default_handler(observer, update)
+            await gum_inst.ingest(update, observer_name=observer.name)
             logger.info("GUM processing completed successfully")
         except Exception as gum_error:
             logger.error(f"GUM processing failed: {type(gum_error).__name__}: {str(gum_error)}")
@@ -970,8 +1029,8 @@ async def submit_image_observation(
         # Get GUM instance
         gum_inst = await ensure_gum_instance(user_name)
         
-        # Create mock observer
-        observer = APIObserver(observer_name)
+        # Shared, task-free observer for this source
+        observer = get_api_observer(observer_name)
         
         # Create update with analysis
         update_content = f"Image analysis of {file.filename}: {analysis}"
@@ -981,7 +1040,7 @@ async def submit_image_observation(
         )
         
         # Process through GUM
-        await gum_inst._default_handler(observer, update)
+        await gum_inst.ingest(update, observer_name=observer.name)
         
         processing_time = (time.time() - start_time) * 1000
         
@@ -1006,8 +1065,12 @@ async def submit_image_observation(
 
 
 @app.post("/query", response_model=QueryResponse)
-async def query_gum(request: QueryRequest):
-    """Query GUM for insights and propositions."""
+async def query_gum(request: QueryRequest, response: Response, debug: bool = False):
+    """Query GUM for insights and propositions.
+
+    Set ``debug`` in the body or as ``?debug=true`` to get stage timings, row
+    counts, the SQL run and the candidate query plan; debug queries skip the cache.
+    """
     try:
         start_time = time.time()
         logger.info(f"Received query: {request.query}")
@@ -1019,11 +1082,15 @@ async def query_gum(request: QueryRequest):
         limit = request.limit if request.limit is not None else 10
         mode = request.mode or "default"
         
-        results = await gum_inst.query(
+        profile = SearchProfile() if debug or request.debug else None
+        results, cache_status = await gum_inst.query_with_cache_status(
             request.query,
             limit=limit,
-            mode=mode
+            mode=mode,
+            profile=profile
         )
+        response.headers["X-Cache"] = cache_status
+        response.headers["X-Data-Generation"] = str(gum_inst.data_generation)
         
         # Format results
         propositions = []
@@ -1044,7 +1111,8 @@ async def query_gum(request: QueryRequest):
             propositions=propositions,
             total_results=len(results),
             query=request.query,
-            execution_time_ms=execution_time
+            execution_time_ms=execution_time,
+            debug={**profile.as_dict(), "cache": cache_status} if profile else None
         )
         
     except Exception as e:
@@ -1069,7 +1137,7 @@ async def list_observations(
         gum_inst = await ensure_gum_instance(user_name)
         
         # Query recent observations from database
-        async with gum_inst._session() as session:
+        async with gum_inst._read_session() as session:
             from gum.models import Observation
             from sqlalchemy import select, desc
             
@@ -1120,11 +1188,14 @@ async def list_propositions(
         gum_inst = await ensure_gum_instance(user_name)
         
         # Query recent propositions from database
-        async with gum_inst._session() as session:
+        async with gum_inst._read_session() as session:
             from gum.models import Proposition
             from sqlalchemy import select, desc, asc
             
-            stmt = select(Proposition)
+            from gum.db_utils import PROPOSITION_SUMMARY
+            
+            # superseded revisions are not listed
+            stmt = select(*PROPOSITION_SUMMARY).where(Proposition.is_leaf)
             
             # Apply confidence filter if specified
             if confidence_min is not None:
@@ -1142,7 +1213,7 @@ async def list_propositions(
             stmt = stmt.limit(limit).offset(offset)
             
             result = await session.execute(stmt)
-            propositions = result.scalars().all()
+            propositions = result.all()
             
             response = []
             for prop in propositions:
@@ -1178,7 +1249,7 @@ async def get_propositions_count(
         gum_inst = await ensure_gum_instance(user_name)
         
         # Query count from database
-        async with gum_inst._session() as session:
+        async with gum_inst._read_session() as session:
             from gum.models import Proposition
             from sqlalchemy import select, func
             
@@ -1252,16 +1323,18 @@ async def get_propositions_by_hour(
         gum_inst = await ensure_gum_instance(user_name)
         
         # Query propositions grouped by hour
-        async with gum_inst._session() as session:
+        async with gum_inst._read_session() as session:
             from gum.models import Proposition
             from sqlalchemy import select, func, extract, and_
+            from gum.db_utils import PROPOSITION_SUMMARY
             
             # Get current time to filter out future hours
             now = datetime.now(timezone.utc)
             
             # Build base query for the target date using the calculated UTC range
-            stmt = select(Proposition).where(
+            stmt = select(*PROPOSITION_SUMMARY).where(
                 and_(
+                    Proposition.is_leaf,
                     Proposition.created_at >= utc_start,
                     Proposition.created_at <= utc_end,
                     Proposition.created_at <= now  # Only past hours
@@ -1276,7 +1349,7 @@ async def get_propositions_by_hour(
             stmt = stmt.order_by(Proposition.created_at)
             
             result = await session.execute(stmt)
-            propositions = result.scalars().all()
+            propositions = result.all()
             
             # Group propositions by hour (convert UTC to local time)
             hourly_groups = {}
@@ -1377,16 +1450,18 @@ async def generate_self_reflection(
         utc_end = local_end.astimezone(pytz.UTC)
         
         # Query propositions for the date
-        async with gum_inst._session() as session:
+        async with gum_inst._read_session() as session:
             from gum.models import Proposition
             from sqlalchemy import select, and_
+            from gum.db_utils import PROPOSITION_SUMMARY
             
             # Get current time to filter out future hours
             now = datetime.now(timezone.utc)
             
             # Build base query for the target date using the calculated UTC range
-            stmt = select(Proposition).where(
+            stmt = select(*PROPOSITION_SUMMARY).where(
                 and_(
+                    Proposition.is_leaf,
                     Proposition.created_at >= utc_start,
                     Proposition.created_at <= utc_end,
                     Proposition.created_at <= now  # Only past hours
@@ -1401,7 +1476,7 @@ async def generate_self_reflection(
             stmt = stmt.order_by(Proposition.created_at)
             
             result = await session.execute(stmt)
-            propositions = result.scalars().all()
+            propositions = result.all()
             
             logger.info(f"Found {len(propositions)} propositions for {target_date}")
             
@@ -1465,113 +1540,40 @@ async def generate_self_reflection(
                 )
             
             # Parse the JSON response
-            try:
-                reflection_data = json.loads(response_content)
-                
-                # Validate and structure the response
-                behavioral_pattern = reflection_data.get("behavioral_pattern", "No behavioral pattern identified.")
-                specific_insights_data = reflection_data.get("specific_insights", [])
-                
-                # Convert specific insights to proper format
-                specific_insights = []
-                for insight_data in specific_insights_data:
-                    try:
-                        specific_insights.append(SpecificInsight(
-                            insight=insight_data.get("insight", ""),
-                            action=insight_data.get("action", ""),
-                            confidence=insight_data.get("confidence", 5),
-                            category=insight_data.get("category", "productivity")
-                        ))
-                    except Exception as e:
-                        logger.warning(f"Failed to parse specific insight: {e}")
-                        continue
-                
-                return SelfReflectionResponse(
-                    behavioral_pattern=behavioral_pattern,
-                    specific_insights=specific_insights,
-                    data_points=len(propositions),
-                    generated_at=serialize_datetime(datetime.now(timezone.utc))
-                )
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse AI response as JSON: {e}")
-                logger.error(f"Raw response: {response_content}")
-                
-                # Try to extract JSON from the response if it's wrapped in markdown or other formatting
-                import re
-                
-                # Look for JSON in markdown code blocks
-                json_match = re.search(r'```(?:json)?\s*(.*?)(?:```|\Z)', response_content, re.DOTALL)
-                if json_match:
-                    json_content = json_match.group(1).strip()
-                    logger.info(f"Found JSON in markdown block: {json_content[:200]}...")
-                    try:
-                        reflection_data = json.loads(json_content)
-                        behavioral_pattern = reflection_data.get("behavioral_pattern", "No behavioral pattern identified.")
-                        specific_insights_data = reflection_data.get("specific_insights", [])
-                        
-                        specific_insights = []
-                        for insight_data in specific_insights_data:
-                            try:
-                                specific_insights.append(SpecificInsight(
-                                    insight=insight_data.get("insight", ""),
-                                    action=insight_data.get("action", ""),
-                                    confidence=insight_data.get("confidence", 5),
-                                    category=insight_data.get("category", "productivity")
-                                ))
-                            except Exception as e:
-                                logger.warning(f"Failed to parse specific insight: {e}")
-                                continue
-                        
-                        return SelfReflectionResponse(
-                            behavioral_pattern=behavioral_pattern,
-                            specific_insights=specific_insights,
-                            data_points=len(propositions),
-                            generated_at=serialize_datetime(datetime.now(timezone.utc))
-                        )
-                    except json.JSONDecodeError as e2:
-                        logger.error(f"Failed to parse extracted JSON: {e2}")
-                
-                # Try to find JSON-like structure in the response
-                json_pattern = re.search(r'\{.*\}', response_content, re.DOTALL)
-                if json_pattern:
-                    json_candidate = json_pattern.group(0)
-                    logger.info(f"Found JSON-like pattern: {json_candidate[:200]}...")
-                    try:
-                        reflection_data = json.loads(json_candidate)
-                        behavioral_pattern = reflection_data.get("behavioral_pattern", "No behavioral pattern identified.")
-                        specific_insights_data = reflection_data.get("specific_insights", [])
-                        
-                        specific_insights = []
-                        for insight_data in specific_insights_data:
-                            try:
-                                specific_insights.append(SpecificInsight(
-                                    insight=insight_data.get("insight", ""),
-                                    action=insight_data.get("action", ""),
-                                    confidence=insight_data.get("confidence", 5),
-                                    category=insight_data.get("category", "productivity")
-                                ))
-                            except Exception as e:
-                                logger.warning(f"Failed to parse specific insight: {e}")
-                                continue
-                        
-                        return SelfReflectionResponse(
-                            behavioral_pattern=behavioral_pattern,
-                            specific_insights=specific_insights,
-                            data_points=len(propositions),
-                            generated_at=serialize_datetime(datetime.now(timezone.utc))
-                        )
-                    except json.JSONDecodeError as e3:
-                        logger.error(f"Failed to parse JSON-like pattern: {e3}")
-                
-                # Return a fallback response with the raw AI response for debugging
-                logger.error("All JSON parsing attempts failed")
+            reflection_data = decode_json(response_content)
+            if not isinstance(reflection_data, dict):
+                logger.error("Self-reflection response was not a JSON object")
                 return SelfReflectionResponse(
                     behavioral_pattern=f"Unable to generate behavioral pattern due to processing error. The AI response was not in the expected JSON format. Raw response preview: {response_content[:500]}...",
                     specific_insights=[],
                     data_points=len(propositions),
                     generated_at=serialize_datetime(datetime.now(timezone.utc))
                 )
+            
+            # Validate and structure the response
+            behavioral_pattern = reflection_data.get("behavioral_pattern", "No behavioral pattern identified.")
+            specific_insights_data = reflection_data.get("specific_insights", [])
+            
+            # Convert specific insights to proper format
+            specific_insights = []
+            for insight_data in specific_insights_data:
+                try:
+                    specific_insights.append(SpecificInsight(
+                        insight=insight_data.get("insight", ""),
+                        action=insight_data.get("action", ""),
+                        confidence=insight_data.get("confidence", 5),
+                        category=insight_data.get("category", "productivity")
+                    ))
+                except Exception as e:
+                    logger.warning(f"Failed to parse specific insight: {e}")
+                    continue
+            
+            return SelfReflectionResponse(
+                behavioral_pattern=behavioral_pattern,
+                specific_insights=specific_insights,
+                data_points=len(propositions),
+                generated_at=serialize_datetime(datetime.now(timezone.utc))
+            )
         
     except Exception as e:
         logger.error(f"Error generating self-reflection: {e}")
@@ -1602,20 +1604,22 @@ async def generate_suggestions(
         gum_inst = await ensure_gum_instance(user_name)
         
         # Get ONLY high-confidence behavioral insights (GUM propositions) - NO transcription data
-        async with gum_inst._session() as session:
+        async with gum_inst._read_session() as session:
             from gum.models import Proposition
+            from gum.db_utils import PROPOSITION_SUMMARY
             from sqlalchemy import select, desc
             
             # Get top behavioral insights for pattern discovery
             stmt = (
-                select(Proposition)
+                select(*PROPOSITION_SUMMARY)
+                .where(Proposition.is_leaf)
                 .where(Proposition.confidence >= 7)  # High-confidence insights only
                 .order_by(desc(Proposition.confidence), desc(Proposition.created_at))
                 .limit(100)  # Get top 100 behavioral insights
             )
             
             result = await session.execute(stmt)
-            propositions = result.scalars().all()
+            propositions = result.all()
             
             logger.info(f"Found {len(propositions)} high-confidence behavioral insights for pattern analysis")
             
@@ -1748,9 +1752,9 @@ async def generate_suggestions(
                 try:
                     # Get database session
                     gum_inst = await ensure_gum_instance(user_name)
-                    async with gum_inst._session() as session:
-                        from gum.models import Suggestion
-                        
+                    from gum.models import Suggestion
+
+                    async def _save_suggestions(session):
                         # Save each suggestion directly to database
                         suggestions_saved = 0
                         for suggestion_data in suggestions_raw:
@@ -1767,9 +1771,10 @@ async def generate_suggestions(
                             )
                             session.add(suggestion)
                             suggestions_saved += 1
-                        
-                        await session.commit()
-                        logger.info(f"💾 SAVED {suggestions_saved} SUGGESTIONS DIRECTLY TO DATABASE")
+                        return suggestions_saved
+
+                    suggestions_saved = await gum_inst.write(_save_suggestions)
+                    logger.info(f"💾 SAVED {suggestions_saved} SUGGESTIONS DIRECTLY TO DATABASE")
                         
                 except Exception as save_error:
                     logger.error(f"❌ FAILED TO SAVE SUGGESTIONS TO DATABASE: {save_error}")
@@ -1804,8 +1809,12 @@ async def generate_suggestions(
         )
 
 
-async def find_related_propositions_for_chat(session, suggestion_context, recent_observations, limit=100):
-    """Find propositions related to current chat context using existing search infrastructure."""
+async def find_related_propositions_for_chat(session, suggestion_context, recent_observations, limit=None):
+    """Find propositions related to current chat context using existing search infrastructure.
+
+    ``limit`` defaults to 20 with an embedding index (hybrid recall needs far
+    fewer candidates) and to 100 without one, where HYBRID falls back to OR.
+    """
     
     # Build search query from multiple sources
     search_terms = []
@@ -1838,12 +1847,16 @@ async def find_related_propositions_for_chat(session, suggestion_context, recent
     try:
         # Use existing search infrastructure
         from gum.db_utils import search_propositions_bm25
+        from gum.embeddings import get_default_index
+
+        if limit is None:
+            limit = 20 if get_default_index() is not None else 100
         
         related_props = await search_propositions_bm25(
             session,
             combined_query,
             limit=limit,
-            mode="OR", 
+            mode="HYBRID",
             include_observations=False,
             enable_mmr=True,
             enable_decay=True
@@ -1907,7 +1920,7 @@ async def chat_with_suggestion(
             proposition_context = ""
             try:
                 gum_inst = await ensure_gum_instance(user_name)
-                async with gum_inst._session() as session:
+                async with gum_inst._read_session() as session:
                     from gum.models import Observation
                     from sqlalchemy import select, desc
                     from datetime import timedelta
@@ -2656,22 +2669,25 @@ async def process_and_store_in_gum(frame_results: List[dict], user_name: str, ob
     try:
         async with gum_semaphore:
             gum_inst = await ensure_gum_instance(user_name)
-            observer = APIObserver(observer_name)
+            observer = get_api_observer(observer_name)
             
-            # Process in batches to avoid overwhelming the database
+            # Process in batches to avoid overwhelming the database. Every frame
+            # keeps its own proposition call; the frames of a batch run side by
+            # side, so the writer commits their bulk link writes together
             batch_size = 5
             for i in range(0, len(frame_results), batch_size):
                 batch = frame_results[i:i + batch_size]
                 
+                futures = []
                 for frame_result in batch:
                     if isinstance(frame_result, dict) and "analysis" in frame_result and "frame_number" in frame_result:
-                        # Create update with frame analysis
-                        update_content = f"Video frame analysis (Frame {frame_result['frame_number']}): {frame_result['analysis']}"
                         update = Update(
-                            content=update_content,
+                            content=f"Video frame analysis (Frame {frame_result['frame_number']}): {frame_result['analysis']}",
                             content_type="input_text"
                         )
-                        await gum_inst._default_handler(observer, update)
+                        futures.append(await gum_inst.ingest(update, observer_name=observer.name, wait=False))
+                if futures:
+                    await asyncio.gather(*futures)
         
         gum_time = time.time() - gum_start
         logger.info(f"Stored {len(frame_results)} frame analyses in GUM in {gum_time:.2f}s")
@@ -2947,15 +2963,17 @@ async def get_observations_by_hour(
         gum_inst = await ensure_gum_instance(user_name)
         
         # Query observations grouped by hour
-        async with gum_inst._session() as session:
+        async with gum_inst._read_session() as session:
             from gum.models import Observation
             from sqlalchemy import select, func, and_
+            from sqlalchemy.orm import undefer
             
             # Get current time to filter out future hours
             now = datetime.now(timezone.utc)
             
             # Build base query for the target date using the calculated UTC range
-            stmt = select(Observation).where(
+            # (full_content: older days may be in cold storage)
+            stmt = select(Observation).options(undefer(Observation.full_content)).where(
                 and_(
                     Observation.created_at >= utc_start,
                     Observation.created_at <= utc_end,
@@ -3001,7 +3019,7 @@ async def get_observations_by_hour(
                     "observations": [
                         {
                             "id": obs.id,
-                            "content": obs.content,
+                            "content": obs.full_content,
                             "content_type": obs.content_type,
                             "observer_name": obs.observer_name,
                             "created_at": serialize_datetime(parse_datetime(obs.created_at))
@@ -3109,7 +3127,7 @@ async def list_suggestions(
         gum_inst = await ensure_gum_instance(user_name)
         
         # Query recent suggestions from database (same pattern as propositions)
-        async with gum_inst._session() as session:
+        async with gum_inst._read_session() as session:
             from gum.models import Suggestion
             from sqlalchemy import select, desc
             
@@ -3133,12 +3151,11 @@ async def list_suggestions(
                 undelivered_ids = [s.id for s in suggestions if not s.delivered]
                 if undelivered_ids:
                     from sqlalchemy import update
-                    await session.execute(
+                    await gum_inst.write(lambda write_session: write_session.execute(
                         update(Suggestion)
                         .where(Suggestion.id.in_(undelivered_ids))
                         .values(delivered=True)
-                    )
-                    await session.commit()
+                    ))
                     logger.info(f"Marked {len(undelivered_ids)} suggestions as delivered")
             
             # Convert to response format (same pattern as propositions)
@@ -3186,7 +3203,7 @@ async def test_trigger_gumbo():
     try:
         # Get the most recent proposition to use as trigger
         gum_inst = await ensure_gum_instance()
-        async with gum_inst._session() as session:
+        async with gum_inst._read_session() as session:
             from sqlalchemy import select, desc
             from gum.models import Proposition
             
@@ -3205,7 +3222,7 @@ async def test_trigger_gumbo():
             
             # Fire and forget
             import asyncio
-            asyncio.create_task(trigger_gumbo_suggestions(recent_prop.id, session))
+            asyncio.create_task(trigger_gumbo_suggestions(recent_prop.id, session, gum_inst.write))
             
             return {
                 "message": "Gumbo test triggered successfully",
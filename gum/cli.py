@@ -6,7 +6,10 @@ import argparse
 import asyncio
 import shutil  # Add this import for deleting directories
 from gum import gum
+from gum.dedup import DedupPolicy
+from gum.retention import DEFAULT_RETENTION
 from gum.observers import Screen
+from gum.search_profile import SearchProfile
 
 class QueryAction(argparse.Action):
     def __call__(self, parser, namespace, values, option_string=None):
@@ -27,8 +30,38 @@ def parse_args():
     )
     
     parser.add_argument('--limit', '-l', type=int, help='Limit the number of results', default=10)
+    parser.add_argument('--profile', action='store_true', help='With --query, print stage timings and the query plan')
     parser.add_argument('--model', '-m', type=str, help='Model to use')
-    parser.add_argument('--reset-cache', action='store_true', help='Reset the GUM cache and exit')  # Add this line
+    parser.add_argument('--reset-cache', action='store_true', help='Reset the GUM cache (database and cached model responses) and exit')  # Add this line
+    parser.add_argument(
+        '--reindex-fts',
+        metavar='TOKENIZER',
+        help='Rebuild the full-text indexes with TOKENIZER (porter, unicode61, trigram or an '
+             'FTS5 spec) and exit; safe while another gum process is running',
+    )
+    parser.add_argument(
+        '--no-llm-cache',
+        action='store_true',
+        help='Do not cache model responses, not even in memory',
+    )
+    parser.add_argument(
+        '--llm-disk-cache',
+        action='store_true',
+        help='Also keep cached model responses on disk for 7 days in '
+             '~/.cache/gum/llm_cache.db; they describe what was on screen',
+    )
+    parser.add_argument(
+        '--cold-storage-days',
+        type=float,
+        help='Compress observation bodies older than this many days during idle maintenance (off by default)',
+    )
+    parser.add_argument(
+        '--retention',
+        action='store_true',
+        help='Move old rows to monthly archive databases during idle maintenance: observations '
+             'after 180 days, superseded propositions after 90, delivered suggestions after 30 '
+             '(off by default)',
+    )
 
     args = parser.parse_args()
 
@@ -50,9 +83,21 @@ async def main():
             print(f"Cache directory does not exist: {cache_dir}")
         return
 
+    if args.no_llm_cache:
+        os.environ['LLM_CACHE_ENABLED'] = 'false'
+    elif args.llm_disk_cache:
+        os.environ['LLM_CACHE_DISK'] = 'true'
+
     model = args.model or os.getenv('MODEL_NAME') or 'gpt-4o-mini'
     user_name = args.user_name or os.getenv('USER_NAME')
 
+    if args.reindex_fts:
+        # opening the database with the new tokenizer already rebuilds stale tables
+        gum_instance = gum(user_name, model, fts_tokenizer=args.reindex_fts)
+        await gum_instance.reindex_fts(args.reindex_fts)
+        print(f"Full-text indexes use tokenizer '{args.reindex_fts}'")
+        return
+
     # you need one or the other-
     if user_name is None and args.query is None:
         print("Please provide a user name (as an argument, -u, or as an env variable) or a query (as an argument, -q)")
@@ -61,7 +106,8 @@ async def main():
     if args.query is not None:
         gum_instance = gum(user_name, model)
         await gum_instance.connect_db()
-        result = await gum_instance.query(args.query, limit=args.limit)
+        profile = SearchProfile() if args.profile else None
+        result = await gum_instance.query(args.query, limit=args.limit, profile=profile)
         
         # pretty print confidences / propositions / number of items returned
         print(f"\nFound {len(result)} results:")
@@ -73,13 +119,34 @@ async def main():
                 print(f"Confidence: {prop.confidence:.2f}")
             print(f"Relevance Score: {score:.2f}")
             print("-" * 80)
+
+        if profile is not None:
+            report = profile.as_dict()
+            print(f"\nProfile ({report['total_ms']:.2f}ms total):")
+            for name, ms in report["stages_ms"].items():
+                rows = report["rows"].get(name)
+                print(f"  {name:<14}{ms:>10.2f}ms" + (f"  {rows} rows" if rows is not None else ""))
+            print(f"\nStatements ({len(report['statements'])}):")
+            for stmt in report["statements"]:
+                print(f"  [{stmt['stage']}] {stmt['ms']:.2f}ms  {stmt['sql'][:120]}")
+            print(f"\nCandidate query plan ({report['strategy'] or 'no match'}):")
+            for line in report["plan"]:
+                print(f"  {line}")
     else:
         print(f"Listening to {user_name} with model {model}")
         # Enable debug logging for screen observer
         import logging
         logging.basicConfig(level=logging.INFO, format="%(asctime)s [Screen] %(message)s", datefmt="%H:%M:%S")
         
-        async with gum(user_name, model, Screen(model, debug=True)) as gum_instance:
+        async with gum(
+            user_name,
+            model,
+            Screen(model, debug=True),
+            journal_enabled=True,
+            cold_storage_days=args.cold_storage_days,
+            retention_policies=DEFAULT_RETENTION if args.retention else None,
+            dedup_policies={"Screen": DedupPolicy()},  # static pages produce near-identical transcriptions
+        ) as gum_instance:
             await asyncio.Future()  # run forever (Ctrl-C to stop)
 
 def cli():
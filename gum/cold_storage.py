@@ -0,0 +1,68 @@
+# cold_storage.py
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import PREVIEW_CHARS, Observation, compress_content, observation_blobs
+
+BATCH_SIZE = 200   # observations moved per write
+
+
+async def move_to_cold_storage(
+    session: AsyncSession,
+    older_than: datetime,
+    *,
+    limit: int = BATCH_SIZE,
+) -> int:
+    """Compress the bodies of observations created before ``older_than``.
+
+    Each body longer than ``PREVIEW_CHARS`` is stored zlib-compressed in
+    ``observation_blobs`` and ``observations.content`` is cut down to a
+    preview. The full-text index and ``Observation.full_content`` keep
+    seeing the complete text.
+
+    Args:
+        session (AsyncSession): Session whose transaction receives the writes.
+        older_than (datetime): Creation time (naive UTC) before which bodies move.
+        limit (int): Most observations moved in this call. Defaults to BATCH_SIZE.
+
+    Returns:
+        int: Number of observations moved; less than ``limit`` once none are left.
+    """
+    rows = (await session.execute(
+        select(Observation.id, Observation.content)
+        .outerjoin(observation_blobs, observation_blobs.c.observation_id == Observation.id)
+        .where(Observation.created_at < older_than)
+        .where(observation_blobs.c.observation_id.is_(None))
+        .where(func.length(Observation.content) > PREVIEW_CHARS)
+        .order_by(Observation.created_at)
+        .limit(limit)
+    )).all()
+    if not rows:
+        return 0
+
+    # blobs first: the content update then leaves observations_fts alone
+    await session.execute(insert(observation_blobs), [
+        {"observation_id": oid, "body": compress_content(content)} for oid, content in rows
+    ])
+    table = Observation.__table__
+    await session.execute(
+        update(table)
+        .where(table.c.id == bindparam("oid"))
+        # keep updated_at: the observation itself did not change
+        .values(content=bindparam("preview"), updated_at=table.c.updated_at),
+        [{"oid": oid, "preview": content[:PREVIEW_CHARS]} for oid, content in rows],
+    )
+    return len(rows)
+
+
+async def cold_storage_stats(session: AsyncSession) -> dict[str, int]:
+    """Observations in cold storage and the bytes their compressed bodies take."""
+    count, size = (await session.execute(
+        select(func.count(), func.coalesce(func.sum(func.length(observation_blobs.c.body)), 0))
+    )).one()
+    return {"observations": count, "compressed_bytes": size}
@@ -0,0 +1,214 @@
+# db_maintenance.py
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Optional, Sequence, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger("gum.db_maintenance")
+
+T = TypeVar("T")
+Runner = Callable[[Callable[[AsyncConnection], Awaitable[T]]], Awaitable[T]]
+
+
+def direct_runner(engine: AsyncEngine) -> Runner:
+    """Run maintenance operations on a fresh connection of ``engine``.
+
+    Only for databases without a :class:`~gum.storage.SQLiteWriter`; with one,
+    pass its ``run_exclusive`` so maintenance queues behind the write batches.
+    """
+    async def run(operation):
+        async with engine.connect() as conn:
+            return await operation(conn)
+    return run
+
+
+def wal_path(engine: AsyncEngine) -> Optional[str]:
+    """Path of the WAL file next to the engine's database, or None for in-memory ones."""
+    database = engine.url.database
+    if not database or database == ":memory:":
+        return None
+    return f"{database}-wal"
+
+
+def wal_size(engine: AsyncEngine) -> int:
+    """Current size of the WAL file in bytes (0 if there is none)."""
+    path = wal_path(engine)
+    try:
+        return os.path.getsize(path) if path else 0
+    except OSError:
+        return 0
+
+
+async def checkpoint(conn: AsyncConnection, mode: str = "PASSIVE") -> tuple[int, int, int]:
+    """Run ``PRAGMA wal_checkpoint(mode)``.
+
+    Args:
+        conn (AsyncConnection): Connection outside any transaction.
+        mode (str): "PASSIVE" copies what it can without waiting; "TRUNCATE"
+            waits for readers, copies everything and empties the WAL file.
+
+    Returns:
+        tuple[int, int, int]: ``(busy, wal_frames, checkpointed_frames)``.
+    """
+    row = (await conn.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})")).one()
+    return tuple(row)
+
+
+async def optimize(conn: AsyncConnection) -> None:
+    """Run ``PRAGMA optimize`` so the planner statistics follow the data."""
+    await conn.exec_driver_sql("PRAGMA optimize")
+
+
+async def incremental_vacuum(conn: AsyncConnection, pages: int = 256) -> int:
+    """Return up to ``pages`` free pages to the file system.
+
+    A no-op unless the database uses ``auto_vacuum = INCREMENTAL`` (every
+    database created by ``init_db`` does; older ones convert on a full
+    ``VACUUM``).
+
+    Returns:
+        int: Free pages left in the file.
+    """
+    if (await conn.exec_driver_sql("PRAGMA auto_vacuum")).scalar() != 2:
+        return 0
+    raw = await conn.get_raw_connection()
+    # execute() steps the pragma once, freeing a single page; a script
+    # runs it to completion
+    await raw.driver_connection.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+    return (await conn.exec_driver_sql("PRAGMA freelist_count")).scalar()
+
+
+class DatabaseMaintenance:
+    """Background task keeping the WAL bounded and the planner statistics fresh.
+
+    Every ``interval`` seconds it runs a passive checkpoint, which never blocks
+    writers. Once the WAL file exceeds ``wal_limit_bytes`` and ``is_idle``
+    reports no ingest, it runs a ``TRUNCATE`` checkpoint that resets the file;
+    a WAL past ``4 * wal_limit_bytes`` is truncated even under load, so a
+    long ingest cannot grow it without limit. ``PRAGMA optimize`` runs every
+    ``optimize_every`` rounds. ``idle_tasks`` (e.g. moving old observations to
+    cold storage) run at the start of a round when ``is_idle`` allows, followed
+    by an ``incremental_vacuum`` of up to ``vacuum_pages`` pages, so the
+    checkpoint that follows picks up their writes.
+
+    Every statement runs through ``run``; gum passes its writer's
+    ``run_exclusive`` so none of them contends with a write batch.
+
+    Args:
+        engine (AsyncEngine): Engine from ``init_db``.
+        run (Runner, optional): Runs an ``async (conn) -> result`` operation.
+            Defaults to a fresh connection of ``engine`` (:func:`direct_runner`).
+        is_idle (Callable[[], bool], optional): Returns True when nothing is being
+            ingested. Defaults to always idle.
+        interval (float): Seconds between rounds. Defaults to 60.
+        wal_limit_bytes (int): WAL size that triggers a truncating checkpoint.
+            Defaults to 64 MiB.
+        optimize_every (int): Rounds between ``PRAGMA optimize``; 0 never. Defaults to 60.
+        idle_tasks (Sequence[Callable[[], Awaitable]]): Coroutine functions run
+            each idle round. Defaults to none.
+        vacuum_pages (int): Free pages released per idle round; 0 never. Defaults to 256.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        run: Optional[Runner] = None,
+        is_idle: Optional[Callable[[], bool]] = None,
+        interval: float = 60.0,
+        wal_limit_bytes: int = 64 * 2**20,
+        optimize_every: int = 60,
+        idle_tasks: Sequence[Callable[[], Awaitable[Any]]] = (),
+        vacuum_pages: int = 256,
+    ):
+        self.engine = engine
+        self.run = run or direct_runner(engine)
+        self.is_idle = is_idle or (lambda: True)
+        self.interval = interval
+        self.wal_limit_bytes = wal_limit_bytes
+        self.optimize_every = optimize_every
+        self.idle_tasks = list(idle_tasks)
+        self.vacuum_pages = vacuum_pages
+        self.stats = {
+            "rounds": 0, "checkpoints": 0, "truncations": 0, "optimizes": 0,
+            "idle_tasks": 0, "free_pages": 0, "wal_bytes": 0,
+        }
+        self._rounds = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self, optimize_now: bool = False) -> dict[str, int]:
+        """One maintenance round.
+
+        Returns:
+            dict[str, int]: WAL size before and after, in bytes.
+        """
+        if (self.idle_tasks or self.vacuum_pages) and self.is_idle():
+            for task in self.idle_tasks:
+                try:
+                    await task()
+                except Exception as e:
+                    logger.warning(f"Idle maintenance task {getattr(task, '__name__', task)} failed: {e}")
+                else:
+                    self.stats["idle_tasks"] += 1
+            if self.vacuum_pages:
+                self.stats["free_pages"] = await self.run(
+                    lambda conn: incremental_vacuum(conn, self.vacuum_pages)
+                )
+        before = wal_size(self.engine)
+        if optimize_now:
+            # first, so that its statistics writes are checkpointed too
+            await self.run(optimize)
+            self.stats["optimizes"] += 1
+        await self.run(checkpoint)
+        self.stats["checkpoints"] += 1
+        if before > self.wal_limit_bytes and (
+            self.is_idle() or before > 4 * self.wal_limit_bytes
+        ):
+            busy, _frames, _done = await self.run(lambda conn: checkpoint(conn, "TRUNCATE"))
+            if not busy:
+                self.stats["truncations"] += 1
+        after = wal_size(self.engine)
+        self.stats["wal_bytes"] = after
+        return {"before": before, "after": after}
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self._rounds += 1
+            started = time.monotonic()
+            try:
+                await self.run_once(
+                    optimize_now=bool(self.optimize_every) and self._rounds % self.optimize_every == 0
+                )
+            except Exception as e:
+                logger.warning(f"Database maintenance round failed: {e}")
+                continue
+            self.stats["rounds"] += 1
+            logger.debug(f"Database maintenance round took {time.monotonic() - started:.2f}s")
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the task and leave the statistics and WAL tidy for the next start."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            await self.run(optimize)
+            await self.run(lambda conn: checkpoint(conn, "TRUNCATE"))
+        except Exception as e:
+            logger.warning(f"Final database maintenance failed: {e}")
@@ -2,37 +2,58 @@
 
 from __future__ import annotations
 
-import math
 import re
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from typing import List
 
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 from sqlalchemy import (
     MetaData,
     Table,
+    insert,
     select,
+    update,
+    literal,
     literal_column,
     text,
     func,
 )
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from .models import (
     Observation,
     Proposition,
-    proposition_parent,
     observation_proposition,
 )
+from .embeddings import EmbeddingIndex, get_default_index
+from .mmr import mmr_select
+from .search_profile import SearchProfile
+from .term_vectors import (
+    load_term_counts,
+    load_term_matrix,
+    refresh_term_vectors,
+    tfidf_rows,
+)
 
 # Constants
 K_DECAY = 2.0      # decay rate for recency adjustment
 LAMBDA = 0.5       # trade-off for MMR
+RRF_K = 60         # rank offset for reciprocal-rank fusion
+RANGE_FIRST_MAX_ROWS = 2000   # largest time window searched index-range first
+
+# Columns the listing endpoints serialise. Selecting them instead of the entity
+# returns plain rows: no identity map, no relationship state.
+PROPOSITION_SUMMARY = (
+    Proposition.id,
+    Proposition.text,
+    Proposition.reasoning,
+    Proposition.confidence,
+    Proposition.created_at,
+)
 
 def build_fts_query(raw: str, mode: str = "OR") -> str:
     tokens = re.findall(r"\w+", raw.lower())
@@ -45,13 +66,189 @@ def build_fts_query(raw: str, mode: str = "OR") -> str:
     else:  # implicit AND
         return " ".join(tokens)
 
-def _has_child_subquery() -> select:
-    return (
-        select(literal_column("1"))
-        .select_from(proposition_parent)
-        .where(proposition_parent.c.parent_id == Proposition.id)
-        .exists()
+
+async def plan_time_window(
+    session: AsyncSession,
+    start_time: datetime | None,
+    end_time: datetime,
+    *,
+    max_rows: int = RANGE_FIRST_MAX_ROWS,
+) -> str:
+    """Choose how to evaluate an FTS search limited to a time window.
+
+    "range" walks the ``created_at`` index and probes the FTS index per row,
+    which is cheap when the window holds few leaf propositions. "fts" runs the
+    full-text match first and filters by time afterwards, which wins for wide
+    windows. The window is counted with a ``LIMIT`` so the check itself
+    never reads more than ``max_rows + 1`` index entries.
+
+    Args:
+        session (AsyncSession): Open session.
+        start_time (datetime, optional): Window start; None means unbounded.
+        end_time (datetime): Window end.
+        max_rows (int): Largest window searched range-first.
+
+    Returns:
+        str: "range" or "fts".
+    """
+    if start_time is None:
+        return "fts"
+    in_window = (
+        select(literal(1))
+        .where(Proposition.is_leaf)
+        .where(Proposition.created_at >= start_time)
+        .where(Proposition.created_at <= end_time)
+        .limit(max_rows + 1)
+        .subquery()
+    )
+    rows = (await session.execute(select(func.count()).select_from(in_window))).scalar_one()
+    return "range" if rows <= max_rows else "fts"
+
+
+def _match_scores(
+    param: str,
+    include_observations: bool,
+    window: tuple[datetime, datetime] | None = None,
+):
+    """``(pid, bm25)`` subquery of propositions matching the FTS query bound to ``:param``.
+
+    With ``include_observations`` a proposition also matches through its
+    observations and keeps its best (lowest) score. With a ``(start, end)``
+    ``window`` the FTS tables are only probed for rows of leaf propositions
+    in that window (the "range" plan of :func:`plan_time_window`).
+    """
+    fts_prop = Table("propositions_fts", MetaData())
+
+    window_ids = None
+    if window is not None:
+        window_ids = (
+            select(Proposition.id)
+            .where(Proposition.is_leaf)
+            .where(Proposition.created_at >= window[0])
+            .where(Proposition.created_at <= window[1])
+        )
+
+    if include_observations:
+        # --- WITH observations -------------------------------
+        fts_obs  = Table("observations_fts", MetaData())
+
+        bm25_p   = literal_column("bm25(propositions_fts)").label("score")
+        bm25_o   = literal_column("bm25(observations_fts)").label("score")
+
+        sub_p = (
+            select(Proposition.id.label("pid"), bm25_p)
+            .select_from(
+                fts_prop.join(
+                    Proposition,
+                    literal_column("propositions_fts.rowid") == Proposition.id,
+                )
+            )
+            .where(text(f"propositions_fts MATCH :{param}"))
+        )
+        if window_ids is not None:
+            sub_p = sub_p.where(literal_column("propositions_fts.rowid").in_(window_ids))
+
+        sub_o = (
+            select(observation_proposition.c.proposition_id.label("pid"), bm25_o)
+            .select_from(
+                fts_obs
+                .join(
+                    Observation,
+                    literal_column("observations_fts.rowid") == Observation.id,
+                )
+                .join(
+                    observation_proposition,
+                    observation_proposition.c.observation_id == Observation.id,
+                )
+            )
+            .where(text(f"observations_fts MATCH :{param}"))
+        )
+        if window_ids is not None:
+            sub_o = sub_o.where(
+                literal_column("observations_fts.rowid").in_(
+                    select(observation_proposition.c.observation_id)
+                    .where(observation_proposition.c.proposition_id.in_(window_ids))
+                )
+            )
+
+        union_sub = sub_p.union_all(sub_o).subquery()
+
+        return (
+            select(
+                union_sub.c.pid,
+                func.min(union_sub.c.score).label("bm25"),
+            )
+            .group_by(union_sub.c.pid)
+            .subquery()
+        )
+
+    # --- WITHOUT observations --------------------------------
+    matched = (
+        select(
+            Proposition.id.label("pid"),
+            literal_column("bm25(propositions_fts)").label("bm25"),
+        )
+        .select_from(
+            fts_prop.join(
+                Proposition,
+                literal_column("propositions_fts.rowid") == Proposition.id,
+            )
+        )
+        .where(text(f"propositions_fts MATCH :{param}"))
+    )
+    if window_ids is not None:
+        matched = matched.where(literal_column("propositions_fts.rowid").in_(window_ids))
+    return matched.subquery()
+
+
+def _decay_factor(now: datetime, enable_decay: bool):
+    """SQL expression for exp(-decay * K_DECAY * age_days) of ``Proposition``.
+
+    Computed by SQLite so that the candidate pool is cut on the decayed score
+    (``gum_decay`` is registered by ``init_db``).
+    """
+    if not enable_decay:
+        return literal(1.0)
+    age_days = func.max(
+        func.julianday(now.strftime("%Y-%m-%d %H:%M:%S.%f"))
+        - func.julianday(Proposition.created_at),
+        0.0,
     )
+    return func.gum_decay(Proposition.decay, age_days, K_DECAY)
+
+
+def _time_window(
+    now: datetime,
+    start_time: datetime | None,
+    end_time: datetime | None,
+) -> tuple[datetime | None, datetime]:
+    if end_time is None:
+        end_time = now
+    if start_time is not None and start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=timezone.utc)
+    if end_time.tzinfo is None:
+        end_time = end_time.replace(tzinfo=timezone.utc)
+    return start_time, end_time
+
+
+def _select_diverse(
+    scores: np.ndarray,
+    vecs,
+    limit: int,
+    enable_mmr: bool,
+) -> list[int]:
+    """Indices of the ``limit`` rows to return, MMR re-ranked when enabled."""
+    if not (enable_mmr and len(scores) > 1):
+        return np.argsort(scores)[::-1][:limit].tolist()
+    return mmr_select(scores, vecs, limit, LAMBDA)
+
+
+def _normalize(scores: np.ndarray) -> np.ndarray:
+    min_score = np.min(scores)
+    max_score = np.max(scores)
+    if max_score > min_score:
+        return (scores - min_score) / (max_score - min_score)
+    return np.full_like(scores, 0.5)
 
 
 async def search_propositions_bm25(
@@ -65,7 +262,61 @@ async def search_propositions_bm25(
     include_observations: bool = True,
     enable_decay: bool = True,
     enable_mmr: bool = True,
+    embedding_index: EmbeddingIndex | None = None,
+    profile: SearchProfile | None = None,
+) -> list[tuple["Proposition", float]]:
+    """Rank leaf propositions for ``user_query``.
+
+    ``mode`` is "OR", "AND" or "PHRASE" for lexical (FTS5 BM25) search, or
+    "HYBRID" to fuse OR-mode BM25 with nearest neighbours from
+    ``embedding_index`` (or the process default) by reciprocal-rank fusion.
+    The index covers what its last ``sync`` embedded; the search never syncs
+    it. Without an index "HYBRID" behaves like "OR".
+
+    Pass a :class:`~gum.search_profile.SearchProfile` as ``profile`` to collect
+    per-stage timings, row counts, the SQL run and the candidate query plan.
+    """
+    kwargs = dict(
+        limit=limit, mode=mode, start_time=start_time, end_time=end_time,
+        include_observations=include_observations, enable_decay=enable_decay,
+        enable_mmr=enable_mmr, embedding_index=embedding_index,
+    )
+    if profile is None:
+        return await _search_propositions(session, user_query, None, **kwargs)
+
+    async with profile.capture(session):
+        results = await _search_propositions(session, user_query, profile, **kwargs)
+    await profile.explain(session)
+    profile.rows["returned"] = len(results)
+    return results
+
+
+def _untimed(name: str):
+    return nullcontext()
+
+
+async def _search_propositions(
+    session: AsyncSession,
+    user_query: str,
+    profile: SearchProfile | None,
+    *,
+    limit: int,
+    mode: str,
+    start_time: datetime | None,
+    end_time: datetime | None,
+    include_observations: bool,
+    enable_decay: bool,
+    enable_mmr: bool,
+    embedding_index: EmbeddingIndex | None,
 ) -> list[tuple["Proposition", float]]:
+    stage = profile.stage if profile is not None else _untimed
+    counts = profile.rows if profile is not None else {}
+
+    hybrid = mode == "HYBRID"
+    if hybrid:
+        embedding_index = embedding_index or get_default_index()
+        hybrid = embedding_index is not None
+        mode = "OR"
 
     q = build_fts_query(user_query, mode)
     has_query = bool(q)
@@ -74,169 +325,251 @@ async def search_propositions_bm25(
     # 1  Build candidate list
     # --------------------------------------------------------
     candidate_pool = limit * 10 if enable_mmr else limit
-    has_child      = _has_child_subquery()
+    now = datetime.now(timezone.utc)
+    decay_factor = _decay_factor(now, enable_decay)
+    start_time, end_time = _time_window(now, start_time, end_time)
 
     if has_query:
-        fts_prop = Table("propositions_fts", MetaData())
-
-        if include_observations:
-            # --- 1-a-1  WITH observations --------------------
-            fts_obs  = Table("observations_fts", MetaData())
-
-            bm25_p   = literal_column("bm25(propositions_fts)").label("score")
-            bm25_o   = literal_column("bm25(observations_fts)").label("score")
-
-            sub_p = (
-                select(Proposition.id.label("pid"), bm25_p)
-                .select_from(
-                    fts_prop.join(
-                        Proposition,
-                        literal_column("propositions_fts.rowid") == Proposition.id,
-                    )
-                )
-                .where(text("propositions_fts MATCH :q"))
-            )
-
-            sub_o = (
-                select(observation_proposition.c.proposition_id.label("pid"), bm25_o)
-                .select_from(
-                    fts_obs
-                    .join(
-                        Observation,
-                        literal_column("observations_fts.rowid") == Observation.id,
-                    )
-                    .join(
-                        observation_proposition,
-                        observation_proposition.c.observation_id == Observation.id,
-                    )
-                )
-                .where(text("observations_fts MATCH :q"))
-            )
-
-            union_sub = sub_p.union_all(sub_o).subquery()
-
-            best_scores = (
-                select(
-                    union_sub.c.pid,
-                    func.min(union_sub.c.score).label("bm25"),
-                )
-                .group_by(union_sub.c.pid)
-                .subquery()
-            )
-        else:
-            # --- 1-a-2  WITHOUT observations -----------------
-            best_scores = (
-                select(
-                    Proposition.id.label("pid"),
-                    literal_column("bm25(propositions_fts)").label("bm25"),
-                )
-                .select_from(
-                    fts_prop.join(
-                        Proposition,
-                        literal_column("propositions_fts.rowid") == Proposition.id,
-                    )
-                )
-                .where(text("propositions_fts MATCH :q"))
-                .subquery()
-            )
-
+        with stage("plan"):
+            plan = await plan_time_window(session, start_time, end_time)
+        if profile is not None:
+            profile.strategy = plan
+        best_scores = _match_scores(
+            "q", include_observations,
+            (start_time, end_time) if plan == "range" else None,
+        )
         stmt = (
-            select(Proposition, best_scores.c.bm25)
+            select(Proposition, best_scores.c.bm25, decay_factor.label("decay_factor"))
             .join(best_scores, best_scores.c.pid == Proposition.id)
-            .where(~has_child)
-            .order_by(best_scores.c.bm25.asc())          # smallest→best
+            .where(Proposition.is_leaf)
+            .order_by((best_scores.c.bm25 * decay_factor).asc())   # smallest→best
         )
     else:
-        # --- 1-b  No user query ------------------------------
+        # --- No user query -----------------------------------
         stmt = (
-            select(Proposition, literal_column("0.0").label("bm25"))
-            .where(~has_child)
+            select(
+                Proposition,
+                literal_column("0.0").label("bm25"),
+                decay_factor.label("decay_factor"),
+            )
+            .where(Proposition.is_leaf)
             .order_by(Proposition.created_at.desc())
         )
 
     # --------------------------------------------------------
-    # 2  Time filtering & eager-load
+    # 2  Time filtering
     # --------------------------------------------------------
-    if end_time is None:
-        end_time = datetime.now(timezone.utc)
-    if start_time is not None and start_time.tzinfo is None:
-        start_time = start_time.replace(tzinfo=timezone.utc)
-    if end_time.tzinfo is None:
-        end_time = end_time.replace(tzinfo=timezone.utc)
-
-    if start_time is not None:
-        stmt = stmt.where(Proposition.created_at >= start_time)
-    stmt = stmt.where(Proposition.created_at <= end_time)
+    def _filtered(stmt):
+        if start_time is not None:
+            stmt = stmt.where(Proposition.created_at >= start_time)
+        return stmt.where(Proposition.created_at <= end_time)
 
-    if include_observations:
-        stmt = stmt.options(selectinload(Proposition.observations))
+    stmt = _filtered(stmt).limit(candidate_pool)
 
-    stmt = stmt.limit(candidate_pool)
-
-   # --------------------------------------------------------
+    # --------------------------------------------------------
     # 3  Execute & score
     # --------------------------------------------------------
     bind = {"q": q} if has_query else {}
-    rows = (await session.execute(stmt, bind)).all()
+    # FTS match and ORM hydration (proposition columns only)
+    with stage("candidates"):
+        rows = (await session.execute(stmt, bind)).all()
+    counts["candidates"] = len(rows)
+
+    fused = hybrid and has_query
+    if fused:
+        with stage("dense"):
+            dense = await embedding_index.search(user_query, candidate_pool)
+            rows = await _fuse_rrf(
+                session,
+                rows,
+                [pid for pid, _ in dense],
+                _filtered(
+                    select(Proposition, decay_factor.label("decay_factor"))
+                    .where(Proposition.is_leaf)
+                ),
+                candidate_pool,
+            )
+        counts["dense"] = len(dense)
+        counts["fused"] = len(rows)
     if not rows:
         return []
 
-    # --- 3-a. Calculate initial scores ---
-    initial_scores: list[float] = []
+    with stage("scoring"):
+        relevance = np.array([row[1] for row in rows], dtype=float)
+        if not fused:
+            relevance = -relevance if has_query else np.zeros(len(rows))
+        final_scores = _normalize(relevance * np.array([row[2] for row in rows], dtype=float))
+
+    vecs = None
+    if enable_mmr and len(rows) > 1:
+        with stage("term_vectors"):
+            vecs = await load_term_matrix(
+                session,
+                [row[0].id for row in rows],
+                include_observations=include_observations,
+            )
+    with stage("mmr" if vecs is not None else "rank"):
+        selected_idxs = _select_diverse(final_scores, vecs, limit, enable_mmr)
+    return [(rows[i][0], float(final_scores[i])) for i in selected_idxs]
+
+
+async def search_propositions_bm25_many(
+    session: AsyncSession,
+    user_queries: list[str],
+    *,
+    limit: int = 3,
+    mode: str = "OR",
+    start_time: datetime | None = None,
+    end_time: datetime | None = None,
+    include_observations: bool = True,
+    enable_decay: bool = True,
+    enable_mmr: bool = True,
+) -> list[list[tuple["Proposition", float]]]:
+    """Run :func:`search_propositions_bm25` for several queries at once.
+
+    All FTS lookups go out as one ``UNION ALL`` statement tagged by query
+    index and cut per query with ``ROW_NUMBER()``. Each distinct proposition
+    is hydrated once, and the term vectors for MMR are loaded once.
+
+    Args:
+        session (AsyncSession): Open session.
+        user_queries (list[str]): Queries, e.g. one per draft proposition.
+        limit, mode, start_time, end_time, include_observations, enable_decay,
+            enable_mmr: As for :func:`search_propositions_bm25`. "HYBRID" runs
+            the queries one by one.
+
+    Returns:
+        list[list[tuple[Proposition, float]]]: Ranked results per query, in input order.
+    """
+    if mode == "HYBRID" or len(user_queries) <= 1:
+        return [
+            await search_propositions_bm25(
+                session, query, limit=limit, mode=mode,
+                start_time=start_time, end_time=end_time,
+                include_observations=include_observations,
+                enable_decay=enable_decay, enable_mmr=enable_mmr,
+            )
+            for query in user_queries
+        ]
+
+    results: list[list[tuple[Proposition, float]]] = [[] for _ in user_queries]
+    fts_queries = [build_fts_query(query, mode) for query in user_queries]
+    for i, q in enumerate(fts_queries):
+        if not q:
+            # no terms: the recency listing, same for every such query
+            results[i] = await search_propositions_bm25(
+                session, "", limit=limit, start_time=start_time, end_time=end_time,
+                include_observations=include_observations,
+                enable_decay=enable_decay, enable_mmr=enable_mmr,
+            )
+
+    tagged = [(i, q) for i, q in enumerate(fts_queries) if q]
+    if not tagged:
+        return results
+
+    candidate_pool = limit * 10 if enable_mmr else limit
     now = datetime.now(timezone.utc)
-    for prop, raw_score in rows:
-        relevance_score = -raw_score if has_query else 0.0
-        gamma = 0.0
-        if enable_decay:
-            dt = prop.created_at.replace(tzinfo=timezone.utc)
-            age_days = max((now - dt).total_seconds() / 86_400, 0.0)
-            alpha = prop.decay if prop.decay is not None else 0.0
-            gamma = -alpha * K_DECAY * age_days
-
-        score = relevance_score * math.exp(gamma)
-        initial_scores.append(score)
-
-    final_scores_np = np.array(initial_scores)
-    min_score = np.min(final_scores_np)
-    max_score = np.max(final_scores_np)
-    
-    if max_score > min_score:
-        final_scores_np = (final_scores_np - min_score) / (max_score - min_score)
-    else:
-        final_scores_np = np.full_like(final_scores_np, 0.5)
+    decay_factor = _decay_factor(now, enable_decay)
+    start_time, end_time = _time_window(now, start_time, end_time)
+    window = None
+    if await plan_time_window(session, start_time, end_time) == "range":
+        window = (start_time, end_time)
+
+    members = []
+    for i, _q in tagged:
+        best = _match_scores(f"q{i}", include_observations, window)
+        members.append(select(literal(i).label("tag"), best.c.pid, best.c.bm25))
+    matches = members[0].union_all(*members[1:]).subquery()
+
+    ranked = (
+        select(
+            matches.c.tag,
+            matches.c.pid,
+            matches.c.bm25,
+            decay_factor.label("decay_factor"),
+            func.row_number().over(
+                partition_by=matches.c.tag,
+                order_by=(matches.c.bm25 * decay_factor).asc(),
+            ).label("rn"),
+        )
+        .join(Proposition, Proposition.id == matches.c.pid)
+        .where(Proposition.is_leaf)
+        .where(Proposition.created_at <= end_time)
+    )
+    if start_time is not None:
+        ranked = ranked.where(Proposition.created_at >= start_time)
+    ranked = ranked.subquery()
 
-    final_scores = final_scores_np.tolist()
+    stmt = (
+        select(ranked.c.tag, ranked.c.pid, ranked.c.bm25, ranked.c.decay_factor)
+        .where(ranked.c.rn <= candidate_pool)
+        .order_by(ranked.c.tag, ranked.c.rn)
+    )
+    hits = (await session.execute(stmt, {f"q{i}": q for i, q in tagged})).all()
+    if not hits:
+        return results
+
+    # hydrate every distinct proposition once
+    pids = list(dict.fromkeys(hit.pid for hit in hits))
+    prop_stmt = select(Proposition).where(Proposition.id.in_(pids))
+    props = {p.id: p for p in (await session.execute(prop_stmt)).scalars()}
+
+    counts = None
+    position = {pid: n for n, pid in enumerate(pids)}
+    if enable_mmr:
+        counts = await load_term_counts(
+            session, pids, include_observations=include_observations
+        )
 
-    if enable_mmr and len(rows) > 1:
-        docs: list[str] = []
-        for p, _ in rows:
-            doc_parts = [p.text, p.reasoning]
-            if include_observations and p.observations:
-                obs_concat = " ".join(o.content for o in list(p.observations)[:10])
-                doc_parts.append(obs_concat)
-            docs.append(" ".join(doc_parts))
-
-        vecs = TfidfVectorizer().fit_transform(docs)
-        
-        selected_idxs = []
-        mmr_scores = np.array(final_scores)
-
-        while len(selected_idxs) < min(limit, len(rows)):
-            if not selected_idxs:
-                idx = int(np.argmax(mmr_scores))
-            else:
-                sims = cosine_similarity(vecs, vecs[selected_idxs]).max(axis=1)
-                mmr = LAMBDA * mmr_scores - (1 - LAMBDA) * sims
-                mmr[selected_idxs] = -np.inf 
-                idx = int(np.argmax(mmr))
-
-            selected_idxs.append(idx)
-    else:
-        idxs = np.argsort(final_scores)[::-1][:limit]
-        selected_idxs = idxs.tolist()
+    per_query: dict[int, list] = {}
+    for hit in hits:
+        per_query.setdefault(hit.tag, []).append(hit)
+
+    for tag, group in per_query.items():
+        scores = _normalize(np.array([-h.bm25 * h.decay_factor for h in group], dtype=float))
+        vecs = None
+        if counts is not None and len(group) > 1:
+            vecs = tfidf_rows(counts[[position[h.pid] for h in group]])
+        selected = _select_diverse(scores, vecs, limit, enable_mmr)
+        results[tag] = [(props[group[i].pid], float(scores[i])) for i in selected]
+    return results
+
+
+async def _fuse_rrf(
+    session: AsyncSession,
+    lexical_rows,
+    dense_ids: list[int],
+    dense_stmt,
+    pool: int,
+) -> list[tuple[Proposition, float, float]]:
+    """Merge BM25 rows and dense hits by reciprocal-rank fusion.
+
+    Dense hits are loaded through ``dense_stmt`` (selecting the proposition and
+    its decay factor) so that they pass the same leaf and time filters as the
+    lexical rows.
+
+    Returns:
+        list[tuple[Proposition, float, float]]: ``(proposition, fused score, decay
+            factor)`` rows, at most ``pool`` of them, best decayed score first.
+    """
+    props: dict[int, tuple[Proposition, float]] = {}
+    scores: dict[int, float] = {}
+    for rank, (prop, _bm25, factor) in enumerate(lexical_rows):
+        props[prop.id] = (prop, factor)
+        scores[prop.id] = 1.0 / (RRF_K + rank + 1)
+
+    missing = [pid for pid in dense_ids if pid not in props]
+    if missing:
+        loaded = await session.execute(dense_stmt.where(Proposition.id.in_(missing)))
+        props.update((p.id, (p, factor)) for p, factor in loaded)
+
+    for rank, pid in enumerate(dense_ids):
+        if pid in props:
+            scores[pid] = scores.get(pid, 0.0) + 1.0 / (RRF_K + rank + 1)
+
+    ranked = sorted(scores, key=lambda pid: scores[pid] * props[pid][1], reverse=True)[:pool]
+    return [(props[pid][0], scores[pid], props[pid][1]) for pid in ranked]
 
-    result = [(rows[i][0], final_scores[i]) for i in selected_idxs]    
-    return result
 
 async def get_related_observations(
     session: AsyncSession,
@@ -244,14 +577,68 @@ async def get_related_observations(
     *,  # Force keyword arguments for optional parameters
     limit: int = 5,
 ) -> List[Observation]:
+    """Most recent observations linked to a proposition.
 
+    Observations in cold storage come back with their complete text in
+    ``content`` (loaded as the committed value, so nothing is written back).
+    """
     stmt = (
-        select(Observation)
+        select(Observation, Observation.full_content)
         .join(observation_proposition)
         .join(Proposition)
         .where(Proposition.id == proposition_id)
         .order_by(Observation.created_at.desc())
         .limit(limit)
     )
-    result = await session.execute(stmt)
-    return result.scalars().all()
\ No newline at end of file
+    observations = []
+    for obs, full_content in await session.execute(stmt):
+        if full_content != obs.content:
+            set_committed_value(obs, "content", full_content)
+        observations.append(obs)
+    return observations
+
+class LinkBatch:
+    """Collects observation↔proposition links and writes them in one go.
+
+    Pairs are de-duplicated in memory and written by :meth:`flush` with a single
+    executemany ``INSERT OR IGNORE`` plus one ``UPDATE`` that bumps
+    ``Proposition.updated_at`` for every proposition touched. The touched
+    propositions' stored term vectors are refreshed in the same transaction.
+    """
+
+    def __init__(self) -> None:
+        self._pairs: set[tuple[int, int]] = set()
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def add(self, observation_ids, proposition_ids) -> "LinkBatch":
+        """Link every observation id to every proposition id."""
+        obs_ids = list(observation_ids)
+        for pid in proposition_ids:
+            self._pairs.update((oid, pid) for oid in obs_ids)
+        return self
+
+    async def flush(self, session: AsyncSession) -> int:
+        """Write the collected links in ``session``'s transaction.
+
+        Returns:
+            int: Number of pairs submitted (existing links are ignored).
+        """
+        if not self._pairs:
+            return 0
+        pairs = sorted(self._pairs)
+        self._pairs.clear()
+
+        await session.execute(
+            insert(observation_proposition).prefix_with("OR IGNORE"),
+            [{"observation_id": oid, "proposition_id": pid} for oid, pid in pairs],
+        )
+        await session.execute(
+            update(Proposition)
+            .where(Proposition.id.in_({pid for _, pid in pairs}))
+            .values(updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        await refresh_term_vectors(session, {pid for _, pid in pairs})
+        return len(pairs)
@@ -0,0 +1,126 @@
+# dedup.py
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Observation, observation_proposition
+
+# ideographs and kana are written without spaces, so each one is its own token
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_WORD = re.compile(rf"[{_CJK}]|[^\W\d_{_CJK}]+")
+
+
+@dataclass
+class DedupPolicy:
+    """How aggressively observations from one observer are deduplicated.
+
+    Attributes:
+        window_seconds (float): How far back to look for a matching observation.
+        threshold (float): Minimum SimHash similarity (1 - hamming / 64) for a
+            near-duplicate. ``1.0`` only accepts identical normalized text.
+        max_candidates (int): Most recent observations compared by SimHash.
+    """
+    window_seconds: float = 300.0
+    threshold: float = 0.95
+    max_candidates: int = 50
+
+
+def normalize(text: str) -> str:
+    """Case-folded letter tokens in any script, so timestamps, counters and layout noise drop out."""
+    return " ".join(_WORD.findall(text.casefold()))
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of the exact content."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def simhash(text: str, shingle: int = 3) -> Optional[int]:
+    """64-bit SimHash over word shingles of the normalized text.
+
+    Returned as a signed integer so it fits an SQLite INTEGER column, or None
+    when the text normalizes to less than one shingle: such texts would all
+    hash alike, so they are only ever matched exactly.
+    """
+    words = normalize(text).split()
+    if len(words) < shingle:
+        return None
+    grams = [" ".join(words[i:i + shingle]) for i in range(len(words) - shingle + 1)]
+    weights = [0] * 64
+    for gram in grams:
+        h = int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    value = sum(1 << bit for bit in range(64) if weights[bit] > 0)
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def similarity(a: int, b: int) -> float:
+    """Fraction of equal bits between two SimHashes."""
+    return 1.0 - bin((a ^ b) & ((1 << 64) - 1)).count("1") / 64.0
+
+
+async def find_duplicate(
+    session: AsyncSession,
+    observation: Observation,
+    policy: DedupPolicy,
+) -> Optional[int]:
+    """Find a recent observation from the same observer with (nearly) the same content.
+
+    ``observation`` must already carry ``content_hash`` and ``simhash``.
+
+    Args:
+        session (AsyncSession): The database session.
+        observation (Observation): The new, not yet persisted observation.
+        policy (DedupPolicy): Window and threshold to apply.
+
+    Returns:
+        Optional[int]: Id of the matching observation, or None.
+    """
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=policy.window_seconds)
+    recent = (
+        Observation.observer_name == observation.observer_name,
+        Observation.created_at >= cutoff,
+    )
+
+    exact = await session.scalar(
+        select(Observation.id)
+        .where(*recent, Observation.content_hash == observation.content_hash)
+        .order_by(Observation.id.desc())
+        .limit(1)
+    )
+    if exact is not None or observation.simhash is None:
+        return exact
+
+    rows = await session.execute(
+        select(Observation.id, Observation.simhash)
+        .where(*recent, Observation.simhash.is_not(None))
+        .order_by(Observation.id.desc())
+        .limit(policy.max_candidates)
+    )
+    for obs_id, other in rows:
+        if similarity(observation.simhash, other) >= policy.threshold:
+            return obs_id
+    return None
+
+
+async def copy_links(session: AsyncSession, source_id: int, target_id: int) -> None:
+    """Link ``target_id`` to every proposition ``source_id`` is linked to."""
+    await session.execute(
+        insert(observation_proposition)
+        .prefix_with("OR IGNORE")
+        .from_select(
+            ["observation_id", "proposition_id"],
+            select(
+                literal(target_id), observation_proposition.c.proposition_id
+            ).where(observation_proposition.c.observation_id == source_id),
+        )
+    )
@@ -0,0 +1,425 @@
+# embeddings.py
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import Optional, Protocol, Sequence
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Proposition
+
+logger = logging.getLogger("gum.embeddings")
+
+
+class Embedder(Protocol):
+    """Turns texts into L2-normalised float32 vectors of a fixed dimension."""
+
+    name: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        ...
+
+
+class HashingEmbedder:
+    """Offline default: hashed character n-grams, no model download needed.
+
+    Catches inflections, compounds and shared sub-words that the porter
+    tokenizer misses, but it is not a semantic model; plug in
+    :class:`SentenceTransformerEmbedder` (or any :class:`Embedder`) for
+    paraphrase-level recall.
+
+    Args:
+        dim (int): Vector dimension. Defaults to 512.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hashing-char-{dim}"
+        self._vectorizer = HashingVectorizer(
+            analyzer="char_wb",
+            ngram_range=(3, 5),
+            n_features=dim,
+            norm="l2",
+        )
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return self._vectorizer.transform(list(texts)).astype(np.float32).toarray()
+
+
+class SentenceTransformerEmbedder:
+    """Local sentence-transformers model (optional dependency).
+
+    Args:
+        model_name (str): Model to load. Defaults to "all-MiniLM-L6-v2".
+    """
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "SentenceTransformerEmbedder requires the sentence-transformers package"
+            ) from e
+        self._model = SentenceTransformer(model_name)
+        self.dim = self._model.get_sentence_embedding_dimension()
+        self.name = f"st-{model_name}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return self._model.encode(
+            list(texts), normalize_embeddings=True, convert_to_numpy=True
+        ).astype(np.float32)
+
+
+def _write_rows(path: str, rows: np.ndarray, start: int) -> None:
+    """Write ``rows[start:]`` to a raw file, appending unless ``start`` is 0."""
+    with open(path, "ab" if start else "wb") as f:
+        f.write(np.ascontiguousarray(rows[start:]).tobytes())
+
+
+def _read_rows(path: str, dtype, count: int, width: int = 0) -> np.ndarray:
+    """Memory-map the first ``count`` rows of a raw file, dropping any torn tail."""
+    shape = (count, width) if width else (count,)
+    if not count:
+        return np.zeros(shape, dtype=dtype)
+    size = count * max(width, 1) * np.dtype(dtype).itemsize
+    if os.path.getsize(path) > size:
+        # rows appended after the last meta.json write never made it into the index
+        os.truncate(path, size)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+class FlatIndex:
+    """Exact inner-product search over every stored vector.
+
+    Vectors live in arrays that grow geometrically, and on disk in raw files
+    that :meth:`save` appends to, so adding a few rows never rewrites the rest.
+
+    Args:
+        dim (int): Vector dimension.
+    """
+
+    kind = "flat"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._n = 0
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._vecs = np.zeros((0, dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[:self._n]
+
+    @property
+    def vecs(self) -> np.ndarray:
+        return self._vecs[:self._n]
+
+    def add(self, ids: np.ndarray, vecs: np.ndarray) -> None:
+        ids = np.asarray(ids, dtype=np.int64)
+        n = self._n + len(ids)
+        if n > len(self._ids):
+            capacity = max(n, 2 * len(self._ids), 64)
+            # also copies a memory-mapped index into memory
+            grown_ids = np.zeros(capacity, dtype=np.int64)
+            grown_vecs = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown_ids[:self._n] = self.ids
+            grown_vecs[:self._n] = self.vecs
+            self._ids, self._vecs = grown_ids, grown_vecs
+        self._ids[self._n:n] = ids
+        self._vecs[self._n:n] = np.asarray(vecs, dtype=np.float32)
+        self._n = n
+
+    def _candidates(self, query: np.ndarray) -> Optional[np.ndarray]:
+        return None
+
+    def search(self, query: np.ndarray, k: int) -> list[tuple[int, float]]:
+        """Top ``k`` ``(id, score)`` pairs by inner product."""
+        if not len(self) or k <= 0:
+            return []
+        rows = self._candidates(query)
+        vecs = self.vecs if rows is None else self.vecs[rows]
+        scores = vecs @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        ids = self.ids if rows is None else self.ids[rows]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+    def save(self, directory: str, start: int = 0) -> None:
+        """Write the rows from ``start`` on; 0 rewrites the files."""
+        _write_rows(os.path.join(directory, "ids.i64"), self.ids, start)
+        _write_rows(os.path.join(directory, "vectors.f32"), self.vecs, start)
+
+    def load(self, directory: str, count: int) -> None:
+        # memory-mapped until the next add copies them
+        self._ids = _read_rows(os.path.join(directory, "ids.i64"), np.int64, count)
+        self._vecs = _read_rows(os.path.join(directory, "vectors.f32"), np.float32, count, self.dim)
+        self._n = count
+
+
+class IVFIndex(FlatIndex):
+    """Inverted-file index: k-means cells, only the ``n_probe`` nearest are scanned.
+
+    Until ``n_lists * 8`` vectors are stored it searches exhaustively; the
+    cells are then trained once and new vectors join their nearest cell.
+
+    Args:
+        dim (int): Vector dimension.
+        n_lists (int): Number of cells. Defaults to 64.
+        n_probe (int): Cells scanned per query. Defaults to 8.
+    """
+
+    kind = "ivf"
+
+    def __init__(self, dim: int, n_lists: int = 64, n_probe: int = 8):
+        super().__init__(dim)
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.centroids: Optional[np.ndarray] = None
+        self.assign = np.zeros(0, dtype=np.int32)
+        self._trained_unsaved = False
+
+    def add(self, ids: np.ndarray, vecs: np.ndarray) -> None:
+        super().add(ids, vecs)
+        if self.centroids is None:
+            if len(self) >= self.n_lists * 8:
+                self._train()
+            return
+        self.assign = np.concatenate([self.assign, self._nearest(np.asarray(vecs, np.float32))])
+
+    def _nearest(self, vecs: np.ndarray) -> np.ndarray:
+        return np.argmax(vecs @ self.centroids.T, axis=1).astype(np.int32)
+
+    def _train(self, iterations: int = 10) -> None:
+        rng = np.random.default_rng(0)
+        vecs = np.asarray(self.vecs)
+        centroids = vecs[rng.choice(len(vecs), self.n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(vecs @ centroids.T, axis=1)
+            for c in range(self.n_lists):
+                members = vecs[assign == c]
+                if len(members):
+                    mean = members.mean(axis=0)
+                    centroids[c] = mean / (np.linalg.norm(mean) or 1.0)
+        self.centroids = centroids
+        self.assign = self._nearest(vecs)
+        self._trained_unsaved = True
+
+    def _candidates(self, query: np.ndarray) -> Optional[np.ndarray]:
+        if self.centroids is None:
+            return None
+        probe = np.argsort(-(self.centroids @ query))[: self.n_probe]
+        return np.flatnonzero(np.isin(self.assign, probe))
+
+    def save(self, directory: str, start: int = 0) -> None:
+        super().save(directory, start)
+        if self.centroids is not None:
+            # training assigns every stored vector, so those files start over
+            first = 0 if self._trained_unsaved else start
+            if first == 0:
+                np.save(os.path.join(directory, "centroids.npy"), self.centroids)
+            _write_rows(os.path.join(directory, "assign.i32"), self.assign, first)
+            self._trained_unsaved = False
+        elif not start:
+            # untrained again after a rebuild
+            for name in ("centroids.npy", "assign.i32"):
+                path = os.path.join(directory, name)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def load(self, directory: str, count: int) -> None:
+        super().load(directory, count)
+        path = os.path.join(directory, "centroids.npy")
+        if os.path.exists(path):
+            self.centroids = np.load(path)
+            self.assign = np.array(_read_rows(os.path.join(directory, "assign.i32"), np.int32, count))
+
+
+def _document(row) -> str:
+    return f"{row.text} {row.reasoning}"
+
+
+def _digest(row) -> str:
+    return hashlib.sha1(_document(row).encode("utf-8")).hexdigest()
+
+
+class EmbeddingIndex:
+    """Dense vectors of every proposition, kept next to the SQLite database.
+
+    :meth:`sync` embeds the propositions with an id above the last indexed id
+    and appends them to the files; gum runs it after each write of new
+    propositions, never on the search path, so a search sees what was synced
+    so far (lexical retrieval still finds the rest). Hits on deleted rows are
+    filtered out by the search query that joins them. SQLite hands the ids of deleted rows at the
+    top of the table out again, though, so the index is rebuilt once the table
+    holds fewer rows than the index or the last indexed id now belongs to
+    another text (a cleanup followed by new propositions).
+
+    Args:
+        embedder (Embedder, optional): Defaults to :class:`HashingEmbedder`.
+        path (str, optional): Directory for the index files; None keeps it in memory.
+        index (str): "flat" for exact search or "ivf" for large stores.
+        n_lists (int): IVF cells.
+        n_probe (int): IVF cells scanned per query.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder | None = None,
+        *,
+        path: str | None = None,
+        index: str = "flat",
+        n_lists: int = 64,
+        n_probe: int = 8,
+    ):
+        self.embedder = embedder or HashingEmbedder()
+        self.path = os.path.expanduser(path) if path else None
+        if index not in ("flat", "ivf"):
+            raise ValueError(f"Unknown index type: {index}")
+        self._kind, self._n_lists, self._n_probe = index, n_lists, n_probe
+        self.index = self._new_index()
+        self.last_id = 0
+        self.last_digest: str | None = None
+        self._saved = 0     # rows already in the files
+        self._lock = asyncio.Lock()
+        self._load()
+
+    def _new_index(self) -> FlatIndex:
+        if self._kind == "ivf":
+            return IVFIndex(self.embedder.dim, self._n_lists, self._n_probe)
+        return FlatIndex(self.embedder.dim)
+
+    def _clear(self) -> None:
+        self.index = self._new_index()
+        self.last_id = 0
+        self.last_digest = None
+        self._saved = 0
+
+    async def reset(self) -> None:
+        """Drop every vector; the next :meth:`sync` embeds all propositions again."""
+        async with self._lock:
+            self._clear()
+            await asyncio.to_thread(self._save)
+
+    def _meta(self) -> dict:
+        return {
+            "embedder": self.embedder.name,
+            "dim": self.embedder.dim,
+            "index": self.index.kind,
+            "layout": "append",
+        }
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        meta_path = os.path.join(self.path, "meta.json")
+        if not os.path.exists(meta_path):
+            return
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if {k: meta.get(k) for k in self._meta()} != self._meta():
+            logger.info("Embedding index was built with different settings; rebuilding")
+            return
+        count = int(meta.get("count", 0))
+        self.index.load(self.path, count)
+        self._saved = count
+        self.last_id = int(meta.get("last_id", 0))
+        self.last_digest = meta.get("last_digest")
+
+    def _save(self) -> None:
+        """Append the rows added since the last save, then commit them in meta.json."""
+        if not self.path:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        self.index.save(self.path, self._saved)
+        self._saved = len(self.index)
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({
+                **self._meta(),
+                "count": self._saved,
+                "last_id": self.last_id,
+                "last_digest": self.last_digest,
+            }, f)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+    async def sync(self, session: AsyncSession, batch_size: int = 256) -> int:
+        """Embed propositions added since the last sync and append them to the files.
+
+        Returns:
+            int: Number of propositions embedded.
+        """
+        async with self._lock:
+            count = await session.scalar(select(func.count()).select_from(Proposition))
+            rebuilt = count < len(self.index)
+            if self.last_id and not rebuilt:
+                last = (await session.execute(
+                    select(Proposition.text, Proposition.reasoning)
+                    .where(Proposition.id == self.last_id)
+                )).one_or_none()
+                rebuilt = last is None or _digest(last) != self.last_digest
+            if rebuilt:
+                logger.info("Propositions were deleted since the last sync; rebuilding the embedding index")
+                self._clear()
+
+            rows = (await session.execute(
+                select(Proposition.id, Proposition.text, Proposition.reasoning)
+                .where(Proposition.id > self.last_id)
+                .order_by(Proposition.id)
+            )).all()
+            if not rows:
+                if rebuilt:
+                    await asyncio.to_thread(self._save)
+                return 0
+            for start in range(0, len(rows), batch_size):
+                chunk = rows[start:start + batch_size]
+                vecs = await asyncio.to_thread(self.embedder.embed, [_document(r) for r in chunk])
+                self.index.add(np.array([r.id for r in chunk]), vecs)
+            self.last_id = rows[-1].id
+            self.last_digest = _digest(rows[-1])
+            await asyncio.to_thread(self._save)
+            return len(rows)
+
+    async def search(self, query: str, k: int) -> list[tuple[int, float]]:
+        """Nearest propositions to ``query`` as ``(id, score)`` pairs, best first.
+
+        Only covers what the last :meth:`sync` indexed.
+        """
+        vec = (await asyncio.to_thread(self.embedder.embed, [query]))[0]
+        return self.index.search(vec, k)
+
+
+_default_index: Optional[EmbeddingIndex] = None
+
+
+def set_default_index(index: Optional[EmbeddingIndex]) -> None:
+    """Make ``index`` the one used by ``mode="HYBRID"`` searches that do not pass one."""
+    global _default_index
+    _default_index = index
+
+
+def get_default_index() -> Optional[EmbeddingIndex]:
+    return _default_index
+
+
+def index_from_env(data_directory: str) -> Optional[EmbeddingIndex]:
+    """Build an index from GUM_EMBEDDING_INDEX ("flat" or "ivf"; unset disables it).
+
+    Files go to ``<data_directory>/embeddings``.
+    """
+    kind = os.getenv("GUM_EMBEDDING_INDEX", "").lower()
+    if kind not in ("flat", "ivf"):
+        return None
+    return EmbeddingIndex(path=os.path.join(data_directory, "embeddings"), index=kind)
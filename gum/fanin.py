@@ -0,0 +1,200 @@
+# fanin.py
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .schemas import Update
+
+
+class Lane(asyncio.Queue):
+    """An observer's ``update_queue`` that notifies a :class:`FanIn` on every put.
+
+    It behaves exactly like :class:`asyncio.Queue` for the observer; the only
+    difference is the ``on_put`` callback, which lets the fan-in learn about new
+    items without parking a getter task on every queue.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.on_put: Optional[Callable[["Lane"], None]] = None
+
+    def _put(self, item) -> None:
+        super()._put(item)
+        if self.on_put is not None:
+            self.on_put(self)
+
+
+@dataclass
+class ObserverPolicy:
+    """Scheduling policy of one observer in the update loop.
+
+    Attributes:
+        priority (int): Observers with a higher priority are always served first.
+        weight (int): Updates taken from this observer per round-robin turn.
+        rate (Optional[float]): Maximum updates per second, or None for no cap.
+        burst (int): Updates that may be taken at once before ``rate`` applies.
+    """
+    priority: int = 0
+    weight: int = 1
+    rate: Optional[float] = None
+    burst: int = 1
+
+
+class _LaneState:
+    __slots__ = ("observer", "queue", "policy", "tokens", "refilled", "served")
+
+    def __init__(self, observer, queue: Lane, policy: ObserverPolicy):
+        self.observer = observer
+        self.queue = queue
+        self.policy = policy
+        self.tokens = float(max(1, policy.burst))
+        self.refilled = time.monotonic()
+        self.served = 0
+
+    def refill(self, now: float) -> None:
+        if self.policy.rate is None:
+            return
+        self.tokens = min(
+            float(max(1, self.policy.burst)),
+            self.tokens + (now - self.refilled) * self.policy.rate,
+        )
+        self.refilled = now
+
+    def wait_time(self) -> float:
+        return (1.0 - self.tokens) / self.policy.rate
+
+
+class FanIn:
+    """Multiplexes the update queues of many observers into one consumer.
+
+    Observers keep calling ``update_queue.put`` as before; their queues are
+    swapped for :class:`Lane` objects that mark the observer as ready. The
+    consumer awaits :meth:`get`, which serves ready observers by priority,
+    round-robin within a priority (``weight`` updates per turn), and skips
+    observers that are over their rate cap until they earn a new token.
+    No task is created per observer or per update.
+
+    Args:
+        policies (dict[str, ObserverPolicy], optional): Policies keyed by observer name.
+        default (ObserverPolicy, optional): Policy for observers without an entry.
+    """
+
+    def __init__(
+        self,
+        policies: dict[str, ObserverPolicy] | None = None,
+        default: ObserverPolicy | None = None,
+    ):
+        self.policies = dict(policies or {})
+        self.default = default or ObserverPolicy()
+        self._lanes: dict[int, _LaneState] = {}
+        self._ready: dict[int, deque[_LaneState]] = {}
+        self._queued: set[int] = set()
+        self._wakeup = asyncio.Event()
+
+    def attach(self, observer) -> None:
+        """Start multiplexing ``observer``; items already queued are kept."""
+        for state in list(self._lanes.values()):
+            if state.observer is observer:
+                self._remove(state)
+
+        queue = observer.update_queue
+        if not isinstance(queue, Lane):
+            lane = Lane()
+            while not queue.empty():
+                lane.put_nowait(queue.get_nowait())
+            observer.update_queue = queue = lane
+
+        state = _LaneState(observer, queue, self.policies.get(observer.name, self.default))
+        self._lanes[id(queue)] = state
+        queue.on_put = self._on_put
+        if not queue.empty():
+            self._on_put(queue)
+
+    def detach(self, observer) -> None:
+        """Stop multiplexing ``observer``; its queue is left as it is."""
+        for state in list(self._lanes.values()):
+            if state.observer is observer:
+                self._remove(state)
+
+    def _remove(self, state: _LaneState) -> None:
+        key = id(state.queue)
+        self._lanes.pop(key, None)
+        self._queued.discard(key)
+        state.queue.on_put = None
+        ring = self._ready.get(state.policy.priority)
+        if ring is not None and state in ring:
+            ring.remove(state)
+
+    def pending(self) -> dict[str, int]:
+        """Queued updates per observer name."""
+        return {s.observer.name: s.queue.qsize() for s in self._lanes.values()}
+
+    def _on_put(self, queue: Lane) -> None:
+        key = id(queue)
+        state = self._lanes.get(key)
+        if state is None or key in self._queued:
+            return
+        self._queued.add(key)
+        self._ready.setdefault(state.policy.priority, deque()).append(state)
+        self._wakeup.set()
+
+    def _next(self) -> tuple[Optional[tuple[object, Update]], Optional[float]]:
+        """Take the next update, or report how long until a capped lane may send."""
+        now = time.monotonic()
+        wait: Optional[float] = None
+
+        for priority in sorted(self._ready, reverse=True):
+            ring = self._ready[priority]
+            for _ in range(len(ring)):
+                state = ring[0]
+                if state.queue.empty():
+                    # drained behind our back (e.g. Observer.get_update)
+                    ring.popleft()
+                    self._queued.discard(id(state.queue))
+                    state.served = 0
+                    continue
+
+                state.refill(now)
+                if state.policy.rate is not None and state.tokens < 1.0:
+                    w = state.wait_time()
+                    wait = w if wait is None else min(wait, w)
+                    state.served = 0
+                    ring.rotate(-1)
+                    continue
+
+                if state.policy.rate is not None:
+                    state.tokens -= 1.0
+                item = state.queue.get_nowait()
+                state.served += 1
+
+                if state.queue.empty():
+                    ring.popleft()
+                    self._queued.discard(id(state.queue))
+                    state.served = 0
+                elif state.served >= max(1, state.policy.weight):
+                    ring.rotate(-1)
+                    state.served = 0
+                return (state.observer, item), None
+
+        return None, wait
+
+    async def get(self) -> tuple[object, Update]:
+        """Wait for the next update to process.
+
+        Returns:
+            tuple[Observer, Update]: The observer and the update it produced.
+        """
+        while True:
+            taken, wait = self._next()
+            if taken is not None:
+                return taken
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
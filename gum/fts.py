@@ -0,0 +1,203 @@
+# fts.py
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import text as sql_text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .db_maintenance import Runner, direct_runner
+from .models import fts_tokenizer_of, rebuild_fts_table, resolve_fts_tokenizer
+
+logger = logging.getLogger("gum.fts")
+
+FTS_TABLES = ("propositions_fts", "observations_fts")
+
+
+def configure_merging(conn, automerge: int = 8, crisismerge: int = 16) -> None:
+    """Set the incremental-merge thresholds stored in each FTS5 table's config.
+
+    Args:
+        conn: SQLite database connection.
+        automerge (int): Segments per level before writers merge them (0 disables).
+        crisismerge (int): Segments per level that force a merge inside the write.
+    """
+    for table in FTS_TABLES:
+        conn.execute(sql_text(
+            f"INSERT INTO {table}({table}, rank) VALUES('automerge', {int(automerge)})"
+        ))
+        conn.execute(sql_text(
+            f"INSERT INTO {table}({table}, rank) VALUES('crisismerge', {int(crisismerge)})"
+        ))
+
+
+def merge_step(conn, table: str, pages: int) -> bool:
+    """Run one bounded ``merge`` on ``table``.
+
+    Returns:
+        bool: True if the merge did work, so another step may help.
+    """
+    before = conn.execute(sql_text("SELECT total_changes()")).scalar()
+    conn.execute(sql_text(f"INSERT INTO {table}({table}, rank) VALUES('merge', {int(pages)})"))
+    # FTS5 reports fewer than two changes once there is nothing left to merge
+    return conn.execute(sql_text("SELECT total_changes()")).scalar() - before >= 2
+
+
+def optimize(conn, table: str) -> None:
+    """Merge every segment of ``table`` into one."""
+    conn.execute(sql_text(f"INSERT INTO {table}({table}) VALUES('optimize')"))
+
+
+async def reindex_fts(engine: AsyncEngine, tokenizer: str, run: Optional[Runner] = None) -> list[str]:
+    """Switch both FTS tables to ``tokenizer`` while the app keeps running.
+
+    Each table is rebuilt in its own transaction; searches see the old index
+    until the new one is committed.
+
+    Args:
+        engine (AsyncEngine): Engine from ``init_db``.
+        tokenizer (str): "porter", "unicode61", "trigram" or a raw FTS5 spec.
+        run (Runner, optional): Runs each rebuild; pass the writer's
+            ``run_exclusive`` while gum is running. Defaults to a fresh
+            connection of ``engine``.
+
+    Returns:
+        list[str]: Tables that were rebuilt.
+
+    Raises:
+        ValueError: If ``tokenizer`` cannot be quoted into an FTS5 spec.
+    """
+    spec = resolve_fts_tokenizer(tokenizer)
+    if not spec or "'" in spec:
+        raise ValueError(f"Invalid FTS5 tokenizer: {tokenizer!r}")
+    run = run or direct_runner(engine)
+
+    def rebuild(conn, table: str) -> bool:
+        if fts_tokenizer_of(conn, table) == spec:
+            return False
+        rebuild_fts_table(conn, table, spec)
+        return True
+
+    rebuilt = []
+    for table in FTS_TABLES:
+        if await run(lambda conn: conn.run_sync(rebuild, table)):
+            rebuilt.append(table)
+    if rebuilt:
+        logger.info(f"Re-indexed {', '.join(rebuilt)} with tokenizer '{spec}'")
+    return rebuilt
+
+
+class FtsMaintenance:
+    """Background task that compacts the FTS5 indexes while gum is idle.
+
+    Every ``interval`` seconds it checks ``is_idle``; when idle it runs bounded
+    ``merge`` steps on both tables (yielding between steps) and, every
+    ``optimize_every`` idle rounds, a full ``optimize``. Each step runs
+    through ``run``, which gum points at its writer's ``run_exclusive``.
+
+    Args:
+        engine (AsyncEngine): Engine from ``init_db``.
+        run (Runner, optional): Runs an ``async (conn) -> result`` operation.
+            Defaults to a fresh connection of ``engine``.
+        is_idle (Callable[[], bool], optional): Returns True when nothing is being
+            ingested. Defaults to always idle.
+        interval (float): Seconds between checks. Defaults to 300.
+        merge_pages (int): Pages per ``merge`` step. Defaults to 500.
+        max_steps (int): Merge steps per table and round. Defaults to 20.
+        optimize_every (int): Idle rounds between full optimizes; 0 never. Defaults to 12.
+        automerge (int): FTS5 ``automerge`` setting. Defaults to 8.
+        crisismerge (int): FTS5 ``crisismerge`` setting. Defaults to 16.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        run: Optional[Runner] = None,
+        is_idle: Optional[Callable[[], bool]] = None,
+        interval: float = 300.0,
+        merge_pages: int = 500,
+        max_steps: int = 20,
+        optimize_every: int = 12,
+        automerge: int = 8,
+        crisismerge: int = 16,
+    ):
+        self.engine = engine
+        self.run = run or direct_runner(engine)
+        self.is_idle = is_idle or (lambda: True)
+        self.interval = interval
+        self.merge_pages = merge_pages
+        self.max_steps = max_steps
+        self.optimize_every = optimize_every
+        self.automerge = automerge
+        self.crisismerge = crisismerge
+        self.stats = {"rounds": 0, "skipped": 0, "merge_steps": 0, "optimizes": 0}
+        self._task: Optional[asyncio.Task] = None
+
+    async def configure(self) -> None:
+        await self.run(
+            lambda conn: conn.run_sync(configure_merging, self.automerge, self.crisismerge)
+        )
+
+    async def run_once(self, optimize_now: bool = False) -> dict[str, int]:
+        """One maintenance round regardless of idleness.
+
+        Returns:
+            dict[str, int]: Merge steps run per table.
+        """
+        steps: dict[str, int] = {}
+        for table in FTS_TABLES:
+            steps[table] = 0
+            for _ in range(self.max_steps):
+                more = await self.run(
+                    lambda conn: conn.run_sync(merge_step, table, self.merge_pages)
+                )
+                steps[table] += 1
+                if not more:
+                    break
+                await asyncio.sleep(0)      # let writers in between steps
+            if optimize_now:
+                await self.run(lambda conn: conn.run_sync(optimize, table))
+        self.stats["merge_steps"] += sum(steps.values())
+        if optimize_now:
+            self.stats["optimizes"] += 1
+        return steps
+
+    async def _loop(self) -> None:
+        idle_rounds = 0
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self.is_idle():
+                self.stats["skipped"] += 1
+                continue
+            idle_rounds += 1
+            started = time.monotonic()
+            try:
+                await self.run_once(
+                    optimize_now=bool(self.optimize_every) and idle_rounds % self.optimize_every == 0
+                )
+            except Exception as e:
+                logger.warning(f"FTS maintenance round failed: {e}")
+                continue
+            self.stats["rounds"] += 1
+            logger.debug(f"FTS maintenance round took {time.monotonic() - started:.2f}s")
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        await self.configure()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
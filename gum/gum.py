@@ -3,23 +3,42 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import os
 from uuid import uuid4
 from contextlib import asynccontextmanager
-from datetime import datetime, timezone
-from typing import Callable, List
-from .models import observation_proposition
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List, TypeVar
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import insert
+from sqlalchemy import delete, exists, select
 
 from .db_utils import (
+    LinkBatch,
     get_related_observations,
     search_propositions_bm25,
+    search_propositions_bm25_many,
 )
-from .models import Observation, Proposition, init_db
+from .cold_storage import BATCH_SIZE as COLD_BATCH_SIZE, move_to_cold_storage
+from .db_maintenance import DatabaseMaintenance
+from .dedup import DedupPolicy, content_hash, copy_links, find_duplicate, simhash
+from .embeddings import EmbeddingIndex, index_from_env, set_default_index
+from .fanin import FanIn, ObserverPolicy
+from .fts import FtsMaintenance, reindex_fts
+from .ingest import STAGES, IngestJob, IngestPipeline, UpdateCoalescer, merge_updates
+from .journal import UpdateJournal, attach_journal, journal_ids
+from .models import (
+    Observation,
+    Proposition,
+    init_db,
+    observation_proposition,
+    purge_fts_tombstones,
+)
+from .query_cache import DataGeneration, QueryCache
+from .relations import LocalRelationClassifier
+from .retention import RetentionEngine, RetentionPolicy, search_archive
+from .search_profile import SearchProfile
+from .storage import SQLiteWriter, create_reader
 from .observers import Observer
 from .schemas import (
     PropositionItem,
@@ -28,8 +47,11 @@ from .schemas import (
     Update,
     AuditSchema
 )
+from .structured_output import decode_json, parse_structured, response_format_for
 from gum.prompts.gum import AUDIT_PROMPT, PROPOSE_PROMPT, REVISE_PROMPT, SIMILAR_PROMPT
 
+T = TypeVar("T")
+
 class gum:
     """A class for managing general user models.
 
@@ -50,7 +72,64 @@ class gum:
         audit_prompt (str, optional): Custom prompt for auditing.
         data_directory (str, optional): Directory for storing data. Defaults to "~/.cache/gum".
         db_name (str, optional): Name of the database file. Defaults to "gum.db".
-        max_concurrent_updates (int, optional): Maximum number of concurrent updates. Defaults to 4.
+        max_concurrent_updates (int, optional): Default number of workers per ingest stage. Defaults to 4.
+        stage_concurrency (dict[str, int], optional): Per-stage worker counts overriding
+            ``max_concurrent_updates`` (keys: persist, propose, search, relate, revise).
+        stage_queue_size (int, optional): Capacity of each ingest stage queue. Defaults to 32.
+        coalesce_window_ms (int, optional): If set, text updates from the same observer that
+            arrive within this window share one proposition call. Defaults to None (off).
+        coalesce_max_chars (int, optional): Character budget of one coalesced burst. Defaults to 8000.
+        journal_enabled (bool, optional): Journal observer updates to disk and replay the
+            unacknowledged ones on the next start. Defaults to False.
+        journal_high_watermark (int, optional): Pending journal entries at which observers
+            are paused. Defaults to 1000.
+        journal_low_watermark (int, optional): Pending journal entries at which observers
+            resume. Defaults to 500.
+        observer_policies (dict[str, ObserverPolicy], optional): Per-observer priority, round-robin
+            weight and rate cap used by the update loop (see :class:`~gum.fanin.ObserverPolicy`).
+            Defaults to None (equal priority, no caps).
+        dedup_policies (dict[str, DedupPolicy], optional): Per-observer deduplication. A new
+            observation that matches a recent one from the same observer (see
+            :class:`~gum.dedup.DedupPolicy`) is stored and linked to the same propositions,
+            but skips the model stages; if the match is still being ingested, the copy
+            waits for it. Defaults to None (no deduplication).
+        relation_prefilter (bool, optional): Label obvious IDENTICAL/UNRELATED candidates
+            locally and only send the ambiguous ones to the similarity prompt. Defaults to True.
+        identical_threshold (float, optional): Cosine similarity at which the prefilter labels
+            two propositions IDENTICAL. Defaults to 0.9.
+        unrelated_threshold (float, optional): Cosine similarity below which the prefilter
+            labels a proposition UNRELATED. Defaults to 0.15.
+        embedding_index (EmbeddingIndex, optional): Dense index used by ``mode="HYBRID"``
+            queries, synced in the background after propositions are written. Defaults
+            to the one configured by GUM_EMBEDDING_INDEX, if any.
+        query_cache_size (int, optional): Results of :meth:`query` kept in memory; 0
+            disables the cache. Entries are dropped on any proposition or link write.
+            Defaults to 256.
+        query_cache_ttl (float, optional): Seconds a cached result may be served.
+            Defaults to 60.
+        fts_tokenizer (str, optional): Full-text tokenizer: "porter", "unicode61" (any
+            script) or "trigram" (substrings). Changing it re-indexes on the next start.
+            Defaults to GUM_FTS_TOKENIZER, else "porter".
+        fts_maintenance_interval (float, optional): Seconds between checks for idle
+            periods in which the FTS indexes are merged; None disables it. Defaults to 300.
+        reader_pool_size (int, optional): Read-only connections for queries and listings. Defaults to 4.
+        sqlite_profile (str, optional): SQLite PRAGMA profile: "durable", "balanced" or
+            "throughput". Defaults to GUM_SQLITE_PROFILE, then "balanced".
+        db_maintenance_interval (float, optional): Seconds between WAL checkpoints
+            (with a periodic ``PRAGMA optimize``); None disables them. Defaults to 60.
+        cold_storage_days (float, optional): Age in days after which observation bodies are
+            compressed into cold storage (a preview stays inline, search is unaffected); moved
+            during idle maintenance rounds. Defaults to None (off); ``gum --cold-storage-days``
+            enables it from the command line.
+        retention_policies (dict[str, RetentionPolicy], optional): Per-table age limits
+            ("observations", "propositions" for superseded revisions, "suggestions" for
+            delivered ones) past which rows move to monthly archive databases during idle
+            maintenance rounds (see :class:`~gum.retention.RetentionEngine`). Defaults to
+            None (nothing is archived); ``gum --retention`` applies
+            :data:`~gum.retention.DEFAULT_RETENTION`.
+        archive_directory (str, optional): Where the archives live. Defaults to
+            ``<data_directory>/archive``.
+        write_batch_size (int, optional): Most writes committed together by the writer task. Defaults to 64.
         verbosity (int, optional): Logging verbosity level. Defaults to logging.INFO.
         audit_enabled (bool, optional): Whether to enable auditing. Defaults to False.
         api_base (str, optional): Deprecated, use environment variables instead.
@@ -69,6 +148,30 @@ class gum:
         data_directory: str = "~/.cache/gum",
         db_name: str = "gum.db",
         max_concurrent_updates: int = 4,
+        stage_concurrency: dict[str, int] | None = None,
+        stage_queue_size: int = 32,
+        coalesce_window_ms: int | None = None,
+        coalesce_max_chars: int = 8000,
+        journal_enabled: bool = False,
+        journal_high_watermark: int = 1000,
+        journal_low_watermark: int = 500,
+        observer_policies: dict[str, ObserverPolicy] | None = None,
+        dedup_policies: dict[str, DedupPolicy] | None = None,
+        relation_prefilter: bool = True,
+        identical_threshold: float = 0.9,
+        unrelated_threshold: float = 0.15,
+        embedding_index: EmbeddingIndex | None = None,
+        query_cache_size: int = 256,
+        query_cache_ttl: float = 60.0,
+        fts_tokenizer: str | None = None,
+        fts_maintenance_interval: float | None = 300.0,
+        reader_pool_size: int = 4,
+        write_batch_size: int = 64,
+        sqlite_profile: str | None = None,
+        db_maintenance_interval: float | None = 60.0,
+        cold_storage_days: float | None = None,
+        retention_policies: dict[str, RetentionPolicy] | None = None,
+        archive_directory: str | None = None,
         verbosity: int = logging.INFO,
         audit_enabled: bool = False,
         api_base: str | None = None,
@@ -103,10 +206,85 @@ class gum:
 
         self.engine = None
         self.Session = None
+        self.reader_engine = None
+        self.ReadSession = None
+        self._writer: SQLiteWriter | None = None
+        self._reader_pool_size = reader_pool_size
+        self._sqlite_profile = sqlite_profile
+        self._db_maintenance_interval = db_maintenance_interval
+        self._db_maintenance: DatabaseMaintenance | None = None
+        self._cold_storage_days = cold_storage_days
+        self._retention_policies = retention_policies
+        self._retention: RetentionEngine | None = None
+        self.archive_directory = os.path.expanduser(
+            archive_directory or os.path.join(data_directory, "archive")
+        )
+        self._write_batch_size = write_batch_size
         self._db_name        = db_name
         self._data_directory = data_directory
+        self._fts_tokenizer  = fts_tokenizer
+        self._fts_maintenance_interval = fts_maintenance_interval
+        self._fts_maintenance: FtsMaintenance | None = None
+        self._idle_generation = -1
+
+        # ingestion runs as a staged pipeline so that no DB transaction is held
+        # open while waiting on the model
+        concurrency = {name: max_concurrent_updates for name in STAGES}
+        concurrency.update(stage_concurrency or {})
+        self._pipeline = IngestPipeline(
+            [
+                ("persist", self._stage_persist, concurrency["persist"]),
+                ("propose", self._stage_propose, concurrency["propose"]),
+                ("search", self._stage_search, concurrency["search"]),
+                ("relate", self._stage_relate, concurrency["relate"]),
+                ("revise", self._stage_revise, concurrency["revise"]),
+            ],
+            queue_size=stage_queue_size,
+            on_failure=self._discard_failed,
+        )
+        self._coalescer = (
+            UpdateCoalescer(self._run_with_gate, coalesce_window_ms, coalesce_max_chars)
+            if coalesce_window_ms
+            else None
+        )
+        # every observer queue feeds one scheduler instead of a getter task each
+        self._fanin = FanIn(observer_policies)
+
+        self._dedup_policies = dict(dedup_policies or {})
+        self.dedup_stats = {"checked": 0, "duplicates": 0}
+        # observation id -> future of the job still ingesting it
+        self._inflight: dict[int, asyncio.Future] = {}
+
+        # settles clear-cut relation labels without a model call
+        self._relation_prefilter = (
+            LocalRelationClassifier(identical_threshold, unrelated_threshold)
+            if relation_prefilter
+            else None
+        )
+
+        # dense side of hybrid search; also serves Gumbo and chat retrieval
+        self.embedding_index = embedding_index or index_from_env(data_directory)
+        if self.embedding_index is not None:
+            set_default_index(self.embedding_index)
+        self._embedding_sync: asyncio.Task | None = None
+        self._embedding_sync_pending = False
+
+        # repeated queries are served from memory until the data changes
+        self._generation = DataGeneration()
+        self._query_cache = (
+            QueryCache(query_cache_size, query_cache_ttl) if query_cache_size > 0 else None
+        )
 
-        self._update_sem = asyncio.Semaphore(max_concurrent_updates)
+        # durable record of updates between the observer queue and the final commit
+        self._journal = (
+            UpdateJournal(
+                os.path.join(data_directory, "ingest_journal.db"),
+                high_watermark=journal_high_watermark,
+                low_watermark=journal_low_watermark,
+            )
+            if journal_enabled
+            else None
+        )
         self._tasks: set[asyncio.Task] = set()
         self._loop_task: asyncio.Task | None = None
         self.update_handlers: list[Callable[[Observer, Update], None]] = []
@@ -120,137 +298,6 @@ class gum:
             self.logger.info("Unified AI client initialized for GUM")
         return self.ai_client
 
-    def _parse_ai_json_response(self, response_content: str, expected_key: str = None):
-        """Parse JSON from AI response content with fallback handling."""
-        
-        # Add detailed logging for debugging
-        self.logger.info(f"JSON Parsing Debug - Input Analysis:")
-        self.logger.info(f"   Response length: {len(response_content)} characters")
-        self.logger.info(f"   Expected key: {expected_key}")
-        self.logger.info(f"   Raw response (first 300 chars): {response_content[:300]}...")
-        self.logger.info(f"   Raw response (last 100 chars): ...{response_content[-100:]}")
-        
-        try:
-            # Try to parse the response as JSON directly
-            self.logger.info("Attempting direct JSON parsing...")
-            parsed_response = json.loads(response_content)
-            self.logger.info(f"Direct JSON parsing successful!")
-            self.logger.info(f"   Parsed keys: {list(parsed_response.keys()) if isinstance(parsed_response, dict) else 'Not a dict'}")
-            
-            if expected_key and expected_key in parsed_response:
-                self.logger.info(f"Found expected key '{expected_key}' in response")
-                return parsed_response[expected_key]
-            return parsed_response
-            
-        except json.JSONDecodeError as e:
-            self.logger.warning(f"Direct JSON parsing failed: {e}")
-            
-            # Try to extract JSON from markdown code blocks first
-            import re
-            
-            self.logger.info("Attempting markdown JSON extraction...")
-            # Look for JSON in markdown code blocks - handle both complete and truncated blocks
-            markdown_match = re.search(r'```(?:json)?\s*(.*?)(?:```|\Z)', response_content, re.DOTALL)
-            if markdown_match:
-                json_content = markdown_match.group(1).strip()
-                self.logger.info(f"Extracted JSON from markdown (length: {len(json_content)}):")
-                self.logger.info(f"   Extracted content: {json_content}")
-                
-                # Try to parse the extracted content as-is first
-                try:
-                    parsed_response = json.loads(json_content)
-                    self.logger.info(f"Markdown JSON parsing successful!")
-                    self.logger.info(f"   Parsed keys: {list(parsed_response.keys()) if isinstance(parsed_response, dict) else 'Not a dict'}")
-                    
-                    if expected_key and expected_key in parsed_response:
-                        self.logger.info(f"Found expected key '{expected_key}' in markdown JSON")
-                        return parsed_response[expected_key]
-                    return parsed_response
-                    
-                except json.JSONDecodeError as e:
-                    self.logger.warning(f"Failed to parse extracted JSON as-is: {e}")
-                    
-                    # Try to repair truncated JSON by finding the last complete object
-                    self.logger.info("Attempting to repair truncated JSON...")
-                    
-                    # Find the last complete JSON object/array
-                    brace_count = 0
-                    bracket_count = 0
-                    last_complete_pos = -1
-                    
-                    for i, char in enumerate(json_content):
-                        if char == '{':
-                            brace_count += 1
-                        elif char == '}':
-                            brace_count -= 1
-                        elif char == '[':
-                            bracket_count += 1
-                        elif char == ']':
-                            bracket_count -= 1
-                            
-                        # Check if we have a complete structure
-                        if brace_count == 0 and bracket_count == 0 and i > 0:
-                            last_complete_pos = i + 1
-                    
-                    if last_complete_pos > 0:
-                        repaired_json = json_content[:last_complete_pos]
-                        self.logger.info(f"Attempting repair with content up to position {last_complete_pos}")
-                        self.logger.info(f"   Repaired JSON: {repaired_json}")
-                        
-                        try:
-                            parsed_response = json.loads(repaired_json)
-                            self.logger.info(f"Repaired JSON parsing successful!")
-                            self.logger.info(f"   Parsed keys: {list(parsed_response.keys()) if isinstance(parsed_response, dict) else 'Not a dict'}")
-                            
-                            if expected_key and expected_key in parsed_response:
-                                self.logger.info(f"Found expected key '{expected_key}' in repaired JSON")
-                                return parsed_response[expected_key]
-                            return parsed_response
-                            
-                        except json.JSONDecodeError as e2:
-                            self.logger.error(f"Repair attempt also failed: {e2}")
-                    else:
-                        self.logger.warning("Could not find a complete JSON structure to repair")
-                        
-            else:
-                self.logger.warning("No markdown code blocks found")
-            
-            # Fallback: look for any JSON-like structure
-            self.logger.info("Attempting fallback JSON pattern matching...")
-            json_match = re.search(r'\{.*\}', response_content, re.DOTALL)
-            if json_match:
-                json_candidate = json_match.group(0)
-                self.logger.info(f"Found JSON-like pattern (length: {len(json_candidate)}):")
-                self.logger.info(f"   JSON candidate: {json_candidate}")
-                
-                try:
-                    parsed_response = json.loads(json_candidate)
-                    self.logger.info(f"Fallback JSON parsing successful!")
-                    self.logger.info(f"   Parsed keys: {list(parsed_response.keys()) if isinstance(parsed_response, dict) else 'Not a dict'}")
-                    
-                    if expected_key and expected_key in parsed_response:
-                        self.logger.info(f"Found expected key '{expected_key}' in fallback JSON")
-                        return parsed_response[expected_key]
-                    return parsed_response
-                    
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"Fallback JSON parsing also failed: {e}")
-                    self.logger.error(f"   Problematic content: {json_candidate}")
-            else:
-                self.logger.warning("No JSON-like patterns found")
-            
-            # If JSON parsing fails, log the response and return appropriate default
-            self.logger.error(f"ALL JSON parsing methods failed!")
-            self.logger.error(f"   Full response content:")
-            self.logger.error(f"   {response_content}")
-            
-            if expected_key == "propositions":
-                self.logger.info("Returning empty list for propositions")
-                return []
-            else:
-                self.logger.info("Returning empty dict")
-                return {}
-
     def start_update_loop(self):
         """Start the asynchronous update loop for processing observer updates."""
         if self._loop_task is None:
@@ -265,13 +312,30 @@ class gum:
             except asyncio.CancelledError:
                 pass
             self._loop_task = None
+        if self._coalescer is not None:
+            await self._coalescer.flush_all()
 
     async def connect_db(self):
         """Initialize the database connection if not already connected."""
         if self.engine is None:
             self.engine, self.Session = await init_db(
-                self._db_name, self._data_directory
+                self._db_name,
+                self._data_directory,
+                fts_tokenizer=self._fts_tokenizer,
+                sqlite_profile=self._sqlite_profile,
+            )
+            self._generation.track(self.engine)
+            # searches and listings read from their own pool; every write goes
+            # through one task that commits queued writes together
+            self.reader_engine, self.ReadSession = create_reader(
+                self.engine, self._reader_pool_size, self._sqlite_profile
+            )
+            self._writer = SQLiteWriter(
+                self.Session,
+                max_batch=self._write_batch_size,
+                on_commit=self._generation.committed,
             )
+            self._writer.start()
 
     async def __aenter__(self):
         """Async context manager entry point.
@@ -280,9 +344,144 @@ class gum:
             gum: The instance of the gum class.
         """
         await self.connect_db()
+
+        # snapshot the journal first: updates still queued in an observer are
+        # journaled by attach_journal and reach the pipeline through the queue
+        replay = self._journal.replay() if self._journal is not None else []
+
+        for obs in self.observers:
+            attach_journal(obs, self._journal)
+            self._fanin.attach(obs)
+
+        if replay:
+            self.logger.info(f"Replaying {len(replay)} unacknowledged update(s) from the journal")
+        for observer_name, update in replay:
+            await self._submit(observer_name, update)
+
         self.start_update_loop()
+        # propositions written while the index was off or behind
+        self._sync_embeddings()
+
+        if self._fts_maintenance_interval:
+            self._fts_maintenance = FtsMaintenance(
+                self.engine,
+                run=self._writer.run_exclusive,
+                is_idle=self._is_idle,
+                interval=self._fts_maintenance_interval,
+            )
+            await self._fts_maintenance.start()
+        if self._db_maintenance_interval:
+            self._db_maintenance = DatabaseMaintenance(
+                self.engine,
+                run=self._writer.run_exclusive,
+                is_idle=self._is_ingest_idle,
+                interval=self._db_maintenance_interval,
+                idle_tasks=[
+                    task for task, enabled in (
+                        (self.apply_retention, self._retention_policies),
+                        (self.move_to_cold_storage, self._cold_storage_days is not None),
+                        (self.purge_fts_tombstones, True),
+                    ) if enabled
+                ],
+            )
+            await self._db_maintenance.start()
         return self
 
+    def _is_idle(self) -> bool:
+        """True if nothing was written or queued since the previous call."""
+        generation = self._generation.value
+        idle = (
+            generation == self._idle_generation
+            and self._pipeline.in_flight == 0
+        )
+        self._idle_generation = generation
+        return idle
+
+    def _is_ingest_idle(self) -> bool:
+        """True if no update is queued or in flight."""
+        return self._pipeline.in_flight == 0
+
+    async def apply_retention(self) -> dict[str, int]:
+        """Archive the rows that ``retention_policies`` no longer keep live.
+
+        Returns:
+            dict[str, int]: Rows moved per table (empty without policies).
+        """
+        if not self._retention_policies:
+            return {}
+        await self.connect_db()
+        if self._retention is None:
+            self._retention = RetentionEngine(
+                self.engine,
+                self.write,
+                self.archive_directory,
+                self._retention_policies,
+                is_idle=self._is_ingest_idle,
+            )
+        return await self._retention.run_once()
+
+    async def search_archive(self, user_query: str, **kwargs) -> list[dict]:
+        """Full-text search over the archived months; see :func:`~gum.retention.search_archive`."""
+        await self.connect_db()
+        return await search_archive(
+            self.reader_engine, self.archive_directory, user_query, **kwargs
+        )
+
+    async def move_to_cold_storage(self) -> int:
+        """Compress the bodies of observations older than ``cold_storage_days``.
+
+        Runs batch by batch through the writer and stops early once an
+        update is being ingested.
+
+        Returns:
+            int: Number of observations moved.
+        """
+        if self._cold_storage_days is None:
+            return 0
+        older_than = (
+            datetime.now(timezone.utc).replace(tzinfo=None)
+            - timedelta(days=self._cold_storage_days)
+        )
+        moved = 0
+        while self._is_ingest_idle():
+            batch = await self.write(lambda session: move_to_cold_storage(session, older_than))
+            moved += batch
+            if batch < COLD_BATCH_SIZE:
+                break
+        if moved:
+            self.logger.info(f"Moved {moved} observation bodies to cold storage")
+        return moved
+
+    async def purge_fts_tombstones(self) -> int:
+        """Drop deleted cold observations from the full-text index.
+
+        Returns:
+            int: Number of index entries removed.
+        """
+        return await self.write(lambda session: session.run_sync(purge_fts_tombstones))
+
+    async def reindex_fts(self, tokenizer: str) -> list[str]:
+        """Switch the full-text indexes to ``tokenizer`` without stopping gum.
+
+        Each rebuild runs through the writer between write batches; queries
+        keep using the old index until its replacement is committed. The
+        switch lasts for this instance only: pass ``fts_tokenizer`` (or set
+        ``GUM_FTS_TOKENIZER``) to keep it on the next start.
+
+        Args:
+            tokenizer (str): "porter", "unicode61", "trigram" or a raw FTS5 spec.
+
+        Returns:
+            list[str]: Tables that were rebuilt (empty if already on ``tokenizer``).
+        """
+        await self.connect_db()
+        rebuilt = await reindex_fts(self.engine, tokenizer, run=self._writer.run_exclusive)
+        self._fts_tokenizer = tokenizer
+        if rebuilt:
+            # cached results were ranked by the old index
+            self._generation.bump()
+        return rebuilt
+
     async def __aexit__(self, exc_type, exc, tb):
         """Async context manager exit point.
         
@@ -292,50 +491,93 @@ class gum:
             tb: The traceback if any.
         """
         await self.stop_update_loop()
-
-        # wait for any in-flight handlers
+        # maintenance tasks write through the writer, so they go before it
+        if self._fts_maintenance is not None:
+            await self._fts_maintenance.stop()
+            self._fts_maintenance = None
+        if self._db_maintenance is not None:
+            await self._db_maintenance.stop()
+            self._db_maintenance = None
+
+        # wait for any in-flight updates, then for the tasks they spawned
+        if self._pipeline.running:
+            await self._pipeline.join()
+            await self._pipeline.stop()
         if self._tasks:
             await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._writer is not None:
+            await self._writer.stop()
 
         # stop observers
         for obs in self.observers:
             await obs.stop()
 
+        if self._journal is not None:
+            self._journal.close()
+
     async def _update_loop(self):
         """Efficiently wait for any observer to produce an Update and dispatch it.
         
-        This method continuously monitors all observers for updates and processes them
-        through the semaphore-guarded handler.
+        All observer queues feed a single :class:`~gum.fanin.FanIn`, which picks the
+        next update by priority, round-robin and rate caps; the update is then
+        admitted into the ingest pipeline.
         """
         while True:
-            gets = {
-                asyncio.create_task(obs.update_queue.get()): obs
-                for obs in self.observers
-            }
+            obs, upd = await self._fanin.get()
 
-            done, _ = await asyncio.wait(
-                gets.keys(), return_when=asyncio.FIRST_COMPLETED
-            )
+            if self._coalescer is not None:
+                await self._coalescer.add(obs, upd)
+            else:
+                await self._run_with_gate(obs, upd)
 
-            for fut in done:
-                upd: Update = fut.result()
-                obs = gets[fut]
+    async def _run_with_gate(
+        self, observer: Observer, update: Update | list[Update]
+    ) -> asyncio.Future:
+        """Admit an update (or a coalesced burst) into the ingest pipeline without waiting for it.
 
-                t = asyncio.create_task(self._run_with_gate(obs, upd))
-                self._tasks.add(t)
+        Blocks while the first stage queue is full, so a slow model pushes back on
+        the update loop instead of piling up tasks.
 
-    async def _run_with_gate(self, observer: Observer, update: Update):
-        """Wrapper that enforces max_concurrent_updates.
-        
         Args:
             observer (Observer): The observer that generated the update.
-            update (Update): The update to process.
+            update (Update | list[Update]): The update, or burst of updates, to process.
+
+        Returns:
+            asyncio.Future: Resolves once the update has been fully processed.
         """
-        async with self._update_sem:
-            try:
-                await self._default_handler(observer, update)
-            finally:
-                self._tasks.discard(asyncio.current_task())
+        return await self._submit(observer.name, update)
+
+    async def _submit(
+        self, observer_name: str, update: Update | list[Update]
+    ) -> asyncio.Future:
+        fut = await self._pipeline.submit(observer_name, update)
+        if self._journal is not None:
+            ids = journal_ids(update if isinstance(update, list) else [update])
+            if ids:
+                fut.add_done_callback(lambda f: self._settle_journal(f, ids))
+        fut.add_done_callback(self._log_job_failure)
+        return fut
+
+    def _settle_journal(self, fut: asyncio.Future, ids: list[int]) -> None:
+        # ack only once the revise stage committed (or the job ended cleanly);
+        # failed or cancelled jobs stay in the journal for the next replay
+        if fut.cancelled():
+            self._journal.release(ids, failed=False)
+        elif fut.exception() is not None:
+            self._journal.release(ids)
+        else:
+            self._journal.ack(ids)
+
+    @property
+    def relation_stats(self) -> dict[str, int]:
+        """Counters of the local relation prefilter, e.g. ``llm_calls_avoided``."""
+        if self._relation_prefilter is None:
+            return {}
+        return dict(self._relation_prefilter.stats)
+
+    def _log_job_failure(self, fut: asyncio.Future) -> None:
+        if not fut.cancelled() and fut.exception() is not None:
+            self.logger.error(f"Update processing failed: {fut.exception()}")
 
     async def _construct_propositions(self, update: Update) -> list[PropositionItem]:
         """Generate propositions from an update.
@@ -351,18 +593,52 @@ class gum:
             .replace("{inputs}", update.content)
         )
 
-        # Get the unified AI client
+        parsed = await self._complete(
+            prompt, PropositionSchema, lambda text: parse_structured(text, PropositionSchema)
+        )
+        return [p.model_dump() for p in parsed.propositions] if parsed else []
+
+    async def _complete(
+        self,
+        prompt: str,
+        schema: type,
+        parse: Callable[[str], T | None],
+        max_tokens: int = 2000,
+        temperature: float = 0.1,
+    ) -> T | None:
+        """Run a cached structured completion and parse the response.
+
+        Only responses that ``parse`` accepts are cached, so a malformed answer
+        is asked for again on the next attempt instead of being replayed.
+
+        Args:
+            prompt (str): The user prompt.
+            schema (type): Pydantic model requested as ``response_format``.
+            parse (Callable[[str], T | None]): Parser returning None for unusable responses.
+            max_tokens (int, optional): Defaults to 2000.
+            temperature (float, optional): Defaults to 0.1.
+
+        Returns:
+            T | None: The parsed response, or None if it could not be parsed.
+        """
+        parsed: dict[str, T | None] = {}
+
+        def _accept(text: str) -> bool:
+            parsed[text] = parse(text)
+            return parsed[text] is not None
+
         client = await self._get_ai_client()
-        
-        # Make the API call using the unified client
         response_content = await client.text_completion(
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=2000,
-            temperature=0.1
+            max_tokens=max_tokens,
+            temperature=temperature,
+            cache=True,
+            response_format=response_format_for(schema),
+            validate=_accept,
         )
-
-        # Parse the JSON response
-        return self._parse_ai_json_response(response_content, "propositions")
+        if response_content not in parsed:
+            _accept(response_content)
+        return parsed[response_content]
 
     async def _build_relation_prompt(self, all_props) -> str:
         """Build a prompt for analyzing relationships between propositions.
@@ -395,32 +671,61 @@ class gum:
         if not rel_props:
             return [], [], []
 
+        id_to_prop = {p.id: p for p in rel_props}
+        if self._relation_prefilter is not None:
+            local = self._relation_prefilter.classify(rel_props)
+            ident, unrel = set(local.identical), set(local.unrelated)
+            sim: set[int] = set()
+            if local.ambiguous:
+                llm = await self._label_relations(local.ambiguous)
+                if llm is None:
+                    return [], [], []
+                ident |= llm[0]
+                sim |= llm[1]
+                unrel |= llm[2]
+        else:
+            llm = await self._label_relations(rel_props)
+            if llm is None:
+                return [], [], []
+            ident, sim, unrel = llm
+
+        # only keep IDs we actually know about
+        valid_ids = set(id_to_prop.keys())
+        ident &= valid_ids
+        sim &= valid_ids
+        unrel &= valid_ids
+
+        return (
+            [id_to_prop[i] for i in ident],
+            [id_to_prop[i] for i in sim - ident],
+            [id_to_prop[i] for i in unrel - ident - sim],
+        )
+
+    async def _label_relations(
+        self, rel_props: list[Proposition]
+    ) -> tuple[set[int], set[int], set[int]] | None:
+        """Ask the model to label a set of propositions.
+
+        Args:
+            rel_props (list[Proposition]): Propositions to label.
+
+        Returns:
+            tuple[set[int], set[int], set[int]] | None: Identical, similar and unrelated
+                ids, or None if the response could not be parsed.
+        """
         payload = [
             {"id": p.id, "proposition": p.text, "reasoning": p.reasoning or ""}
             for p in rel_props
         ]
         prompt_text = await self._build_relation_prompt(payload)
 
-        # Get the unified AI client
-        client = await self._get_ai_client()
-        
-        # Make the API call using the unified client
-        response_content = await client.text_completion(
-            messages=[{"role": "user", "content": prompt_text}],
-            max_tokens=2000,
-            temperature=0.1
+        data = await self._complete(
+            prompt_text, RelationSchema, lambda text: parse_structured(text, RelationSchema)
         )
+        if data is None:
+            self.logger.error("Failed to parse relation data")
+            return None
 
-        # Parse the JSON response and validate
-        try:
-            relations_data = self._parse_ai_json_response(response_content, "relations")
-            data = RelationSchema.model_validate({"relations": relations_data})
-        except Exception as e:
-            self.logger.error(f"Failed to parse relation data: {e}")
-            # Return empty groups if parsing fails
-            return [], [], []
-
-        id_to_prop = {p.id: p for p in rel_props}
         ident, sim, unrel = set(), set(), set()
 
         for r in data.relations:
@@ -433,17 +738,7 @@ class gum:
             else:
                 unrel.add(r.source)
 
-        # only keep IDs we actually know about
-        valid_ids = set(id_to_prop.keys())
-        ident &= valid_ids
-        sim &= valid_ids
-        unrel &= valid_ids
-
-        return (
-            [id_to_prop[i] for i in ident],
-            [id_to_prop[i] for i in sim - ident],
-            [id_to_prop[i] for i in unrel - ident - sim],
-        )
+        return ident, sim, unrel
 
     async def _build_revision_body(
         self, similar: List[Proposition], related_obs: List[Observation]
@@ -482,30 +777,29 @@ class gum:
         """
         body = await self._build_revision_body(similar_cluster, related_obs)
         prompt = self.revise_prompt.replace("{body}", body).replace("{user_name}", self.user_name)
-        
-        # Get the unified AI client
-        client = await self._get_ai_client()
-        
-        # Make the API call using the unified client
-        response_content = await client.text_completion(
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=2000,
-            temperature=0.1
+
+        parsed = await self._complete(
+            prompt, PropositionSchema, lambda text: parse_structured(text, PropositionSchema)
         )
+        return [p.model_dump() for p in parsed.propositions] if parsed else []
 
-        # Parse the JSON response
-        return self._parse_ai_json_response(response_content, "propositions")
+    async def _search_candidates(
+        self, drafts_raw: list[dict]
+    ) -> tuple[list[Proposition], list[Proposition]]:
+        """Build draft propositions and find existing candidates for them.
 
-    async def _generate_and_search(
-        self, session: AsyncSession, update: Update, obs: Observation
-    ) -> list[Proposition]:
+        The search runs on the read pool, so the writer is not held while it
+        ranks and re-ranks hits; the drafts are persisted by the caller.
 
-        drafts_raw = await self._construct_propositions(update)
-        drafts: list[Proposition] = []
-        pool: dict[int, Proposition] = {}
+        Args:
+            drafts_raw (list[dict]): Propositions returned by the propose prompt.
 
-        for itm in drafts_raw:
-            draft = Proposition(
+        Returns:
+            tuple[list[Proposition], list[Proposition]]: The existing candidates
+                and the new, not yet persisted drafts.
+        """
+        drafts = [
+            Proposition(
                 text=itm["proposition"],
                 reasoning=itm["reasoning"],
                 confidence=itm.get("confidence"),
@@ -513,64 +807,100 @@ class gum:
                 revision_group=str(uuid4()),
                 version=1,
             )
-            drafts.append(draft)
-
-            # search existing persisted props
-            with session.no_autoflush:
-                hits = await search_propositions_bm25(
-                    session, f"{draft.text}\n{draft.reasoning}", mode="OR",
-                    include_observations=False,
-                    enable_mmr=True,
-                    enable_decay=True
-                )
-                
+            for itm in drafts_raw
+        ]
+        candidates: dict[int, Proposition] = {}
+
+        # search existing persisted props for all drafts in one round trip
+        async with self._read_session() as session:
+            all_hits = await search_propositions_bm25_many(
+                session,
+                [f"{draft.text}\n{draft.reasoning}" for draft in drafts],
+                mode="OR",
+                include_observations=False,
+                enable_mmr=True,
+                enable_decay=True,
+            )
+
+        for hits in all_hits:
             for prop, _score in hits:
-                pool[prop.id] = prop
+                candidates[prop.id] = prop
+
+        return list(candidates.values()), drafts
 
-        session.add_all(drafts)
-        await session.flush()
+    def _sync_embeddings(self) -> None:
+        """Embed new propositions in the background, off the search path.
+
+        Requests made while a sync runs are folded into one more run.
+        """
+        if self.embedding_index is None:
+            return
+        self._embedding_sync_pending = True
+        if self._embedding_sync is not None and not self._embedding_sync.done():
+            return
+        t = asyncio.create_task(self._run_embedding_sync())
+        self._embedding_sync = t
+        self._tasks.add(t)
+        t.add_done_callback(self._tasks.discard)
+
+    async def _run_embedding_sync(self) -> None:
+        while self._embedding_sync_pending:
+            self._embedding_sync_pending = False
+            try:
+                async with self._read_session() as session:
+                    await self.embedding_index.sync(session)
+            except Exception as e:
+                self.logger.warning(f"Embedding index sync failed: {e}")
 
-        # Gumbo trigger: Check for high-confidence propositions
+    def _trigger_gumbo(self, drafts: list[Proposition]) -> None:
+        """Fire Gumbo for committed high-confidence drafts (confidence >= 8)."""
         for draft in drafts:
-            pool[draft.id] = draft
-            
-            # Trigger Gumbo if confidence >= 8
-            if draft.confidence and draft.confidence >= 8:
-                try:
-                    # Import here to avoid circular imports
-                    from .services.gumbo_engine import trigger_gumbo_suggestions
-                    # Fire and forget - don't block proposition creation
-                    asyncio.create_task(trigger_gumbo_suggestions(draft.id, session))
-                    self.logger.info(f"🎯 Gumbo triggered for high-confidence proposition {draft.id} (confidence: {draft.confidence})")
-                except Exception as e:
-                    self.logger.error(f"Failed to trigger Gumbo for proposition {draft.id}: {e}")
-
-        return list(pool.values())
-
-    async def _handle_identical(
-        self, session, identical: list[Proposition], obs: Observation
+            if not (draft.confidence and draft.confidence >= 8):
+                continue
+            try:
+                # Import here to avoid circular imports
+                from .services.gumbo_engine import trigger_gumbo_suggestions
+
+                async def _run(prop_id: int = draft.id):
+                    async with self._read_session() as session:
+                        await trigger_gumbo_suggestions(prop_id, session, self.write)
+
+                # Fire and forget - don't block proposition creation
+                t = asyncio.create_task(_run())
+                self._tasks.add(t)
+                t.add_done_callback(self._tasks.discard)
+                self.logger.info(f"🎯 Gumbo triggered for high-confidence proposition {draft.id} (confidence: {draft.confidence})")
+            except Exception as e:
+                self.logger.error(f"Failed to trigger Gumbo for proposition {draft.id}: {e}")
+
+    def _handle_identical(
+        self, links: LinkBatch, identical: list[Proposition], observations: list[Observation]
     ) -> None:
-        for p in identical:
-            await self._attach_obs_if_missing(p, obs, session)
+        links.add((o.id for o in observations), (p.id for p in identical))
 
     async def _handle_similar(
         self,
-        session: AsyncSession,
         similar: list[Proposition],
-        obs: Observation,
+        observations: list[Observation],
     ) -> None:
+        """Revise a cluster of similar propositions into new child versions.
 
+        Reads and writes happen in two separate short transactions so that no
+        transaction stays open across the revise prompt.
+        """
         if not similar:
             return
 
-        rel_obs = {
-            o
-            for p in similar
-            for o in await get_related_observations(session, p.id)
-        }
-        rel_obs.add(obs)
+        async with self._read_session() as session:
+            rel_obs = {
+                o.id: o
+                for p in similar
+                for o in await get_related_observations(session, p.id)
+            }
+        for obs in observations:
+            rel_obs.setdefault(obs.id, obs)
 
-        revised_items = await self._revise_propositions(list(rel_obs), similar)
+        revised_items = await self._revise_propositions(list(rel_obs.values()), similar)
         newest_version = max(p.version for p in similar)
         parent_groups = {p.revision_group for p in similar}
         if len(parent_groups) == 1:
@@ -578,28 +908,33 @@ class gum:
         else:
             revision_group = uuid4().hex
 
-        new_children: list[Proposition] = []
-        for item in revised_items:
-            child = Proposition(
-                text=item["proposition"],
-                reasoning=item["reasoning"],
-                confidence=item.get("confidence"),
-                decay=item.get("decay"),
-                version=newest_version + 1,
-                revision_group=revision_group,
-                observations=rel_obs,
-                parents=set(similar),
-            )
-            session.add(child)
-            new_children.append(child)
+        async def _write_children(session: AsyncSession) -> None:
+            parents = set((await session.execute(
+                select(Proposition).where(Proposition.id.in_([p.id for p in similar]))
+            )).scalars().all())
+
+            children = [
+                Proposition(
+                    text=item["proposition"],
+                    reasoning=item["reasoning"],
+                    confidence=item.get("confidence"),
+                    decay=item.get("decay"),
+                    version=newest_version + 1,
+                    revision_group=revision_group,
+                    parents=parents,
+                )
+                for item in revised_items
+            ]
+            session.add_all(children)
+            await session.flush()
+            await LinkBatch().add(rel_obs, (c.id for c in children)).flush(session)
 
-        await session.flush()
+        await self.write(_write_children)
 
-    async def _handle_different(
-        self, session, different: list[Proposition], obs: Observation
+    def _handle_different(
+        self, links: LinkBatch, different: list[Proposition], observations: list[Observation]
     ) -> None:
-        for p in different:
-            await self._attach_obs_if_missing(p, obs, session)
+        links.add((o.id for o in observations), (p.id for p in different))
 
     async def _handle_audit(self, obs: Observation) -> bool:
         if not self.audit_enabled:
@@ -611,7 +946,7 @@ class gum:
             past_interaction = "*None*"
         else:
             ctx_chunks: list[str] = []
-            async with self._session() as session:
+            async with self._read_session() as session:
                 for prop, score in hits:
                     chunk = [f"• {prop.text}"]
                     if prop.reasoning:
@@ -638,18 +973,13 @@ class gum:
             .replace("{user_name}", self.user_name)
         )
 
-        # Get the unified AI client
-        client = await self._get_ai_client()
-        
-        # Make the API call using the unified client
-        response_content = await client.text_completion(
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=1000,
-            temperature=0.0
-        )
+        def _decision(text: str) -> dict | None:
+            value = decode_json(text)
+            return value if isinstance(value, dict) else None
 
-        # Parse the JSON response
-        decision = self._parse_ai_json_response(response_content)
+        decision = await self._complete(
+            prompt, AuditSchema, _decision, max_tokens=1000, temperature=0.0
+        )
         
         # Safely handle the decision with fallbacks
         transmit_data = decision.get("transmit_data", True) if isinstance(decision, dict) else True
@@ -666,52 +996,289 @@ class gum:
 
         return False
 
-    async def _default_handler(self, observer: Observer, update: Update) -> None:
-        self.logger.info(f"Processing update from {observer.name}")
+    async def ingest(
+        self,
+        update: Update | list[Update],
+        observer_name: str = "api_controller",
+        wait: bool = True,
+    ) -> asyncio.Future:
+        """Push updates straight into the ingest pipeline.
+
+        Entry point for push-style sources (HTTP API, video jobs, scripts) that
+        do not need an :class:`Observer` with its own queue and task. A list of
+        updates is ingested as one job, so it shares one proposition call (with
+        no size bound) and its links are written in bulk. Independent updates
+        are better submitted one by one with ``wait=False``: their writes are
+        still committed together by the writer task.
+
+        Args:
+            update (Update | list[Update]): The update, or batch of updates, to ingest.
+            observer_name (str, optional): Name recorded on the observations. Defaults to "api_controller".
+            wait (bool, optional): Wait until the updates are fully processed. Defaults to True.
+
+        Returns:
+            asyncio.Future: Resolves once the updates have left the pipeline.
+        """
+        self.logger.info(f"Processing update from {observer_name}")
+        fut = await self._submit(observer_name, update)
+        if wait:
+            await fut
+        return fut
+
+    async def _default_handler(self, observer: Observer, update: Update | list[Update]) -> None:
+        """Ingest one update, or a batch sharing one job, and wait until it has been fully processed."""
+        await self.ingest(update, observer_name=observer.name)
+
+    # ─────────────────────────────── ingest stages
+    async def _find_persisted(self, updates: list[Update]) -> dict[int, tuple[Observation, bool]]:
+        """Observations already written for replayed journal entries.
+
+        A job can commit its observation and still never be acknowledged (crash,
+        shutdown), so its replay must reuse that row instead of inserting another.
+
+        Returns:
+            dict[int, tuple[Observation, bool]]: Journal id to the existing observation
+                and whether it is linked to any proposition yet.
+        """
+        wanted = {
+            u._journal_id: content_hash(u.content)
+            for u in updates
+            if u._replayed and u._journal_id is not None
+        }
+        if not wanted:
+            return {}
+        linked = exists().where(observation_proposition.c.observation_id == Observation.id)
+        async with self._read_session() as session:
+            rows = (await session.execute(
+                select(Observation, linked).where(Observation.journal_id.in_(wanted))
+            )).all()
+        # the hash guards against ids reused by a journal that was deleted
+        return {
+            obs.journal_id: (obs, has_links)
+            for obs, has_links in rows
+            if obs.content_hash == wanted[obs.journal_id]
+        }
 
-        async with self._session() as session:
+    async def _stage_persist(self, job: IngestJob) -> bool:
+        persisted = await self._find_persisted(job.updates)
+        if persisted:
+            self.logger.info(f"Resuming {len(persisted)} replayed update(s) that were already stored")
+        # rows that already have propositions are done; the rest go on to the model
+        job.observations.extend(obs for obs, has_links in persisted.values() if not has_links)
+
+        kept: list[Observation] = []
+        for update in job.updates:
+            if update._journal_id in persisted:
+                continue
             observation = Observation(
-                observer_name=observer.name,
+                observer_name=job.observer_name,
                 content=update.content,
                 content_type=update.content_type,
+                content_hash=content_hash(update.content),
+                simhash=simhash(update.content),
+                journal_id=update._journal_id,
             )
-
             if await self._handle_audit(observation):
-                return
+                continue
+            kept.append(observation)
+
+        if not kept:
+            return bool(job.observations)
+
+        policy = self._dedup_policies.get(job.observer_name)
+
+        async def _persist(session: AsyncSession):
+            fresh: list[Observation] = list(job.observations)
+            repeats: list[Observation] = []
+            # duplicates of an original whose job is still running cannot copy its
+            # links yet: they wait for that job, or share this one if it is ours
+            waiting: list[tuple[asyncio.Future, int, Observation]] = []
+            waits_on: dict[int, asyncio.Future] = {}
+            duplicates = 0
+            for observation in kept:
+                duplicate_of = None
+                if policy is not None:
+                    duplicate_of = await find_duplicate(session, observation, policy)
+                session.add(observation)
+                if policy is not None:
+                    # flush one by one so repeats inside a coalesced burst match each other
+                    await session.flush()
+                if duplicate_of is None:
+                    fresh.append(observation)
+                    continue
+                duplicates += 1
+                original = waits_on.get(duplicate_of) or self._inflight.get(duplicate_of)
+                if any(o.id == duplicate_of for o in fresh + repeats):
+                    repeats.append(observation)
+                elif original is not None:
+                    waiting.append((original, duplicate_of, observation))
+                    waits_on[observation.id] = original
+                else:
+                    await copy_links(session, duplicate_of, observation.id)
+            if policy is not None:
+                self.dedup_stats["checked"] += len(kept)
+                self.dedup_stats["duplicates"] += duplicates
+                # later jobs in this same write batch must already see these rows as in flight
+                self._track_inflight(job, [o.id for o in fresh + repeats] + list(waits_on))
+            return fresh, repeats, waiting
+
+        fresh, repeats, waiting = await self.write(_persist)
+        job.observations[:] = fresh + repeats
+        job.repeats.update(o.id for o in repeats)
+        if waiting:
+            await self._copy_links_when_done(job, waiting)
+
+        if not job.observations:
+            self.logger.info(f"Update from {job.observer_name} duplicates a recent observation; reusing its propositions")
+        return bool(job.observations)
+
+    async def _discard_failed(self, job: IngestJob, exc: Exception) -> None:
+        """Delete the observations of a failed job that never got a proposition.
+
+        The persist stage commits before the model stages run, so without this a
+        failed job would leave unlinked rows behind; a journal replay inserts
+        them again.
+        """
+        ids = [o.id for o in job.observations]
+        if not ids:
+            return
 
-            session.add(observation)
-            await session.flush() # Observation gets its ID
+        async def _delete(session: AsyncSession) -> int:
+            result = await session.execute(
+                delete(Observation)
+                .where(Observation.id.in_(ids))
+                .where(~exists().where(observation_proposition.c.observation_id == Observation.id))
+            )
+            return result.rowcount
 
-            pool = await self._generate_and_search(session, update, observation)
+        removed = await self.write(_delete)
+        if removed:
+            self.logger.info(f"Removed {removed} unlinked observation(s) of a failed update")
 
-            if pool:
-                self.logger.info(f"Linking observation to {len(pool)} candidate propositions.")
-                for prop in pool:
-                    await self._attach_obs_if_missing(prop, observation, session)
-                await session.flush()
+    def _track_inflight(self, job: IngestJob, ids: list[int]) -> None:
+        """Mark observations as owned by ``job`` until it leaves the pipeline."""
+        for oid in ids:
+            self._inflight[oid] = job.future
+
+        def _done(fut: asyncio.Future) -> None:
+            for oid in ids:
+                if self._inflight.get(oid) is fut:
+                    del self._inflight[oid]
+
+        job.future.add_done_callback(_done)
+
+    async def _copy_links_when_done(
+        self, job: IngestJob, waiting: list[tuple[asyncio.Future, int, Observation]]
+    ) -> None:
+        """Give duplicates the links of originals that were still being ingested.
+
+        Waits for the jobs of the originals. A duplicate whose original failed
+        is ingested by this job instead, as if it were new.
+        """
+        await asyncio.wait({fut for fut, _, _ in waiting})
+        copies: list[tuple[int, int]] = []
+        for fut, original_id, observation in waiting:
+            if fut.cancelled() or fut.exception() is not None:
+                job.observations.append(observation)
+            else:
+                copies.append((original_id, observation.id))
 
-            identical, similar, different = await self._filter_propositions(pool)
+        async def _copy(session: AsyncSession) -> None:
+            for source_id, target_id in copies:
+                await copy_links(session, source_id, target_id)
 
-            self.logger.info("Applying proposition updates...")
-            await self._handle_identical(session, identical, observation)
-            await self._handle_similar(session, similar, observation)
-            await self._handle_different(session, different, observation)
-            self.logger.info("Completed processing update")
+        if copies:
+            await self.write(_copy)
+
+    async def _stage_propose(self, job: IngestJob) -> bool:
+        # audited-away updates and repeats within the job are not sent to the model
+        kept = [
+            Update(content=o.content, content_type=o.content_type)
+            for o in job.observations
+            if o.id not in job.repeats
+        ]
+        job.drafts = await self._construct_propositions(merge_updates(kept))
+        return bool(job.drafts)
+
+    async def _stage_search(self, job: IngestJob) -> bool:
+        candidates, drafts = await self._search_candidates(job.drafts)
+
+        # only the inserts hold the write lock
+        async def _insert_drafts(session: AsyncSession):
+            session.add_all(drafts)
+            await session.flush()
+            pool = candidates + drafts
+
+            if pool:
+                self.logger.info(
+                    f"Linking {len(job.observations)} observation(s) to "
+                    f"{len(pool)} candidate propositions."
+                )
+                await LinkBatch().add(
+                    (o.id for o in job.observations), (p.id for p in pool)
+                ).flush(session)
+            return pool
+
+        job.pool = await self.write(_insert_drafts)
+        if drafts:
+            self._sync_embeddings()
+
+        # only after commit, so Gumbo can see the new rows
+        self._trigger_gumbo(drafts)
+        return bool(job.pool)
+
+    async def _stage_relate(self, job: IngestJob) -> bool:
+        job.identical, job.similar, job.different = await self._filter_propositions(job.pool)
+        return bool(job.identical or job.similar or job.different)
+
+    async def _stage_revise(self, job: IngestJob) -> bool:
+        self.logger.info("Applying proposition updates...")
+        links = LinkBatch()
+        self._handle_identical(links, job.identical, job.observations)
+        self._handle_different(links, job.different, job.observations)
+        if links:
+            await self.write(links.flush)
+        await self._handle_similar(job.similar, job.observations)
+        if job.similar:
+            self._sync_embeddings()
+        self.logger.info("Completed processing update")
+        return True
 
     @asynccontextmanager
     async def _session(self):
+        """Read-write session outside the writer task, for maintenance and
+        admin operations; regular writes should go through :meth:`write`."""
         async with self.Session() as s:
             async with s.begin():
                 yield s
 
-    @staticmethod
-    async def _attach_obs_if_missing(prop: Proposition, obs: Observation, session):
-        await session.execute(
-            insert(observation_proposition)
-            .prefix_with("OR IGNORE")
-            .values(observation_id=obs.id, proposition_id=prop.id)
-        )
-        prop.updated_at = datetime.now(timezone.utc)
+    @asynccontextmanager
+    async def _read_session(self):
+        """Session on the read-only pool."""
+        await self.connect_db()
+        async with self.ReadSession() as s:
+            yield s
+
+    async def write(self, mutation: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """Apply ``mutation`` through the single writer task.
+
+        Writes queued together are committed in one transaction, each in its
+        own savepoint; see :class:`~gum.storage.SQLiteWriter`.
+
+        Args:
+            mutation (Callable[[AsyncSession], Awaitable[T]]): Coroutine function
+                receiving the write session; it must not call :meth:`write` itself.
+
+        Returns:
+            T: What ``mutation`` returned, once it is committed.
+        """
+        await self.connect_db()
+        return await self._writer.submit(mutation)
+
+    @property
+    def write_stats(self) -> dict:
+        """Batches, mutations and failures seen by the writer task."""
+        return dict(self._writer.stats) if self._writer is not None else {}
 
     def add_observer(self, observer: Observer):
         """Add an observer to track user behavior.
@@ -719,6 +1286,8 @@ class gum:
         Args:
             observer (Observer): The observer to add.
         """
+        attach_journal(observer, self._journal)
+        self._fanin.attach(observer)
         self.observers.append(observer)
 
     def remove_observer(self, observer: Observer):
@@ -728,6 +1297,7 @@ class gum:
             observer (Observer): The observer to remove.
         """
         if observer in self.observers:
+            self._fanin.detach(observer)
             self.observers.remove(observer)
 
     def register_update_handler(self, fn: Callable[[Observer, Update], None]):
@@ -746,25 +1316,87 @@ class gum:
         mode: str = "OR",
         start_time: datetime | None = None,
         end_time: datetime | None = None,
+        use_cache: bool = True,
+        profile: SearchProfile | None = None,
     ) -> list[tuple[Proposition, float]]:
         """Query the database for propositions matching the user query.
         
         Args:
             user_query (str): The query string to search for.
             limit (int, optional): Maximum number of results to return. Defaults to 3.
-            mode (str, optional): Search mode ("OR" or "AND"). Defaults to "OR".
+            mode (str, optional): Search mode ("OR", "AND", "PHRASE" or "HYBRID"). Defaults to "OR".
             start_time (datetime, optional): Start time for filtering results. Defaults to None.
             end_time (datetime, optional): End time for filtering results. Defaults to None.
+            use_cache (bool, optional): Serve repeated queries from the result cache. Defaults to True.
+            profile (SearchProfile, optional): Filled with stage timings and the query plan;
+                profiled queries always bypass the cache. Defaults to None.
             
         Returns:
             list[tuple[Proposition, float]]: List of tuples containing propositions and their relevance scores.
         """
-        async with self._session() as session:
-            return await search_propositions_bm25(
+        results, _status = await self.query_with_cache_status(
+            user_query,
+            limit=limit,
+            mode=mode,
+            start_time=start_time,
+            end_time=end_time,
+            use_cache=use_cache,
+            profile=profile,
+        )
+        return results
+
+    async def query_with_cache_status(
+        self,
+        user_query: str,
+        *,
+        limit: int = 3,
+        mode: str = "OR",
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        use_cache: bool = True,
+        profile: SearchProfile | None = None,
+    ) -> tuple[list[tuple[Proposition, float]], str]:
+        """Like :meth:`query`, but also report how the result cache answered.
+
+        Returns:
+            tuple[list[tuple[Proposition, float]], str]: The results and "HIT",
+                "MISS" or "BYPASS".
+        """
+        cache = self._query_cache if use_cache and profile is None else None
+        key = None
+        # read before querying: a write that lands meanwhile makes the entry stale
+        generation = self._generation.value
+        if cache is not None:
+            key = cache.make_key(user_query, mode, limit, start_time, end_time)
+            cached = cache.get(key, generation)
+            if cached is not None:
+                return list(cached), "HIT"
+
+        async with self._read_session() as session:
+            results = await search_propositions_bm25(
                 session,
                 user_query,
                 limit=limit,
                 mode=mode,
                 start_time=start_time,
                 end_time=end_time,
+                embedding_index=self.embedding_index,
+                profile=profile,
             )
+
+        if cache is None:
+            return results, "BYPASS"
+        cache.put(key, generation, tuple(results))
+        return results, "MISS"
+
+    @property
+    def data_generation(self) -> int:
+        """Counter bumped by every proposition, observation or link write."""
+        return self._generation.value
+
+    @property
+    def query_cache_stats(self) -> dict:
+        """Hit/miss counters of the query result cache (empty if disabled)."""
+        if self._query_cache is None:
+            return {}
+        return self._query_cache.get_stats()
@@ -0,0 +1,273 @@
+# ingest.py
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from .models import Observation, Proposition
+from .schemas import Update
+
+logger = logging.getLogger("gum.ingest")
+
+# Stage order of the ingest pipeline. Only the LLM stages wait on the network;
+# every database stage runs in its own short transaction.
+STAGES = ("persist", "propose", "search", "relate", "revise")
+
+
+@dataclass
+class IngestJob:
+    """State carried by one update as it moves through the ingest stages.
+
+    A job normally carries a single update; with coalescing enabled it carries a
+    burst of updates from one observer that share a single propose call.
+
+    Attributes:
+        observer_name (str): Name of the observer that produced the updates.
+        updates (list[Update]): The updates being ingested.
+        future (asyncio.Future): Resolved once the job leaves the pipeline.
+        observations (list[Observation]): One row per update, written by the persist stage.
+        repeats (set[int]): Ids of observations that duplicate another one of this job;
+            they are linked like it but not sent to the model.
+        drafts (list[dict]): Raw propositions returned by the propose stage.
+        pool (list[Proposition]): Drafts plus candidates found by the search stage.
+        identical, similar, different (list[Proposition]): Relation labels.
+    """
+    observer_name: str
+    updates: list[Update]
+    future: asyncio.Future
+    observations: list[Observation] = field(default_factory=list)
+    repeats: set[int] = field(default_factory=set)
+    drafts: list[dict] = field(default_factory=list)
+    pool: list[Proposition] = field(default_factory=list)
+    identical: list[Proposition] = field(default_factory=list)
+    similar: list[Proposition] = field(default_factory=list)
+    different: list[Proposition] = field(default_factory=list)
+
+
+StageHandler = Callable[[IngestJob], Awaitable[bool]]
+FailureHandler = Callable[[IngestJob, Exception], Awaitable[None]]
+
+
+class IngestPipeline:
+    """A chain of bounded asyncio queues, each drained by its own workers.
+
+    Every stage handler receives an :class:`IngestJob` and returns ``True`` to
+    pass it on or ``False`` to finish it early. A job whose handler raises is
+    finished with that exception, after ``on_failure`` has had a chance to undo
+    what the earlier stages committed. Because each queue is bounded, a slow
+    stage pushes back on the one before it and, ultimately, on :meth:`submit`.
+
+    Args:
+        stages (list[tuple[str, StageHandler, int]]): ``(name, handler, concurrency)``
+            for each stage, in order.
+        queue_size (int, optional): Capacity of every stage queue. Defaults to 32.
+        on_failure (FailureHandler, optional): ``async on_failure(job, exc)`` called
+            when a stage raises. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        stages: list[tuple[str, StageHandler, int]],
+        queue_size: int = 32,
+        on_failure: FailureHandler | None = None,
+    ):
+        if not stages:
+            raise ValueError("IngestPipeline needs at least one stage")
+        self._stages = stages
+        self._queue_size = queue_size
+        self._on_failure = on_failure
+        self._queues: list[asyncio.Queue] = []
+        self._workers: list[asyncio.Task] = []
+        self.stats: dict[str, dict[str, int]] = {
+            name: {"processed": 0, "failed": 0} for name, _, _ in stages
+        }
+        self._in_flight = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def in_flight(self) -> int:
+        """Jobs submitted and not yet finished, whether queued or inside a worker."""
+        return self._in_flight
+
+    def _job_done(self, _future: asyncio.Future) -> None:
+        self._in_flight -= 1
+
+    def start(self) -> None:
+        """Create the stage queues and spawn the workers (idempotent)."""
+        if self._workers:
+            return
+        self._queues = [asyncio.Queue(maxsize=self._queue_size) for _ in self._stages]
+        for idx, (name, _, concurrency) in enumerate(self._stages):
+            for n in range(max(1, concurrency)):
+                self._workers.append(
+                    asyncio.create_task(self._worker(idx), name=f"ingest-{name}-{n}")
+                )
+
+    async def submit(
+        self, observer_name: str, updates: Update | list[Update]
+    ) -> asyncio.Future:
+        """Queue one update, or a coalesced burst of updates, for ingestion.
+
+        Waits while the first stage queue is full.
+
+        Returns:
+            asyncio.Future: Resolves to ``None`` once the job has left the pipeline.
+        """
+        self.start()
+        if isinstance(updates, Update):
+            updates = [updates]
+        job = IngestJob(
+            observer_name=observer_name,
+            updates=list(updates),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._in_flight += 1
+        job.future.add_done_callback(self._job_done)
+        try:
+            await self._queues[0].put(job)
+        except BaseException:
+            job.future.cancel()
+            raise
+        return job.future
+
+    def depths(self) -> dict[str, int]:
+        """Current number of queued jobs per stage."""
+        return {
+            name: (self._queues[idx].qsize() if self._queues else 0)
+            for idx, (name, _, _) in enumerate(self._stages)
+        }
+
+    async def join(self) -> None:
+        """Wait until every queued job has left the pipeline."""
+        for q in self._queues:
+            await q.join()
+
+    async def stop(self) -> None:
+        """Cancel all workers. Queued jobs that were not processed are dropped."""
+        for t in self._workers:
+            t.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        for q in self._queues:
+            while not q.empty():
+                job = q.get_nowait()
+                if not job.future.done():
+                    job.future.cancel()
+        self._queues.clear()
+
+    async def _worker(self, idx: int) -> None:
+        name, handler, _ = self._stages[idx]
+        queue = self._queues[idx]
+        is_last = idx == len(self._stages) - 1
+
+        while True:
+            job: IngestJob = await queue.get()
+            try:
+                try:
+                    keep_going = await handler(job)
+                    self.stats[name]["processed"] += 1
+                except asyncio.CancelledError:
+                    if not job.future.done():
+                        job.future.cancel()
+                    raise
+                except Exception as exc:
+                    self.stats[name]["failed"] += 1
+                    logger.error(f"Ingest stage '{name}' failed: {exc}")
+                    if self._on_failure is not None:
+                        try:
+                            await self._on_failure(job, exc)
+                        except Exception as cleanup_exc:
+                            logger.error(f"Cleaning up after stage '{name}' failed: {cleanup_exc}")
+                    if not job.future.done():
+                        job.future.set_exception(exc)
+                    continue
+
+                if keep_going and not is_last:
+                    await self._queues[idx + 1].put(job)
+                elif not job.future.done():
+                    job.future.set_result(None)
+            finally:
+                queue.task_done()
+
+
+def merge_updates(updates: list[Update]) -> Update:
+    """Join a burst of updates into one ``{inputs}`` block for the propose prompt."""
+    if len(updates) == 1:
+        return updates[0]
+    return Update(
+        content="\n\n".join(
+            f"[Update {i}]\n{u.content}" for i, u in enumerate(updates, 1)
+        ),
+        content_type=updates[0].content_type,
+    )
+
+
+class UpdateCoalescer:
+    """Buffers text updates per observer and releases them as bursts.
+
+    A buffer is flushed ``window_ms`` after its first update arrives, or as soon
+    as it holds ``max_chars`` characters, whichever comes first. Non-text updates
+    are never merged and flush immediately.
+
+    Args:
+        flush (Callable): ``async flush(observer, updates)`` called with each burst.
+        window_ms (int): Coalescing window in milliseconds.
+        max_chars (int, optional): Character budget per burst. Defaults to 8000.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[object, list[Update]], Awaitable[object]],
+        window_ms: int,
+        max_chars: int = 8000,
+    ):
+        self._flush = flush
+        self.window = window_ms / 1000.0
+        self.max_chars = max_chars
+        self._buffers: dict[str, tuple[object, list[Update]]] = {}
+        self._timers: dict[str, asyncio.Task] = {}
+
+    async def add(self, observer, update: Update) -> None:
+        key = observer.name
+        if update.content_type != "input_text":
+            await self._flush_key(key)
+            await self._flush(observer, [update])
+            return
+
+        _, pending = self._buffers.get(key, (observer, []))
+        if pending and sum(len(u.content) for u in pending) + len(update.content) > self.max_chars:
+            await self._flush_key(key)
+            pending = []
+
+        pending.append(update)
+        self._buffers[key] = (observer, pending)
+
+        if sum(len(u.content) for u in pending) >= self.max_chars:
+            await self._flush_key(key)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.create_task(self._flush_later(key))
+
+    async def flush_all(self) -> None:
+        """Release every pending burst immediately."""
+        for key in list(self._buffers):
+            await self._flush_key(key)
+
+    async def _flush_later(self, key: str) -> None:
+        await asyncio.sleep(self.window)
+        self._timers.pop(key, None)
+        await self._flush_key(key)
+
+    async def _flush_key(self, key: str) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        entry = self._buffers.pop(key, None)
+        if entry and entry[1]:
+            observer, pending = entry
+            await self._flush(observer, pending)
@@ -0,0 +1,209 @@
+# journal.py
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import pathlib
+import sqlite3
+import time
+from typing import Optional
+
+from .fanin import Lane
+from .schemas import Update
+
+logger = logging.getLogger("gum.journal")
+
+
+class UpdateJournal:
+    """SQLite-backed journal of updates that have not been fully ingested yet.
+
+    Every update an observer enqueues is appended here before it becomes visible
+    to the update loop, and is acknowledged once the ingest pipeline has
+    committed it. Entries that were never acknowledged (crash, restart, provider
+    outage) are replayed on the next start, so delivery is at-least-once.
+
+    The number of pending entries is bounded by two watermarks: once it reaches
+    ``high_watermark`` observers block on ``put`` until acknowledgements bring it
+    back down to ``low_watermark``.
+
+    Args:
+        path (str): Path of the journal database file.
+        high_watermark (int, optional): Pending count at which observers are paused. Defaults to 1000.
+        low_watermark (int, optional): Pending count at which they resume. Defaults to 500.
+        max_attempts (int, optional): Failed attempts after which an entry is no longer replayed. Defaults to 3.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        high_watermark: int = 1000,
+        low_watermark: int = 500,
+        max_attempts: int = 3,
+    ):
+        if low_watermark > high_watermark:
+            raise ValueError("low_watermark must not exceed high_watermark")
+
+        self.path = path
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.max_attempts = max_attempts
+
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pending_updates (
+                id            INTEGER PRIMARY KEY AUTOINCREMENT,
+                observer_name TEXT    NOT NULL,
+                content       TEXT    NOT NULL,
+                content_type  TEXT    NOT NULL,
+                attempts      INTEGER NOT NULL DEFAULT 0,
+                created_at    REAL    NOT NULL
+            )
+            """
+        )
+
+        self._pending = self._conn.execute(
+            "SELECT COUNT(*) FROM pending_updates WHERE attempts < ?",
+            (max_attempts,),
+        ).fetchone()[0]
+        self._accepting = asyncio.Event()
+        if self._pending < high_watermark:
+            self._accepting.set()
+
+    # ─────────────────────────────── watermarks
+    @property
+    def pending(self) -> int:
+        """Number of journaled updates not yet acknowledged."""
+        return self._pending
+
+    def has_capacity(self) -> bool:
+        return self._accepting.is_set()
+
+    async def wait_for_capacity(self) -> None:
+        """Block while the journal is above its high watermark."""
+        await self._accepting.wait()
+
+    def _set_pending(self, value: int) -> None:
+        self._pending = max(value, 0)
+        if self._pending >= self.high_watermark:
+            if self._accepting.is_set():
+                logger.warning(
+                    f"Ingest journal reached {self._pending} pending updates; pausing observers"
+                )
+            self._accepting.clear()
+        elif self._pending <= self.low_watermark and not self._accepting.is_set():
+            logger.info(f"Ingest journal drained to {self._pending}; resuming observers")
+            self._accepting.set()
+
+    # ─────────────────────────────── entries
+    def record(self, observer_name: str, update: Update) -> Update:
+        """Append ``update`` and tag it with its journal id."""
+        cur = self._conn.execute(
+            "INSERT INTO pending_updates (observer_name, content, content_type, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            (observer_name, update.content, update.content_type, time.time()),
+        )
+        update._journal_id = cur.lastrowid
+        self._set_pending(self._pending + 1)
+        return update
+
+    def ack(self, ids: list[int]) -> None:
+        """Remove entries whose updates have been committed."""
+        if not ids:
+            return
+        self._conn.executemany("DELETE FROM pending_updates WHERE id = ?", [(i,) for i in ids])
+        self._set_pending(self._pending - len(ids))
+
+    def release(self, ids: list[int], failed: bool = True) -> None:
+        """Hand entries back for the next replay.
+
+        Args:
+            ids (list[int]): Journal ids of the updates.
+            failed (bool, optional): Count this as a failed attempt. Pass ``False``
+                for jobs that were merely cancelled by a shutdown. Defaults to True.
+        """
+        if not ids:
+            return
+        if failed:
+            self._conn.executemany(
+                "UPDATE pending_updates SET attempts = attempts + 1 WHERE id = ?",
+                [(i,) for i in ids],
+            )
+        self._set_pending(self._pending - len(ids))
+
+    def replay(self) -> list[tuple[str, Update]]:
+        """Return every unacknowledged entry, oldest first, as ``(observer_name, update)``.
+
+        Call it before observers are attached: :func:`attach_journal` journals the
+        updates still queued, and those are ingested from the queue, not replayed.
+        """
+        rows = self._conn.execute(
+            "SELECT id, observer_name, content, content_type FROM pending_updates "
+            "WHERE attempts < ? ORDER BY id",
+            (self.max_attempts,),
+        ).fetchall()
+        out: list[tuple[str, Update]] = []
+        for jid, observer_name, content, content_type in rows:
+            update = Update(content=content, content_type=content_type)
+            update._journal_id = jid
+            update._replayed = True
+            out.append((observer_name, update))
+        return out
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class JournaledQueue(Lane):
+    """Drop-in replacement for ``Observer.update_queue`` that journals every put.
+
+    ``put`` waits while the journal is above its high watermark; ``put_nowait``
+    raises :class:`asyncio.QueueFull` instead.
+    """
+
+    def __init__(self, journal: UpdateJournal, observer_name: str):
+        super().__init__()
+        self._journal = journal
+        self._observer_name = observer_name
+
+    async def put(self, item: Update) -> None:
+        # several waiters may wake together, so re-check after every wake-up
+        while not self._journal.has_capacity():
+            await self._journal.wait_for_capacity()
+        # asyncio.Queue.put ends in put_nowait, which does the journaling
+        await super().put(item)
+
+    def put_nowait(self, item: Update) -> None:
+        if getattr(item, "_journal_id", None) is None:
+            if not self._journal.has_capacity():
+                raise asyncio.QueueFull
+            item = self._journal.record(self._observer_name, item)
+        super().put_nowait(item)
+
+
+def journal_ids(updates: list[Update]) -> list[int]:
+    """Journal ids of the journaled updates in ``updates``."""
+    return [u._journal_id for u in updates if getattr(u, "_journal_id", None) is not None]
+
+
+def attach_journal(observer, journal: Optional[UpdateJournal]) -> None:
+    """Swap ``observer.update_queue`` for a :class:`JournaledQueue`, keeping queued items.
+
+    Call this before the observer is attached to a :class:`~gum.fanin.FanIn`,
+    and after :meth:`UpdateJournal.replay`.
+    """
+    if journal is None or isinstance(observer.update_queue, JournaledQueue):
+        return
+    old = observer.update_queue
+    new = JournaledQueue(journal, observer.name)
+    while not old.empty():
+        # already accepted by the observer, so journal it even above the watermark
+        item = old.get_nowait()
+        if getattr(item, "_journal_id", None) is None:
+            item = journal.record(observer.name, item)
+        new.put_nowait(item)
+    observer.update_queue = new
@@ -0,0 +1,50 @@
+# mmr.py
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def mmr_select(
+    relevance: np.ndarray,
+    vectors,
+    k: int,
+    lambda_param: float = 0.5,
+) -> list[int]:
+    """Pick ``k`` rows by Maximal Marginal Relevance.
+
+    The first pick is the most relevant row; each later pick maximises
+    ``lambda_param * relevance - (1 - lambda_param) * max_sim``, where
+    ``max_sim`` is the highest cosine similarity to any row already picked.
+    The similarity matrix is computed once and ``max_sim`` is kept as a
+    running maximum, so each pick is a single vector update.
+
+    Args:
+        relevance (np.ndarray): Relevance score per row.
+        vectors: L2-normalised row vectors, dense or scipy sparse.
+        k (int): Number of rows to pick.
+        lambda_param (float): Relevance/diversity trade-off. Defaults to 0.5.
+
+    Returns:
+        list[int]: Picked row indices in pick order.
+    """
+    relevance = np.asarray(relevance, dtype=float)
+    n = len(relevance)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    sim = vectors @ vectors.T
+    sim = sim.toarray() if hasattr(sim, "toarray") else np.asarray(sim)
+
+    selected: list[int] = []
+    max_sim = np.zeros(n)
+    mmr = relevance.copy()
+    while len(selected) < k:
+        if selected:
+            mmr = lambda_param * relevance - (1 - lambda_param) * max_sim
+            mmr[selected] = -np.inf
+        idx = int(np.argmax(mmr))
+        selected.append(idx)
+        np.maximum(max_sim, sim[idx], out=max_sim)
+    return selected
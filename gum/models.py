@@ -2,17 +2,27 @@
 
 from __future__ import annotations
 
+import math
+import os
 import pathlib
+import re
+import zlib
 from typing import Optional
 
 from sqlalchemy import (
     Column,
+    BigInteger,
+    Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Table,
     Text,
+    event,
+    select,
     text as sql_text,
 )
 from sqlalchemy.ext.asyncio import (
@@ -24,6 +34,8 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
+    backref,
+    column_property,
     mapped_column,
     relationship,
 )
@@ -52,6 +64,7 @@ observation_proposition = Table(
         ForeignKey("propositions.id", ondelete="CASCADE"),
         primary_key=True,
     ),
+    Index("ix_observation_proposition_proposition", "proposition_id"),
 )
 
 proposition_parent = Table(
@@ -69,9 +82,74 @@ proposition_parent = Table(
         ForeignKey("propositions.id", ondelete="CASCADE"),
         primary_key=True,
     ),
+    Index("ix_proposition_parent_parent", "parent_id"),
 )
 
 
+# Hashed term counts per proposition for MMR re-ranking, refreshed whenever
+# observation_proposition links are written (see gum/term_vectors.py).
+# Indices are int32 and counts float32, stored as raw bytes.
+proposition_vectors = Table(
+    "proposition_vectors",
+    Base.metadata,
+    Column(
+        "proposition_id",
+        Integer,
+        ForeignKey("propositions.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("text_indices", LargeBinary, nullable=False),
+    Column("text_counts", LargeBinary, nullable=False),
+    Column("obs_indices", LargeBinary, nullable=False),
+    Column("obs_counts", LargeBinary, nullable=False),
+    Column("obs_count", Integer, nullable=False, server_default="0"),
+)
+
+# Characters of an observation's content kept inline once the body has moved
+# to observation_blobs (listings show at most 500).
+PREVIEW_CHARS = 512
+
+# zlib-compressed UTF-8 bodies of observations in cold storage
+# (see gum/cold_storage.py); observations.content then holds a preview.
+# Rows are removed by the observations_ad trigger.
+observation_blobs = Table(
+    "observation_blobs",
+    Base.metadata,
+    Column(
+        "observation_id",
+        Integer,
+        ForeignKey("observations.id"),
+        primary_key=True,
+    ),
+    Column("body", LargeBinary, nullable=False),
+    Column("archived_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+# Compressed bodies of deleted cold observations whose tokens are still in
+# observations_fts. The delete trigger cannot inflate them without
+# gum_inflate, which only GUM's connections define, so it parks them here and
+# purge_fts_tombstones removes them from the index.
+observation_fts_tombstones = Table(
+    "observation_fts_tombstones",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("observation_id", Integer, nullable=False),
+    Column("body", LargeBinary, nullable=False),
+)
+
+
+def compress_content(content: str) -> bytes:
+    """Compress an observation body for ``observation_blobs``."""
+    return zlib.compress(content.encode("utf-8"), 6)
+
+
+def decompress_content(body: Optional[bytes]) -> Optional[str]:
+    """Inverse of :func:`compress_content`; also the ``gum_inflate`` SQL function."""
+    if body is None:
+        return None
+    return zlib.decompress(body).decode("utf-8")
+
+
 class Observation(Base):
     """Represents an observation of user behavior.
     
@@ -81,10 +159,17 @@ class Observation(Base):
     Attributes:
         id (int): Primary key for the observation.
         observer_name (str): Name of the observer that made this observation.
-        content (str): The actual content of the observation.
+        content (str): The content of the observation, or its first ``PREVIEW_CHARS``
+            characters once the body is in cold storage.
         content_type (str): Type of content (e.g., 'text', 'image', etc.).
+        content_hash (Optional[str]): SHA-256 of the content, used for deduplication.
+        simhash (Optional[int]): 64-bit SimHash of the normalized content.
+        journal_id (Optional[int]): Ingest journal entry the observation came from, so
+            that a replayed entry reuses its row instead of inserting another.
         created_at (datetime): When the observation was created.
         updated_at (datetime): When the observation was last updated.
+        full_content (str): The complete content, decompressed from ``observation_blobs``
+            when needed. Deferred: select it or ``undefer`` it where the full text is used.
         propositions (set[Proposition]): Set of propositions related to this observation.
     """
     __tablename__ = "observations"
@@ -93,6 +178,9 @@ class Observation(Base):
     observer_name: Mapped[str]   = mapped_column(String(100), nullable=False)
     content:       Mapped[str]   = mapped_column(Text,        nullable=False)
     content_type:  Mapped[str]   = mapped_column(String(50),  nullable=False)
+    content_hash:  Mapped[Optional[str]] = mapped_column(String(64))
+    simhash:       Mapped[Optional[int]] = mapped_column(BigInteger)
+    journal_id:    Mapped[Optional[int]] = mapped_column(Integer)
 
     created_at:    Mapped[str]   = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -104,13 +192,31 @@ class Observation(Base):
         nullable=False,
     )
 
+    full_content: Mapped[str] = column_property(
+        func.coalesce(
+            select(func.gum_inflate(observation_blobs.c.body))
+            .where(observation_blobs.c.observation_id == id)
+            .scalar_subquery(),
+            content,
+        ),
+        deferred=True,
+        raiseload=True,
+    )
+
     propositions: Mapped[set["Proposition"]] = relationship(
         "Proposition",
         secondary=observation_proposition,
         back_populates="observations",
         collection_class=set,
         passive_deletes=True,
-        lazy="selectin",
+        lazy="raise",
+    )
+
+    __table_args__ = (
+        Index("ix_observations_observer_hash", "observer_name", "content_hash"),
+        Index("ix_observations_journal", "journal_id"),
+        Index("ix_observations_created", "created_at"),
+        Index("ix_observations_observer_created", "observer_name", "created_at"),
     )
 
     def __repr__(self) -> str:
@@ -128,6 +234,10 @@ class Proposition(Base):
     This model stores propositions generated from observations, including the proposition
     text, reasoning behind it, and metadata about its creation and relationships.
 
+    Relationships are never loaded implicitly: touching ``parents``, ``children``
+    or ``observations`` on a loaded proposition raises unless the query asked
+    for them with a loader option such as ``selectinload``.
+
     Attributes:
         id (int): Primary key for the proposition.
         text (str): The actual proposition text.
@@ -138,6 +248,7 @@ class Proposition(Base):
         updated_at (datetime): When the proposition was last updated.
         revision_group (str): Group identifier for related proposition revisions.
         version (int): Version number of this proposition.
+        is_leaf (bool): False once a revision of this proposition exists.
         parents (set[Proposition]): Set of parent propositions.
         observations (set[Observation]): Set of observations related to this proposition.
     """
@@ -161,15 +272,27 @@ class Proposition(Base):
 
     revision_group: Mapped[str]       = mapped_column(String(36), nullable=False, index=True)
     version:        Mapped[int]       = mapped_column(Integer, server_default="1", nullable=False)
+    # maintained by the proposition_parent triggers (see create_leaf_triggers)
+    is_leaf:        Mapped[bool]      = mapped_column(Boolean, server_default="1", nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_propositions_leaf_created",
+            "created_at",
+            sqlite_where=sql_text("is_leaf = 1"),
+        ),
+        Index("ix_propositions_created", "created_at"),
+        Index("ix_propositions_confidence_created", "confidence", "created_at"),
+    )
 
     parents: Mapped[set["Proposition"]] = relationship(
         "Proposition",
         secondary=proposition_parent,
         primaryjoin=id == proposition_parent.c.child_id,
         secondaryjoin=id == proposition_parent.c.parent_id,
-        backref="children",
+        backref=backref("children", lazy="raise"),
         collection_class=set,
-        lazy="selectin",
+        lazy="raise",
     )
 
     observations: Mapped[set[Observation]] = relationship(
@@ -178,7 +301,7 @@ class Proposition(Base):
         back_populates="propositions",
         collection_class=set,
         passive_deletes=True,
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
@@ -245,41 +368,118 @@ class Suggestion(Base):
 
 FTS_TOKENIZER = "porter ascii"
 
-def create_fts_table(conn) -> None:
-    """Create FTS5 virtual table and triggers for proposition search.
-    
-    This function creates a full-text search table for propositions and sets up
-    triggers to maintain the search index as propositions are modified.
+# names accepted by init_db(fts_tokenizer=...) / GUM_FTS_TOKENIZER
+FTS_TOKENIZERS = {
+    "porter": FTS_TOKENIZER,                          # English stemming
+    "unicode61": "unicode61 remove_diacritics 2",     # any script, no stemming
+    "trigram": "trigram",                             # substrings; CJK, code, typos
+}
+
+_TOKENIZE_RE = re.compile(r"tokenize\s*=\s*'([^']*)'", re.IGNORECASE)
+_CONTENT_RE = re.compile(r"\bcontent\s*=\s*'([^']*)'", re.IGNORECASE)
+
+# (columns, external content table) of each FTS5 table
+FTS_CONTENT = {
+    "propositions_fts": ("text, reasoning", "propositions"),
+    "observations_fts": ("content", "observation_texts"),
+}
+
+
+def resolve_fts_tokenizer(name: Optional[str]) -> str:
+    """Map a tokenizer name (or a raw FTS5 ``tokenize`` spec) to the spec to use."""
+    name = name or os.getenv("GUM_FTS_TOKENIZER") or "porter"
+    return FTS_TOKENIZERS.get(name.lower(), name)
+
+
+def fts_tokenizer_of(conn, table: str) -> Optional[str]:
+    """The ``tokenize`` spec an existing FTS5 table was created with, or None."""
+    row = conn.execute(
+        sql_text("SELECT sql FROM sqlite_master WHERE type='table' AND name=:name"),
+        {"name": table},
+    ).fetchone()
+    if row is None:
+        return None
+    match = _TOKENIZE_RE.search(row[0] or "")
+    return match.group(1) if match else "unicode61"
+
+
+def fts_content_of(conn, table: str) -> Optional[str]:
+    """The external content table an existing FTS5 table reads, or None."""
+    row = conn.execute(
+        sql_text("SELECT sql FROM sqlite_master WHERE type='table' AND name=:name"),
+        {"name": table},
+    ).fetchone()
+    match = _CONTENT_RE.search(row[0] or "") if row is not None else None
+    return match.group(1) if match else None
+
+
+def rebuild_fts_table(conn, table: str, tokenizer: str) -> None:
+    """Recreate an external-content FTS5 table with another tokenizer and re-index it.
+
+    Runs in the caller's transaction; with WAL, readers keep using the old
+    index until it commits.
 
     Args:
         conn: SQLite database connection.
+        table (str): "propositions_fts" or "observations_fts".
+        tokenizer (str): FTS5 ``tokenize`` spec.
     """
-    exists = conn.execute(
-        sql_text(
-            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='propositions_fts'"
-        )
-    ).fetchone()
-    if exists:
-        return
-
-    conn.execute(
-        sql_text(
-            f"""
-            CREATE VIRTUAL TABLE propositions_fts
+    columns, content = FTS_CONTENT[table]
+    # a savepoint opens a transaction even on an autocommit connection
+    conn.execute(sql_text("SAVEPOINT fts_rebuild"))
+    try:
+        conn.execute(sql_text(f"DROP TABLE IF EXISTS {table}"))
+        conn.execute(sql_text(f"""
+            CREATE VIRTUAL TABLE {table}
             USING fts5(
-                text,
-                reasoning,
-                content='propositions',
+                {columns},
+                content='{content}',
                 content_rowid='id',
-                tokenize='{FTS_TOKENIZER}'
+                tokenize='{tokenizer}'
             );
-        """
+        """))
+        conn.execute(sql_text(f"INSERT INTO {table}({table}) VALUES('rebuild')"))
+    except Exception:
+        conn.execute(sql_text("ROLLBACK TO fts_rebuild"))
+        raise
+    finally:
+        conn.execute(sql_text("RELEASE fts_rebuild"))
+
+
+def create_fts_table(conn, tokenizer: str = FTS_TOKENIZER) -> None:
+    """Create FTS5 virtual table and triggers for proposition search.
+    
+    This function creates a full-text search table for propositions and sets up
+    triggers to maintain the search index as propositions are modified. An
+    existing table is re-indexed if it uses a different tokenizer.
+
+    Args:
+        conn: SQLite database connection.
+        tokenizer (str): FTS5 ``tokenize`` spec. Defaults to FTS_TOKENIZER.
+    """
+    current = fts_tokenizer_of(conn, "propositions_fts")
+    if current is not None and current != tokenizer:
+        rebuild_fts_table(conn, "propositions_fts", tokenizer)
+
+    if current is None:
+        conn.execute(
+            sql_text(
+                f"""
+                CREATE VIRTUAL TABLE propositions_fts
+                USING fts5(
+                    text,
+                    reasoning,
+                    content='propositions',
+                    content_rowid='id',
+                    tokenize='{tokenizer}'
+                );
+            """
+            )
         )
-    )
     conn.execute(
         sql_text(
             """
-            CREATE TRIGGER propositions_ai
+            CREATE TRIGGER IF NOT EXISTS propositions_ai
             AFTER INSERT ON propositions BEGIN
                 INSERT INTO propositions_fts(rowid, text, reasoning)
                 VALUES (new.id, new.text, new.reasoning);
@@ -290,7 +490,7 @@ def create_fts_table(conn) -> None:
     conn.execute(
         sql_text(
             """
-            CREATE TRIGGER propositions_ad
+            CREATE TRIGGER IF NOT EXISTS propositions_ad
             AFTER DELETE ON propositions BEGIN
                 INSERT INTO propositions_fts(propositions_fts, rowid, text, reasoning)
                 VALUES('delete', old.id, old.text, old.reasoning);
@@ -298,11 +498,16 @@ def create_fts_table(conn) -> None:
         """
         )
     )
+    # only re-index when the indexed text changed, not on updated_at touches;
+    # recreated on every start so older databases pick up the WHEN clause
+    conn.execute(sql_text("DROP TRIGGER IF EXISTS propositions_au"))
     conn.execute(
         sql_text(
             """
             CREATE TRIGGER propositions_au
-            AFTER UPDATE ON propositions BEGIN
+            AFTER UPDATE OF text, reasoning ON propositions
+            WHEN old.text IS NOT new.text OR old.reasoning IS NOT new.reasoning
+            BEGIN
                 INSERT INTO propositions_fts(propositions_fts, rowid, text, reasoning)
                 VALUES('delete', old.id, old.text, old.reasoning);
                 INSERT INTO propositions_fts(rowid, text, reasoning)
@@ -311,75 +516,341 @@ def create_fts_table(conn) -> None:
         """
         )
     )
-    conn.execute(
-        sql_text(
+    if current is None:
+        conn.execute(
+            sql_text(
+                """
+                INSERT INTO propositions_fts(rowid, text, reasoning)
+                SELECT id, text, reasoning FROM propositions;
             """
-            INSERT INTO propositions_fts(rowid, text, reasoning)
-            SELECT id, text, reasoning FROM propositions;
-        """
+            )
         )
-    )
 
-def create_observations_fts(conn) -> None:
+def create_observations_fts(conn, tokenizer: str = FTS_TOKENIZER) -> None:
     """Create FTS5 virtual table and triggers for observation search.
     
     This function creates a full-text search table for observations and sets up
-    triggers to maintain the search index as observations are modified.
+    triggers to maintain the search index as observations are modified. An
+    existing table is re-indexed if it uses a different tokenizer.
+
+    The index reads the ``observation_texts`` view, which yields the full
+    content of observations in cold storage, so it keeps matching their
+    complete text. Moving a body to ``observation_blobs`` (blob first, then
+    the preview) leaves the index untouched. Indexes built on the
+    ``observations`` table itself are re-indexed once.
+
+    The view, and so reading the index's content, calls ``gum_inflate``; other
+    tools must register it (see :func:`register_sql_functions`). Deleting
+    observations does not: the trigger removes hot rows from the index
+    directly and leaves cold ones in ``observation_fts_tombstones`` for
+    :func:`purge_fts_tombstones`. Search joins the index to ``observations``,
+    so their stale entries never surface.
 
     Args:
         conn: SQLite database connection.
+        tokenizer (str): FTS5 ``tokenize`` spec. Defaults to FTS_TOKENIZER.
     """
-    exists = conn.execute(sql_text(
-        "SELECT 1 FROM sqlite_master "
-        "WHERE type='table' AND name='observations_fts'"
-    )).fetchone()
-    if exists:
-        return                      # already present
-
-    conn.execute(sql_text(f"""
-        CREATE VIRTUAL TABLE observations_fts
-        USING fts5(
-            content,
-            content='observations',
-            content_rowid='id',
-            tokenize='{FTS_TOKENIZER}'
-        );
+    conn.execute(sql_text("""
+        CREATE VIEW IF NOT EXISTS observation_texts AS
+        SELECT o.id AS id, COALESCE(gum_inflate(b.body), o.content) AS content
+        FROM observations AS o
+        LEFT JOIN observation_blobs AS b ON b.observation_id = o.id;
     """))
+
+    current = fts_tokenizer_of(conn, "observations_fts")
+    if current is not None and (
+        current != tokenizer or fts_content_of(conn, "observations_fts") != "observation_texts"
+    ):
+        rebuild_fts_table(conn, "observations_fts", tokenizer)
+
+    if current is None:
+        conn.execute(sql_text(f"""
+            CREATE VIRTUAL TABLE observations_fts
+            USING fts5(
+                content,
+                content='observation_texts',
+                content_rowid='id',
+                tokenize='{tokenizer}'
+            );
+        """))
     conn.execute(sql_text("""
-        CREATE TRIGGER observations_ai
+        CREATE TRIGGER IF NOT EXISTS observations_ai
         AFTER INSERT ON observations BEGIN
             INSERT INTO observations_fts(rowid, content)
             VALUES (new.id, new.content);
         END;
     """))
+    # the index holds the full text, so the delete must supply it too; cold
+    # bodies are left for purge_fts_tombstones, so any connection can delete
+    conn.execute(sql_text("DROP TRIGGER IF EXISTS observations_ad"))
     conn.execute(sql_text("""
         CREATE TRIGGER observations_ad
         AFTER DELETE ON observations BEGIN
             INSERT INTO observations_fts(observations_fts, rowid, content)
-            VALUES ('delete', old.id, old.content);
+            SELECT 'delete', old.id, old.content
+            WHERE NOT EXISTS (SELECT 1 FROM observation_blobs WHERE observation_id = old.id);
+            INSERT INTO observation_fts_tombstones(observation_id, body)
+            SELECT observation_id, body FROM observation_blobs WHERE observation_id = old.id;
+            DELETE FROM observation_blobs WHERE observation_id = old.id;
         END;
     """))
+    conn.execute(sql_text("DROP TRIGGER IF EXISTS observations_au"))
     conn.execute(sql_text("""
         CREATE TRIGGER observations_au
-        AFTER UPDATE ON observations BEGIN
+        AFTER UPDATE OF content ON observations
+        WHEN old.content IS NOT new.content
+         AND NOT EXISTS (SELECT 1 FROM observation_blobs WHERE observation_id = new.id)
+        BEGIN
             INSERT INTO observations_fts(observations_fts, rowid, content)
             VALUES ('delete', old.id, old.content);
             INSERT INTO observations_fts(rowid, content)
             VALUES (new.id, new.content);
         END;
     """))
-    # back-fill the index
+    if current is None:
+        # back-fill the index
+        conn.execute(sql_text("""
+            INSERT INTO observations_fts(rowid, content)
+            SELECT id, content FROM observation_texts;
+        """))
+
+
+def purge_fts_tombstones(conn) -> int:
+    """Remove deleted cold observations from ``observations_fts``.
+
+    Bodies are inflated here in Python, so this works on any connection. An
+    id that a new observation took over in the meantime is re-indexed from
+    its current text afterwards.
+
+    Args:
+        conn: SQLite database connection.
+
+    Returns:
+        int: Number of index entries removed.
+    """
+    rows = conn.execute(sql_text(
+        "SELECT id, observation_id, body FROM observation_fts_tombstones ORDER BY id"
+    )).all()
+    for _id, observation_id, body in rows:
+        conn.execute(sql_text(
+            "INSERT INTO observations_fts(observations_fts, rowid, content) "
+            "VALUES ('delete', :id, :content)"
+        ), {"id": observation_id, "content": decompress_content(body)})
+        reused = conn.execute(sql_text(
+            "SELECT content, (SELECT body FROM observation_blobs WHERE observation_id = o.id) "
+            "FROM observations AS o WHERE o.id = :id"
+        ), {"id": observation_id}).first()
+        if reused is not None:
+            content, cold = reused
+            conn.execute(sql_text(
+                "INSERT INTO observations_fts(observations_fts, rowid, content) "
+                "VALUES ('delete', :id, :content)"
+            ), {"id": observation_id, "content": decompress_content(cold) or content})
+            conn.execute(sql_text(
+                "INSERT INTO observations_fts(rowid, content) VALUES (:id, :content)"
+            ), {"id": observation_id, "content": decompress_content(cold) or content})
+    if rows:
+        conn.execute(sql_text("DELETE FROM observation_fts_tombstones WHERE id <= :last"),
+                     {"last": rows[-1][0]})
+    return len(rows)
+
+
+def migrate_observation_columns(conn) -> None:
+    """Add columns introduced after the first release to an existing observations table.
+
+    Args:
+        conn: SQLite database connection.
+    """
+    existing = {
+        row[1] for row in conn.execute(sql_text("PRAGMA table_info(observations)"))
+    }
+    if "content_hash" not in existing:
+        conn.execute(sql_text("ALTER TABLE observations ADD COLUMN content_hash VARCHAR(64)"))
+    if "simhash" not in existing:
+        conn.execute(sql_text("ALTER TABLE observations ADD COLUMN simhash BIGINT"))
+    if "journal_id" not in existing:
+        conn.execute(sql_text("ALTER TABLE observations ADD COLUMN journal_id INTEGER"))
+    conn.execute(sql_text(
+        "CREATE INDEX IF NOT EXISTS ix_observations_observer_hash "
+        "ON observations (observer_name, content_hash)"
+    ))
+    conn.execute(sql_text(
+        "CREATE INDEX IF NOT EXISTS ix_observations_journal ON observations (journal_id)"
+    ))
+
+
+def create_leaf_triggers(conn) -> None:
+    """Keep ``propositions.is_leaf`` in step with ``proposition_parent``.
+
+    Args:
+        conn: SQLite database connection.
+    """
     conn.execute(sql_text("""
-        INSERT INTO observations_fts(rowid, content)
-        SELECT id, content FROM observations;
+        CREATE TRIGGER IF NOT EXISTS proposition_parent_ai
+        AFTER INSERT ON proposition_parent BEGIN
+            UPDATE propositions SET is_leaf = 0
+            WHERE id = new.parent_id AND is_leaf = 1;
+        END;
     """))
+    conn.execute(sql_text("""
+        CREATE TRIGGER IF NOT EXISTS proposition_parent_ad
+        AFTER DELETE ON proposition_parent BEGIN
+            UPDATE propositions SET is_leaf = 1
+            WHERE id = old.parent_id
+              AND NOT EXISTS (
+                  SELECT 1 FROM proposition_parent WHERE parent_id = old.parent_id
+              );
+        END;
+    """))
+
+
+def migrate_proposition_columns(conn) -> None:
+    """Add and back-fill ``propositions.is_leaf`` on databases created before it existed.
+
+    Args:
+        conn: SQLite database connection.
+    """
+    existing = {
+        row[1] for row in conn.execute(sql_text("PRAGMA table_info(propositions)"))
+    }
+    if "is_leaf" not in existing:
+        conn.execute(sql_text(
+            "ALTER TABLE propositions ADD COLUMN is_leaf BOOLEAN NOT NULL DEFAULT 1"
+        ))
+        conn.execute(sql_text(
+            "UPDATE propositions SET is_leaf = 0 "
+            "WHERE id IN (SELECT parent_id FROM proposition_parent)"
+        ))
+    conn.execute(sql_text(
+        "CREATE INDEX IF NOT EXISTS ix_propositions_leaf_created "
+        "ON propositions (created_at) WHERE is_leaf = 1"
+    ))
+    conn.execute(sql_text(
+        "CREATE INDEX IF NOT EXISTS ix_proposition_parent_parent "
+        "ON proposition_parent (parent_id)"
+    ))
+
+
+# (name, table, columns) of the time-range indexes, created on existing databases too
+TIME_INDEXES = (
+    ("ix_propositions_created", "propositions", "created_at"),
+    ("ix_propositions_confidence_created", "propositions", "confidence, created_at"),
+    ("ix_observations_created", "observations", "created_at"),
+    ("ix_observations_observer_created", "observations", "observer_name, created_at"),
+    ("ix_observation_proposition_proposition", "observation_proposition", "proposition_id"),
+)
+
+
+def create_time_indexes(conn) -> None:
+    """Create the ``created_at`` range indexes on databases made before they existed.
+
+    Args:
+        conn: SQLite database connection.
+    """
+    for name, table, columns in TIME_INDEXES:
+        conn.execute(sql_text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+
+def _decay_factor(alpha, age_days, k):
+    if not alpha or age_days is None:
+        return 1.0
+    return math.exp(-alpha * k * max(age_days, 0.0))
+
+
+# Per-connection PRAGMAs. page_size only takes effect on a new database.
+SQLITE_PROFILES = {
+    # every commit synced; the SQLite defaults plus a bounded WAL
+    "durable": {
+        "synchronous": "FULL",
+        "cache_size": -16000,               # KiB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "wal_autocheckpoint": 1000,         # pages
+        "journal_size_limit": 64 * 2**20,
+        "page_size": 4096,
+    },
+    # WAL + NORMAL never corrupts; a power cut may drop the last commits
+    "balanced": {
+        "synchronous": "NORMAL",
+        "cache_size": -65536,
+        "mmap_size": 256 * 2**20,
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 1000,
+        "journal_size_limit": 64 * 2**20,
+        "page_size": 4096,
+    },
+    # no syncs, large caches and rare checkpoints; an OS crash may corrupt the file
+    "throughput": {
+        "synchronous": "OFF",
+        "cache_size": -262144,
+        "mmap_size": 2**30,
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 10000,
+        "journal_size_limit": 256 * 2**20,
+        "page_size": 8192,
+    },
+}
+
+
+def resolve_sqlite_profile(name: Optional[str]) -> dict:
+    """PRAGMA settings of a named profile (falls back to GUM_SQLITE_PROFILE, then "balanced")."""
+    name = (name or os.getenv("GUM_SQLITE_PROFILE") or "balanced").lower()
+    if name not in SQLITE_PROFILES:
+        raise ValueError(
+            f"Unknown SQLite profile '{name}'; expected one of {', '.join(SQLITE_PROFILES)}"
+        )
+    return SQLITE_PROFILES[name]
+
+
+def apply_sqlite_profile(dbapi_connection, settings: dict) -> None:
+    """Set the PRAGMAs of a profile on a raw connection.
+
+    Args:
+        dbapi_connection: Raw DBAPI connection.
+        settings (dict): A value of :data:`SQLITE_PROFILES`.
+    """
+    cursor = dbapi_connection.cursor()
+    # page_size first: it only applies before the first table is created
+    cursor.execute(f"PRAGMA page_size = {int(settings['page_size'])}")
+    for pragma in ("synchronous", "temp_store"):
+        cursor.execute(f"PRAGMA {pragma} = {settings[pragma]}")
+    for pragma in ("cache_size", "mmap_size", "wal_autocheckpoint", "journal_size_limit"):
+        cursor.execute(f"PRAGMA {pragma} = {int(settings[pragma])}")
+    cursor.close()
+
+
+def register_sql_functions(dbapi_connection, connection_record=None) -> None:
+    """Register the scalar functions used by the search queries on a new connection.
+
+    ``gum_decay(alpha, age_days, k)`` returns ``exp(-alpha * k * age_days)``,
+    the recency factor applied to BM25 scores. ``gum_inflate(body)``
+    decompresses an ``observation_blobs`` body.
+
+    Args:
+        dbapi_connection: Raw DBAPI connection.
+        connection_record: Unused; part of the pool event signature.
+    """
+    dbapi_connection.create_function("gum_decay", 3, _decay_factor, deterministic=True)
+    dbapi_connection.create_function("gum_inflate", 1, decompress_content, deterministic=True)
 
 
 async def init_db(
     db_path: str = "gum.db",
     db_directory: Optional[str] = None,
+    fts_tokenizer: Optional[str] = None,
+    sqlite_profile: Optional[str] = None,
 ):
-    """Create the SQLite file, ORM tables & FTS5 index (first run only)."""
+    """Create the SQLite file, ORM tables & FTS5 index (first run only).
+
+    ``fts_tokenizer`` is "porter" (default), "unicode61", "trigram" or a raw
+    FTS5 spec, falling back to GUM_FTS_TOKENIZER. Changing it re-indexes the
+    existing FTS tables on the next start.
+
+    ``sqlite_profile`` is "durable", "balanced" (default) or "throughput",
+    falling back to GUM_SQLITE_PROFILE; see :data:`SQLITE_PROFILES`. It is
+    applied to every pooled connection.
+    """
+    settings = resolve_sqlite_profile(sqlite_profile)
     if db_directory:
         path = pathlib.Path(db_directory).expanduser()
         path.mkdir(parents=True, exist_ok=True)
@@ -394,14 +865,29 @@ async def init_db(
         },
         poolclass=None,
     )
+    event.listen(engine.sync_engine, "connect", register_sql_functions)
+    event.listen(
+        engine.sync_engine,
+        "connect",
+        lambda dbapi_connection, _record: apply_sqlite_profile(dbapi_connection, settings),
+    )
 
     async with engine.begin() as conn:
+        # only takes effect on a new database (or at the next full VACUUM)
+        await conn.execute(sql_text("PRAGMA auto_vacuum=INCREMENTAL"))
         await conn.execute(sql_text("PRAGMA journal_mode=WAL"))
         await conn.execute(sql_text("PRAGMA busy_timeout=30000"))
 
         await conn.run_sync(Base.metadata.create_all)
-        await conn.run_sync(create_fts_table)
-        await conn.run_sync(create_observations_fts)
+        await conn.run_sync(migrate_observation_columns)
+        await conn.run_sync(migrate_proposition_columns)
+        await conn.run_sync(create_leaf_triggers)
+        await conn.run_sync(create_time_indexes)
+        tokenizer = resolve_fts_tokenizer(fts_tokenizer)
+        await conn.run_sync(create_fts_table, tokenizer)
+        await conn.run_sync(create_observations_fts, tokenizer)
+        # cold observations deleted by other tools since the last run
+        await conn.run_sync(purge_fts_tombstones)
 
     Session = async_sessionmaker(
         engine, 
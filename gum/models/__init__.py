@@ -13,11 +13,26 @@ _spec.loader.exec_module(_models)
 # Re-export everything
 observation_proposition = _models.observation_proposition
 proposition_parent = _models.proposition_parent
+proposition_vectors = _models.proposition_vectors
+observation_blobs = _models.observation_blobs
+observation_fts_tombstones = _models.observation_fts_tombstones
 Observation = _models.Observation
 Proposition = _models.Proposition
 Suggestion = _models.Suggestion
 init_db = _models.init_db
+fts_tokenizer_of = _models.fts_tokenizer_of
+rebuild_fts_table = _models.rebuild_fts_table
+resolve_fts_tokenizer = _models.resolve_fts_tokenizer
+register_sql_functions = _models.register_sql_functions
+SQLITE_PROFILES = _models.SQLITE_PROFILES
+apply_sqlite_profile = _models.apply_sqlite_profile
+resolve_sqlite_profile = _models.resolve_sqlite_profile
+PREVIEW_CHARS = _models.PREVIEW_CHARS
+compress_content = _models.compress_content
+decompress_content = _models.decompress_content
+fts_content_of = _models.fts_content_of
+purge_fts_tombstones = _models.purge_fts_tombstones
 Base = _models.Base
 
 # Export all for * imports
-__all__ = ['observation_proposition', 'proposition_parent', 'Observation', 'Proposition', 'Suggestion', 'init_db', 'Base']
+__all__ = ['observation_proposition', 'proposition_parent', 'proposition_vectors', 'observation_blobs', 'observation_fts_tombstones', 'Observation', 'Proposition', 'Suggestion', 'init_db', 'fts_tokenizer_of', 'rebuild_fts_table', 'resolve_fts_tokenizer', 'register_sql_functions', 'SQLITE_PROFILES', 'apply_sqlite_profile', 'resolve_sqlite_profile', 'PREVIEW_CHARS', 'compress_content', 'decompress_content', 'fts_content_of', 'purge_fts_tombstones', 'Base']
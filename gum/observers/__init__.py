@@ -4,7 +4,8 @@ Observer module for GUM - General User Models.
 This module provides observer classes for different types of user interactions.
 """
 
+from .api import APIObserver, get_api_observer
 from .observer import Observer
 from .screen import Screen
 
-__all__ = ["Observer", "Screen"] 
\ No newline at end of file
+__all__ = ["APIObserver", "Observer", "Screen", "get_api_observer"] 
\ No newline at end of file
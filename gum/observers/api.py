@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+
+class APIObserver:
+    """Named source for updates that are pushed in (HTTP API, video jobs, scripts).
+
+    Unlike :class:`~gum.observers.Observer` it has no queue and no background
+    task: updates are handed to :meth:`gum.ingest` directly. Instances are cheap
+    and shared through :func:`get_api_observer`, so creating one per request
+    does not grow the number of tasks on the event loop.
+
+    Args:
+        name (Optional[str]): Observer name recorded on observations. Defaults to "api_controller".
+    """
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        self._name = name or "api_controller"
+
+    @property
+    def name(self) -> str:
+        """Get the name of the observer.
+
+        Returns:
+            str: The observer's name.
+        """
+        return self._name
+
+    async def stop(self) -> None:
+        """Nothing to stop; present for interface compatibility with Observer."""
+
+    def __repr__(self) -> str:
+        return f"<APIObserver(name={self._name})>"
+
+
+_registry: dict[str, APIObserver] = {}
+_registry_lock = threading.Lock()
+
+
+def get_api_observer(name: Optional[str] = None) -> APIObserver:
+    """Return the shared :class:`APIObserver` for ``name``, creating it on first use."""
+    name = name or "api_controller"
+    with _registry_lock:
+        observer = _registry.get(name)
+        if observer is None:
+            observer = _registry[name] = APIObserver(name)
+        return observer
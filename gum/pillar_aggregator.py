@@ -44,6 +44,7 @@ class PillarAggregator:
             stmt = select(Proposition).where(
                 and_(
                     Proposition.analysis_type == "timeline",
+                    Proposition.is_leaf,
                     Proposition.created_at >= start_date,
                     Proposition.created_at < end_date
                 )
@@ -142,6 +143,7 @@ class PillarAggregator:
             stmt = select(Proposition).where(
                 and_(
                     Proposition.analysis_type == "preference",
+                    Proposition.is_leaf,
                     Proposition.created_at >= cutoff_date,
                     Proposition.confidence >= 6  # Only high-confidence preferences
                 )
@@ -247,6 +249,7 @@ class PillarAggregator:
             stmt = select(Proposition).where(
                 and_(
                     Proposition.analysis_type == "productivity",
+                    Proposition.is_leaf,
                     Proposition.created_at >= cutoff_date,
                     Proposition.confidence >= 5  # Include medium-confidence insights
                 )
@@ -0,0 +1,149 @@
+# query_cache.py
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Hashable, Optional
+
+from sqlalchemy import event
+
+# statements that change what a proposition query can return
+_WRITE_RE = re.compile(
+    r"^\s*(?:INSERT|UPDATE|DELETE|REPLACE)\b.*?\b"
+    r"(?:propositions|observation_proposition|proposition_parent|observations)\b",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+class DataGeneration:
+    """Counter bumped after every write to the tables behind proposition search.
+
+    Attach it to an engine with :meth:`track`; readers take :attr:`value`
+    before they query, so a result is never filed under a generation newer
+    than the data it saw. A write inside a transaction is only visible to
+    other connections once it commits, so whoever commits must also call
+    :meth:`committed` (gum's :class:`~gum.storage.SQLiteWriter` does);
+    otherwise a read during the open transaction would file the old
+    snapshot under the new generation.
+    """
+
+    def __init__(self) -> None:
+        self._value = 0
+        self._pending = False
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+    def committed(self) -> None:
+        """Bump again if a tracked write ran since the last commit."""
+        with self._lock:
+            if not self._pending:
+                return
+            self._pending = False
+            self._value += 1
+
+    def track(self, engine) -> None:
+        """Bump on each write statement executed through ``engine``.
+
+        Autocommit writes are visible at once; transactional ones are bumped
+        again by :meth:`committed`.
+
+        Args:
+            engine: A sync ``Engine`` or an ``AsyncEngine``.
+        """
+        sync_engine = getattr(engine, "sync_engine", engine)
+
+        def _after_execute(conn, cursor, statement, parameters, context, executemany):
+            if _WRITE_RE.match(statement):
+                with self._lock:
+                    self._value += 1
+                    self._pending = True
+
+        event.listen(sync_engine, "after_cursor_execute", _after_execute)
+
+
+class QueryCache:
+    """LRU + TTL cache of query results tagged with the data generation.
+
+    An entry is only served while the generation it was computed at is still
+    current, so any proposition or link write invalidates every entry at once
+    without walking the cache.
+
+    Args:
+        max_entries (int): Entries kept; least recently used are dropped. Defaults to 256.
+        ttl_seconds (float): Age after which an entry is ignored, so that recency
+            decay is re-applied now and then. Defaults to 60.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[int, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(
+        query: str,
+        mode: str,
+        limit: int,
+        start_time: datetime | None,
+        end_time: datetime | None,
+    ) -> tuple:
+        """Key a query by its normalised text and parameters."""
+        return (
+            " ".join(query.lower().split()),
+            mode.upper(),
+            limit,
+            start_time.isoformat() if start_time else None,
+            end_time.isoformat() if end_time else None,
+        )
+
+    def get(self, key: Hashable, generation: int) -> Optional[Any]:
+        """Return the cached value if it was computed at ``generation`` and is fresh."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            entry_generation, stored_at, value = entry
+            if entry_generation != generation or now - stored_at >= self.ttl_seconds:
+                del self._entries[key]
+                self._stats["stale"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def put(self, key: Hashable, generation: int, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (generation, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+            stats["entries"] = len(self._entries)
+            return stats
@@ -0,0 +1,133 @@
+# relations.py
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from .models import Proposition
+
+
+@dataclass
+class LocalRelations:
+    """Outcome of the local pre-classification of a candidate pool.
+
+    Attributes:
+        identical (set[int]): Ids that have a near-verbatim twin in the pool.
+        unrelated (set[int]): Ids that are not close to anything else in the pool.
+        ambiguous (list[Proposition]): Propositions that still need the model.
+    """
+    identical: set[int] = field(default_factory=set)
+    unrelated: set[int] = field(default_factory=set)
+    ambiguous: list[Proposition] = field(default_factory=list)
+
+
+class LocalRelationClassifier:
+    """Settles obvious IDENTICAL / UNRELATED labels without calling the model.
+
+    Every proposition text is turned into an L2-normalised hashed vector of word
+    unigrams and bigrams (cached per proposition), so a dot product gives the
+    cosine similarity of two propositions. Pairs at or above
+    ``identical_threshold`` are labelled IDENTICAL, propositions whose best match
+    stays below ``unrelated_threshold`` are labelled UNRELATED, and only the
+    propositions in the band between the two are sent to the similarity prompt.
+
+    Args:
+        identical_threshold (float, optional): Cosine at which two propositions are identical. Defaults to 0.9.
+        unrelated_threshold (float, optional): Cosine below which a proposition is unrelated. Defaults to 0.15.
+        n_features (int, optional): Size of the hashed vector space. Defaults to 2**18.
+        cache_size (int, optional): Number of proposition vectors kept in memory. Defaults to 4096.
+    """
+
+    def __init__(
+        self,
+        identical_threshold: float = 0.9,
+        unrelated_threshold: float = 0.15,
+        n_features: int = 2 ** 18,
+        cache_size: int = 4096,
+    ):
+        if not 0.0 <= unrelated_threshold <= identical_threshold <= 1.0:
+            raise ValueError("thresholds must satisfy 0 <= unrelated <= identical <= 1")
+
+        self.identical_threshold = identical_threshold
+        self.unrelated_threshold = unrelated_threshold
+        self.cache_size = cache_size
+        self._vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm="l2",
+        )
+        self._cache: OrderedDict[tuple[int, str], csr_matrix] = OrderedDict()
+        self.stats = {
+            "pools": 0,
+            "llm_calls": 0,
+            "llm_calls_avoided": 0,
+            "local_identical": 0,
+            "local_unrelated": 0,
+        }
+
+    def _vectors(self, props: list[Proposition]) -> csr_matrix:
+        missing = [p for p in props if (p.id, p.text) not in self._cache]
+        if missing:
+            rows = self._vectorizer.transform([p.text for p in missing])
+            for idx, p in enumerate(missing):
+                self._cache[(p.id, p.text)] = rows[idx]
+        for p in props:
+            self._cache.move_to_end((p.id, p.text))
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        return vstack([self._cache[(p.id, p.text)] for p in props])
+
+    def similarity_matrix(self, props: list[Proposition]) -> np.ndarray:
+        """Pairwise cosine similarity of ``props`` (diagonal zeroed)."""
+        mat = self._vectors(props)
+        sims = (mat @ mat.T).toarray()
+        np.fill_diagonal(sims, 0.0)
+        return sims
+
+    def classify(self, props: list[Proposition]) -> LocalRelations:
+        """Split ``props`` into locally decided labels and an ambiguous remainder.
+
+        Args:
+            props (list[Proposition]): Candidate pool (drafts plus search hits).
+
+        Returns:
+            LocalRelations: Decided ids and the propositions left for the model.
+        """
+        self.stats["pools"] += 1
+        out = LocalRelations()
+        if len(props) < 2:
+            out.unrelated = {p.id for p in props}
+            self.stats["local_unrelated"] += len(out.unrelated)
+            self.stats["llm_calls_avoided"] += 1
+            return out
+
+        sims = self.similarity_matrix(props)
+        ident = sims >= self.identical_threshold
+        band = (sims >= self.unrelated_threshold) & ~ident
+        best = sims.max(axis=1)
+
+        for i, p in enumerate(props):
+            if ident[i].any():
+                out.identical.add(p.id)
+            elif best[i] < self.unrelated_threshold:
+                out.unrelated.add(p.id)
+
+        # everything in a middle-band pair goes to the model; IDENTICAL members
+        # are included too so the model sees what the others might be similar to
+        ambiguous = band.any(axis=1)
+        out.ambiguous = [p for i, p in enumerate(props) if ambiguous[i]]
+
+        self.stats["local_identical"] += len(out.identical)
+        self.stats["local_unrelated"] += len(out.unrelated)
+        if out.ambiguous:
+            self.stats["llm_calls"] += 1
+        else:
+            self.stats["llm_calls_avoided"] += 1
+        return out
@@ -0,0 +1,409 @@
+# retention.py
+
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import delete, text as sql_text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from .db_utils import build_fts_query
+from .models import (
+    Observation,
+    Proposition,
+    Suggestion,
+    fts_tokenizer_of,
+    observation_proposition,
+    proposition_parent,
+    proposition_vectors,
+    purge_fts_tombstones,
+    resolve_fts_tokenizer,
+)
+
+logger = logging.getLogger("gum.retention")
+
+ARCHIVE_ALIAS = "gum_archive"
+_ARCHIVE_FILE = re.compile(r"gum-(\d{4}-\d{2})\.db$")
+_CREATE_TABLE = re.compile(r"^\s*CREATE TABLE\s+\"?(\w+)\"?", re.IGNORECASE)
+
+
+@dataclass
+class RetentionPolicy:
+    """When rows of one table leave the live database.
+
+    Attributes:
+        max_age_days (float): Age, by ``created_at``, after which a row is archived.
+        batch_size (int): Rows moved per write.
+    """
+    max_age_days: float
+    batch_size: int = 500
+
+
+# Tables the engine archives and which of their rows are eligible.
+ARCHIVABLE = {
+    "observations": "1 = 1",
+    "propositions": "t.is_leaf = 0",       # superseded revisions only
+    "suggestions": "t.delivered = 1",
+}
+
+# what ``gum --retention`` applies; nothing is archived without a policy
+DEFAULT_RETENTION = {
+    "observations": RetentionPolicy(max_age_days=180),
+    "propositions": RetentionPolicy(max_age_days=90),
+    "suggestions": RetentionPolicy(max_age_days=30),
+}
+
+# link rows copied along with an archived row: (table, condition on the batch ids)
+_LINKS = {
+    "observations": (
+        ("observation_proposition", "t.observation_id IN (SELECT value FROM json_each(:ids))"),
+    ),
+    "propositions": (
+        ("observation_proposition", "t.proposition_id IN (SELECT value FROM json_each(:ids))"),
+        ("proposition_parent",
+         "t.child_id IN (SELECT value FROM json_each(:ids))"
+         " OR t.parent_id IN (SELECT value FROM json_each(:ids))"),
+    ),
+    "suggestions": (),
+}
+
+# archives hold full observation text, so they need no gum_inflate to be read
+_COPY_OVERRIDES = {
+    "observations": {
+        "content": "COALESCE((SELECT gum_inflate(b.body) FROM main.observation_blobs AS b"
+                   " WHERE b.observation_id = t.id), t.content)",
+    },
+}
+
+_ARCHIVE_FTS = {
+    "observations_fts": ("observations", ("content",)),
+    "propositions_fts": ("propositions", ("text", "reasoning")),
+}
+
+
+def archive_path(directory: str, month: str) -> str:
+    """File of the archive for ``month`` ("YYYY-MM")."""
+    return os.path.join(directory, f"gum-{month}.db")
+
+
+def archive_months(directory: str) -> list[str]:
+    """Months ("YYYY-MM") that have an archive in ``directory``, oldest first."""
+    months = []
+    for path in glob.glob(os.path.join(directory, "gum-*.db")):
+        match = _ARCHIVE_FILE.search(path)
+        if match:
+            months.append(match.group(1))
+    return sorted(months)
+
+
+def _columns(conn, schema: str, table: str) -> list[str]:
+    return [row[1] for row in conn.exec_driver_sql(f"PRAGMA {schema}.table_info({table})")]
+
+
+def _create_archive_schema(conn) -> None:
+    """Create the archived tables, their FTS indexes and insert triggers in the attached archive."""
+    a = ARCHIVE_ALIAS
+    tables = ("observations", "observation_proposition", "propositions",
+              "proposition_parent", "suggestions")
+    rows = conn.exec_driver_sql(
+        "SELECT name, sql FROM main.sqlite_master WHERE type = 'table' "
+        f"AND name IN ({', '.join(repr(t) for t in tables)})"
+    ).all()
+    for name, ddl in rows:
+        conn.exec_driver_sql(_CREATE_TABLE.sub(f"CREATE TABLE IF NOT EXISTS {a}.{name}", ddl, count=1))
+    for table in ARCHIVABLE:
+        conn.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS {a}.ix_{table}_created ON {table} (created_at)"
+        )
+
+    for fts, (content, columns) in _ARCHIVE_FTS.items():
+        tokenizer = fts_tokenizer_of(conn, fts) or resolve_fts_tokenizer(None)
+        conn.exec_driver_sql(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {a}.{fts}
+            USING fts5({', '.join(columns)}, content='{content}', content_rowid='id',
+                       tokenize='{tokenizer}')
+        """)
+        # archived rows are only ever inserted, and OR IGNORE skips the trigger
+        conn.exec_driver_sql(f"""
+            CREATE TRIGGER IF NOT EXISTS {a}.{content}_archive_ai
+            AFTER INSERT ON {content} BEGIN
+                INSERT INTO {fts}(rowid, {', '.join(columns)})
+                VALUES (new.id, {', '.join(f'new.{c}' for c in columns)});
+            END
+        """)
+
+
+def _copy_rows(conn, table: str, where: str, params: dict, overrides: dict[str, str]) -> None:
+    live = set(_columns(conn, "main", table))
+    columns = [c for c in _columns(conn, ARCHIVE_ALIAS, table) if c in live]
+    values = [overrides.get(c, f"t.{c}") for c in columns]
+    conn.exec_driver_sql(
+        f"INSERT OR IGNORE INTO {ARCHIVE_ALIAS}.{table} ({', '.join(columns)}) "
+        f"SELECT {', '.join(values)} FROM main.{table} AS t WHERE {where}",
+        params,
+    )
+
+
+def _copy_to_archive(conn, path: str, table: str, ids: list[int]) -> list[int]:
+    """Copy ``ids`` of ``table`` (and their links) into the archive at ``path``.
+
+    Returns:
+        list[int]: The ids now present in the archive.
+    """
+    params = {"ids": json.dumps(ids)}
+    conn.exec_driver_sql(f"ATTACH DATABASE ? AS {ARCHIVE_ALIAS}", (path,))
+    try:
+        _create_archive_schema(conn)
+        # a savepoint opens a transaction even on an autocommit connection
+        conn.exec_driver_sql("SAVEPOINT archive_copy")
+        try:
+            _copy_rows(conn, table, "t.id IN (SELECT value FROM json_each(:ids))", params,
+                       _COPY_OVERRIDES.get(table, {}))
+            for link, where in _LINKS[table]:
+                _copy_rows(conn, link, where, params, {})
+        except Exception:
+            conn.exec_driver_sql("ROLLBACK TO archive_copy")
+            raise
+        finally:
+            conn.exec_driver_sql("RELEASE archive_copy")
+        return [row[0] for row in conn.exec_driver_sql(
+            f"SELECT id FROM {ARCHIVE_ALIAS}.{table} WHERE id IN (SELECT value FROM json_each(:ids))",
+            params,
+        )]
+    finally:
+        conn.exec_driver_sql(f"DETACH DATABASE {ARCHIVE_ALIAS}")
+
+
+def _archived_mutation(table: str, ids: list[int]):
+    """Writer mutation deleting archived rows of ``table`` from the live database."""
+
+    async def mutation(session: AsyncSession) -> int:
+        if table == "observations":
+            await session.execute(
+                delete(observation_proposition).where(observation_proposition.c.observation_id.in_(ids))
+            )
+            # observations_ad removes the index entries and any cold-storage blob;
+            # cold bodies are parked as tombstones until purged here
+            result = await session.execute(delete(Observation).where(Observation.id.in_(ids)))
+            await session.run_sync(purge_fts_tombstones)
+        elif table == "propositions":
+            await session.execute(
+                delete(observation_proposition).where(observation_proposition.c.proposition_id.in_(ids))
+            )
+            # links to children only; links to still-live parents go when those
+            # are archived, so the parents are not marked as leaves again
+            await session.execute(
+                delete(proposition_parent).where(proposition_parent.c.parent_id.in_(ids))
+            )
+            await session.execute(
+                delete(proposition_vectors).where(proposition_vectors.c.proposition_id.in_(ids))
+            )
+            result = await session.execute(delete(Proposition).where(Proposition.id.in_(ids)))
+        else:
+            result = await session.execute(delete(Suggestion).where(Suggestion.id.in_(ids)))
+        return result.rowcount
+
+    return mutation
+
+
+class RetentionEngine:
+    """Moves old rows out of the live database into monthly archive databases.
+
+    For every table with a :class:`RetentionPolicy` (see ``ARCHIVABLE`` for
+    which rows qualify), rows older than ``max_age_days`` are copied, with
+    their links, into ``gum-YYYY-MM.db`` in ``directory`` by the month they
+    were created, then deleted from the live database through ``write``.
+    The copy is confirmed before the delete, so an interrupted round never
+    loses rows; rerunning it only finishes the move.
+
+    Archives are plain SQLite files with their own FTS5 indexes; see
+    :func:`search_archive` for querying them.
+
+    Args:
+        engine (AsyncEngine): Read-write engine from ``init_db``.
+        write (Callable): Applies a mutation through the writer task, e.g. ``gum.write``.
+        directory (str): Where the archive files live.
+        policies (dict[str, RetentionPolicy]): Policy per table name.
+        is_idle (Callable[[], bool], optional): Checked between batches; a round
+            stops as soon as it returns False. Defaults to always idle.
+        max_batches (int): Batches per table per round. Defaults to 10.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        write: Callable[[Callable[[AsyncSession], Awaitable[Any]]], Awaitable[Any]],
+        directory: str,
+        policies: dict[str, RetentionPolicy],
+        *,
+        is_idle: Optional[Callable[[], bool]] = None,
+        max_batches: int = 10,
+    ):
+        unknown = set(policies) - set(ARCHIVABLE)
+        if unknown:
+            raise ValueError(
+                f"No retention for table(s) {', '.join(sorted(unknown))}; "
+                f"expected {', '.join(ARCHIVABLE)}"
+            )
+        self.engine = engine
+        self.write = write
+        self.directory = os.path.expanduser(directory)
+        self.policies = dict(policies)
+        self.is_idle = is_idle or (lambda: True)
+        self.max_batches = max_batches
+        self.stats = {table: 0 for table in self.policies}
+
+    async def _candidates(self, table: str, cutoff: datetime, limit: int) -> dict[str, list[int]]:
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(sql_text(
+                f"SELECT t.id, strftime('%Y-%m', t.created_at) FROM {table} AS t "
+                f"WHERE t.created_at < :cutoff AND {ARCHIVABLE[table]} "
+                "ORDER BY t.created_at LIMIT :limit"
+            ), {"cutoff": cutoff.strftime("%Y-%m-%d %H:%M:%S"), "limit": limit})).all()
+        months: dict[str, list[int]] = {}
+        for row_id, month in rows:
+            months.setdefault(month, []).append(row_id)
+        return months
+
+    async def archive_batch(self, table: str, cutoff: datetime, limit: int) -> int:
+        """Archive up to ``limit`` eligible rows of ``table`` created before ``cutoff``.
+
+        Returns:
+            int: Rows removed from the live database.
+        """
+        moved = 0
+        for month, ids in (await self._candidates(table, cutoff, limit)).items():
+            path = archive_path(self.directory, month)
+            async with self.engine.connect() as conn:
+                copied = await conn.run_sync(_copy_to_archive, path, table, ids)
+            if copied:
+                moved += await self.write(_archived_mutation(table, copied))
+        return moved
+
+    async def run_once(self, now: Optional[datetime] = None) -> dict[str, int]:
+        """One retention round over every table with a policy.
+
+        Args:
+            now (datetime, optional): Reference time (naive UTC). Defaults to now.
+
+        Returns:
+            dict[str, int]: Rows archived per table.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        moved = {}
+        for table, policy in self.policies.items():
+            cutoff = now - timedelta(days=policy.max_age_days)
+            moved[table] = 0
+            for _ in range(self.max_batches):
+                if not self.is_idle():
+                    break
+                batch = await self.archive_batch(table, cutoff, policy.batch_size)
+                moved[table] += batch
+                if batch < policy.batch_size:
+                    break
+            self.stats[table] += moved[table]
+        if any(moved.values()):
+            logger.info(
+                "Archived " + ", ".join(f"{n} {table}" for table, n in moved.items() if n)
+            )
+        return moved
+
+
+def _search_one(conn, path: str, match: str, include_observations: bool, limit: int,
+                start: Optional[str], end: Optional[str]) -> list[dict]:
+    a = ARCHIVE_ALIAS
+    conn.exec_driver_sql(f"ATTACH DATABASE ? AS {a}", (path,))
+    try:
+        window = ""
+        params: dict = {"q": match, "limit": limit}
+        if start is not None:
+            window += " AND t.created_at >= :start"
+            params["start"] = start
+        if end is not None:
+            window += " AND t.created_at <= :end"
+            params["end"] = end
+        parts = [
+            f"SELECT 'proposition' AS kind, t.id, t.text, t.created_at, "
+            f"bm25(propositions_fts) AS score "
+            f"FROM {a}.propositions_fts JOIN {a}.propositions AS t "
+            f"ON t.id = propositions_fts.rowid "
+            f"WHERE propositions_fts MATCH :q{window}"
+        ]
+        if include_observations:
+            parts.append(
+                f"SELECT 'observation', t.id, t.content, t.created_at, "
+                f"bm25(observations_fts) "
+                f"FROM {a}.observations_fts JOIN {a}.observations AS t "
+                f"ON t.id = observations_fts.rowid "
+                f"WHERE observations_fts MATCH :q{window}"
+            )
+        rows = conn.exec_driver_sql(
+            " UNION ALL ".join(parts) + " ORDER BY score LIMIT :limit", params
+        ).all()
+        return [dict(row._mapping) for row in rows]
+    finally:
+        conn.exec_driver_sql(f"DETACH DATABASE {a}")
+
+
+async def search_archive(
+    engine: AsyncEngine,
+    directory: str,
+    user_query: str,
+    *,
+    limit: int = 10,
+    mode: str = "OR",
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    include_observations: bool = True,
+) -> list[dict]:
+    """Full-text search over archived propositions (and observations).
+
+    Each monthly archive overlapping the time window is attached in turn to
+    a connection of ``engine`` (the read-only pool works), searched with its
+    own FTS5 index and detached again.
+
+    Args:
+        engine (AsyncEngine): Engine whose connection attaches the archives.
+        directory (str): Where the archive files live.
+        user_query (str): Query text, as for :func:`~gum.db_utils.search_propositions_bm25`.
+        limit (int): Hits returned. Defaults to 10.
+        mode (str): "OR", "AND" or "PHRASE". Defaults to "OR".
+        start_time (datetime, optional): Earliest ``created_at`` (naive UTC).
+        end_time (datetime, optional): Latest ``created_at`` (naive UTC).
+        include_observations (bool): Search archived observations too. Defaults to True.
+
+    Returns:
+        list[dict]: Hits with ``kind`` ("proposition" or "observation"), ``id``,
+        ``text``, ``created_at``, ``score`` (BM25, lower is better) and
+        ``month``, best first.
+    """
+    match = build_fts_query(user_query, "OR" if mode == "HYBRID" else mode)
+    directory = os.path.expanduser(directory)
+    if not match:
+        return []
+    start = start_time.strftime("%Y-%m-%d %H:%M:%S") if start_time else None
+    end = end_time.strftime("%Y-%m-%d %H:%M:%S") if end_time else None
+    months = [
+        m for m in archive_months(directory)
+        if (start is None or m >= start[:7]) and (end is None or m <= end[:7])
+    ]
+
+    hits: list[dict] = []
+    async with engine.connect() as conn:
+        for month in reversed(months):
+            for hit in await conn.run_sync(
+                _search_one, archive_path(directory, month), match,
+                include_observations, limit, start, end,
+            ):
+                hit["month"] = month
+                hits.append(hit)
+    hits.sort(key=lambda h: h["score"])
+    return hits[:limit]
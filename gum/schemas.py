@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 from typing import List, Optional, Literal
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 
 class AuditSchema(BaseModel):
     """
@@ -41,6 +41,11 @@ class Update(BaseModel):
     content: str = Field(..., description="The content of the update")
     content_type: Literal["input_text", "input_image"] = Field(..., description="The type of the update")
 
+    # set by the ingest journal; used to acknowledge the update once committed
+    _journal_id: Optional[int] = PrivateAttr(default=None)
+    # set on updates replayed from the journal, whose observation may already exist
+    _replayed: bool = PrivateAttr(default=False)
+
 RelationLabel = Literal["IDENTICAL", "SIMILAR", "UNRELATED"]
 
 class RelationItem(BaseModel):
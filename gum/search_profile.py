@@ -0,0 +1,96 @@
+# search_profile.py
+
+from __future__ import annotations
+
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@dataclass
+class SearchProfile:
+    """Timings and plans collected by one profiled search.
+
+    Pass an instance as ``profile=`` to ``search_propositions_bm25``; it is
+    filled in place and the search results are returned as usual.
+
+    Attributes:
+        stages (dict[str, float]): Wall time per stage in milliseconds.
+        rows (dict[str, int]): Row counts per stage.
+        statements (list[dict]): Every SQL statement run, with its stage and time.
+        plan (list[str]): ``EXPLAIN QUERY PLAN`` of the candidate query, indented by depth.
+        strategy (str, optional): "range" or "fts", as chosen by ``plan_time_window``.
+    """
+
+    stages: dict[str, float] = field(default_factory=dict)
+    rows: dict[str, int] = field(default_factory=dict)
+    statements: list[dict[str, Any]] = field(default_factory=list)
+    plan: list[str] = field(default_factory=list)
+    strategy: Optional[str] = None
+    _current: Optional[str] = field(default=None, repr=False)
+    _candidate_sql: Optional[tuple[str, Any]] = field(default=None, repr=False)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as ``name``; statements run inside are tagged with it."""
+        previous, self._current = self._current, name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            self._current = previous
+
+    @asynccontextmanager
+    async def capture(self, session: AsyncSession):
+        """Record the statements ``session`` executes while the block runs."""
+        conn = (await session.connection()).sync_connection
+        started: list[float] = []
+
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            started.append(time.perf_counter())
+
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            elapsed = (time.perf_counter() - started.pop()) * 1000
+            self.statements.append({
+                "stage": self._current,
+                "sql": " ".join(statement.split())[:300],
+                "ms": round(elapsed, 3),
+            })
+            if self._current == "candidates" and self._candidate_sql is None:
+                self._candidate_sql = (statement, parameters)
+
+        event.listen(conn, "before_cursor_execute", _before)
+        event.listen(conn, "after_cursor_execute", _after)
+        try:
+            yield self
+        finally:
+            event.remove(conn, "before_cursor_execute", _before)
+            event.remove(conn, "after_cursor_execute", _after)
+
+    async def explain(self, session: AsyncSession) -> None:
+        """Fill :attr:`plan` for the first statement of the "candidates" stage."""
+        if self._candidate_sql is None:
+            return
+        statement, parameters = self._candidate_sql
+        conn = await session.connection()
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        depth: dict[int, int] = {0: -1}
+        for node_id, parent, _unused, detail in result.all():
+            depth[node_id] = depth.get(parent, -1) + 1
+            self.plan.append("  " * depth[node_id] + detail)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "stages_ms": {k: round(v, 3) for k, v in self.stages.items()},
+            "total_ms": round(sum(self.stages.values()), 3),
+            "rows": dict(self.rows),
+            "statements": list(self.statements),
+            "plan": list(self.plan),
+            "strategy": self.strategy,
+        }
@@ -19,7 +19,7 @@ import logging
 import time
 import uuid
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional, Dict, Any, AsyncIterator
+from typing import List, Optional, Dict, Any, AsyncIterator, Awaitable, Callable
 from contextlib import asynccontextmanager
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -28,7 +28,9 @@ from sqlalchemy.orm import selectinload
 
 # Import existing GUM components
 from ..db_utils import search_propositions_bm25
+from ..embeddings import get_default_index
 from ..models import Proposition, Observation
+from ..structured_output import decode_json
 from ..suggestion_models import (
     SuggestionData, SuggestionBatch, UtilityScores, 
     ContextualProposition, ContextRetrievalResult,
@@ -163,8 +165,14 @@ class GumboEngine:
     rate limiting, and real-time delivery capabilities.
     """
     
-    def __init__(self):
-        """Initialize the Gumbo engine."""
+    def __init__(self, write: Optional[Callable[..., Awaitable[Any]]] = None):
+        """Initialize the Gumbo engine.
+
+        Args:
+            write: ``write`` of the running gum instance; suggestion saves are
+                submitted through it so they share its single writer task.
+        """
+        self.write = write
         self.rate_limiter = None
         self.ai_client = None
         self._active_sse_connections: set = set()
@@ -368,12 +376,14 @@ class GumboEngine:
             semantic_query = semantic_query.strip().strip('"').strip("'")
             logger.info(f"🔍 Generated semantic query: '{semantic_query}'")
             
-            # Search for related propositions using BM25
+            # BM25, fused with dense neighbours when an embedding index is
+            # configured; that recalls enough from a smaller pool, while plain
+            # OR (no index) keeps the wider one
             search_results = await search_propositions_bm25(
                 session,
                 semantic_query,
-                mode="OR",
-                limit=20,
+                mode="HYBRID",
+                limit=10 if get_default_index() is not None else 20,
                 include_observations=False,
                 enable_mmr=True,
                 enable_decay=True
@@ -589,34 +599,12 @@ class GumboEngine:
             return fallback_suggestions
     
     def _parse_json_response(self, response: str, expected_key: str) -> Dict[str, Any]:
-        """Parse JSON response from LLM with error handling."""
-        try:
-            # Clean up the response
-            response = response.strip()
-            
-            # Try to find JSON in the response
-            start_idx = response.find('{')
-            end_idx = response.rfind('}')
-            
-            if start_idx >= 0 and end_idx >= 0:
-                json_str = response[start_idx:end_idx+1]
-                data = json.loads(json_str)
-                
-                if expected_key in data:
-                    return data
-                else:
-                    logger.warning(f"Expected key '{expected_key}' not found in response")
-                    return {expected_key: []}
-            else:
-                logger.error("No valid JSON found in LLM response")
-                return {expected_key: []}
-                
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {e}")
-            return {expected_key: []}
-        except Exception as e:
-            logger.error(f"Unexpected error parsing response: {e}")
-            return {expected_key: []}
+        """Parse JSON response from LLM, falling back to an empty list under ``expected_key``."""
+        data = decode_json(response)
+        if isinstance(data, dict) and expected_key in data:
+            return data
+        logger.warning(f"Expected key '{expected_key}' not found in response")
+        return {expected_key: []}
     
     def _update_metrics(self, batch: SuggestionBatch):
         """Update internal metrics tracking."""
@@ -640,15 +628,14 @@ class GumboEngine:
         """Save suggestions directly to database (replaced HTTP broadcast)."""
         logger.info(f"🚨 GUMBO SAVING SUGGESTIONS DIRECTLY TO DATABASE: {len(event.data.get('suggestions', []))} suggestions")
         
+        if self.write is None:
+            logger.warning("GumboEngine has no gum writer attached; suggestions not saved")
+            return
+
         try:
-            # Save suggestions directly to database (same pattern as controller)
-            from gum.gum import gum
-            gum_inst = gum()
-            await gum_inst.connect_db()
-            
-            async with gum_inst._session() as session:
-                from gum.models import Suggestion
-                
+            from gum.models import Suggestion
+
+            async def _save_suggestions(session):
                 # Save each suggestion directly to database
                 suggestions_saved = 0
                 for suggestion_data in event.data.get("suggestions", []):
@@ -665,9 +652,10 @@ class GumboEngine:
                     )
                     session.add(suggestion)
                     suggestions_saved += 1
-                
-                await session.commit()
-                logger.info(f"💾 GUMBO SAVED {suggestions_saved} SUGGESTIONS DIRECTLY TO DATABASE")
+                return suggestions_saved
+
+            suggestions_saved = await self.write(_save_suggestions)
+            logger.info(f"💾 GUMBO SAVED {suggestions_saved} SUGGESTIONS DIRECTLY TO DATABASE")
                 
         except Exception as e:
             logger.error(f"❌ GUMBO FAILED TO SAVE SUGGESTIONS: {e}")
@@ -724,31 +712,42 @@ class GumboEngine:
 _global_engine: Optional[GumboEngine] = None
 
 
-async def get_gumbo_engine() -> GumboEngine:
+async def get_gumbo_engine(write: Optional[Callable] = None) -> GumboEngine:
     """
     Get the global Gumbo engine instance.
     
+    Args:
+        write: ``write`` of the running gum instance to save suggestions
+            through; replaces the one attached earlier when given.
+
     Returns:
         Initialized GumboEngine instance
     """
     global _global_engine
     
     if _global_engine is None:
-        _global_engine = GumboEngine()
+        _global_engine = GumboEngine(write)
         await _global_engine.start()
+    elif write is not None:
+        _global_engine.write = write
     
     return _global_engine
 
 
-async def trigger_gumbo_suggestions(proposition_id: int, session: AsyncSession) -> Optional[SuggestionBatch]:
+async def trigger_gumbo_suggestions(
+    proposition_id: int,
+    session: AsyncSession,
+    write: Optional[Callable] = None,
+) -> Optional[SuggestionBatch]:
     """
     Convenience function to trigger Gumbo suggestions.
     
     This is the main entry point called from gum/gum.py when a high-confidence
-    proposition is created.
+    proposition is created; it passes its own ``write`` so the suggestions are
+    saved by the same writer task.
     """
     try:
-        engine = await get_gumbo_engine()
+        engine = await get_gumbo_engine(write)
         return await engine.trigger_gumbo_suggestions(proposition_id, session)
     except Exception as e:
         logger.error(f"Failed to trigger Gumbo suggestions: {e}")
@@ -0,0 +1,260 @@
+# storage.py
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from .models import apply_sqlite_profile, register_sql_functions, resolve_sqlite_profile
+
+logger = logging.getLogger("gum.storage")
+
+T = TypeVar("T")
+Mutation = Callable[[AsyncSession], Awaitable[T]]
+Operation = Callable[[AsyncConnection], Awaitable[T]]
+
+
+def _configure_reader(dbapi_connection, settings: dict) -> None:
+    register_sql_functions(dbapi_connection)
+    apply_sqlite_profile(dbapi_connection, settings)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only = ON")
+    cursor.execute("PRAGMA busy_timeout = 30000")
+    cursor.close()
+
+
+def create_reader(engine: AsyncEngine, pool_size: int = 4, sqlite_profile: Optional[str] = None):
+    """Open a pool of read-only connections to the database behind ``engine``.
+
+    In WAL mode readers never wait for the writer, so listing and search
+    requests served from this pool are not stuck behind ingest commits.
+    Connections run with ``PRAGMA query_only`` and sessions carry
+    ``info["read_only"]`` so helpers can skip opportunistic writes.
+
+    Args:
+        engine (AsyncEngine): Read-write engine from ``init_db``.
+        pool_size (int): Connections kept open. Defaults to 4.
+        sqlite_profile (str, optional): PRAGMA profile, as for ``init_db``.
+
+    Returns:
+        tuple[AsyncEngine, async_sessionmaker]: The reader engine and its session factory.
+    """
+    reader = create_async_engine(
+        engine.url,
+        connect_args={"timeout": 30, "isolation_level": None},
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    settings = resolve_sqlite_profile(sqlite_profile)
+    event.listen(
+        reader.sync_engine,
+        "connect",
+        lambda dbapi_connection, _record: _configure_reader(dbapi_connection, settings),
+    )
+    ReadSession = async_sessionmaker(
+        reader,
+        expire_on_commit=False,
+        autoflush=False,
+        info={"read_only": True},
+    )
+    return reader, ReadSession
+
+
+class SQLiteWriter:
+    """Single task that applies every write, committing queued mutations together.
+
+    A mutation is an ``async def (session) -> result``. The writer takes all
+    mutations queued while the previous commit ran (up to ``max_batch``),
+    opens one ``BEGIN IMMEDIATE`` transaction, runs each inside its own
+    savepoint and commits once, so a burst of small writes costs one WAL
+    sync and never contends for the write lock. A mutation that raises is
+    rolled back to its savepoint and only its caller sees the exception.
+
+    Statements that cannot share that transaction (WAL checkpoints, FTS5
+    merges, ``PRAGMA optimize``, incremental vacuum) go through
+    :meth:`run_exclusive` instead, which runs them on the writer task
+    between two batches, so they never compete with a batch for the lock.
+
+    Mutations must not submit further mutations (they would wait on
+    themselves) and should not await anything slow: every write queues
+    behind them.
+
+    Args:
+        Session (async_sessionmaker): Read-write session factory from ``init_db``.
+        max_batch (int): Mutations per commit. Defaults to 64.
+        max_wait_ms (float): Extra time to wait for company after the first
+            mutation of a batch arrives. Defaults to 0 (batch only what queued
+            up during the previous commit).
+        on_commit (Callable[[], Any], optional): Called after each batch or
+            exclusive operation has committed, before any caller is woken,
+            e.g. to invalidate cached reads.
+    """
+
+    def __init__(
+        self,
+        Session: async_sessionmaker,
+        *,
+        max_batch: int = 64,
+        max_wait_ms: float = 0.0,
+        on_commit: Optional[Callable[[], Any]] = None,
+    ):
+        self.Session = Session
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.on_commit = on_commit
+        self.stats = {"batches": 0, "mutations": 0, "failed": 0, "largest_batch": 0, "commit_ms": 0.0}
+        # (callable, future, exclusive)
+        self._queue: asyncio.Queue[tuple[Callable, asyncio.Future, bool]] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self._closed:
+            raise RuntimeError("SQLiteWriter has been stopped")
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def submit(self, mutation: Mutation[T]) -> T:
+        """Queue ``mutation`` and wait until its batch is committed.
+
+        Returns:
+            Whatever ``mutation`` returned.
+
+        Raises:
+            RuntimeError: If the writer has been stopped.
+        """
+        return await self._enqueue(mutation, exclusive=False)
+
+    async def run_exclusive(self, operation: Operation[T]) -> T:
+        """Run ``operation`` on the writer task, outside any batch transaction.
+
+        The connection it receives is in autocommit mode and no batch is open
+        while it runs, so it may checkpoint, vacuum or commit step by step.
+
+        Returns:
+            Whatever ``operation`` returned.
+
+        Raises:
+            RuntimeError: If the writer has been stopped.
+        """
+        return await self._enqueue(operation, exclusive=True)
+
+    async def _enqueue(self, item: Callable, exclusive: bool):
+        self.start()
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, fut, exclusive))
+        return await fut
+
+    async def stop(self) -> None:
+        """Apply what is queued, then stop the task. Later submissions raise."""
+        self._closed = True
+        if self._task is None:
+            return
+        if self.running:
+            await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if self.max_wait_ms:
+                await asyncio.sleep(self.max_wait_ms / 1000)
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                # keep queue order: exclusive operations split the batch
+                for exclusive, items in itertools.groupby(batch, key=lambda item: item[2]):
+                    group = [(item, fut) for item, fut, _exclusive in items]
+                    try:
+                        if exclusive:
+                            for operation, fut in group:
+                                await self._apply_exclusive(operation, fut)
+                        else:
+                            await self._apply(group)
+                    except Exception as e:
+                        logger.error(f"Write batch of {len(group)} failed: {e}")
+                        for _item, fut in group:
+                            if not fut.done():
+                                fut.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _apply_exclusive(self, operation: Operation, fut: asyncio.Future) -> None:
+        if fut.done():      # caller gave up
+            return
+        async with self.Session() as session:
+            conn = await session.connection()
+            try:
+                value = await operation(conn)
+            except Exception as e:
+                fut.set_exception(e)
+                return
+            finally:
+                # autocommit: whatever the operation wrote is committed by now
+                if self.on_commit is not None:
+                    self.on_commit()
+        if not fut.done():
+            fut.set_result(value)
+
+    async def _apply(self, batch: list[tuple[Mutation, asyncio.Future]]) -> None:
+        outcomes: list[tuple[asyncio.Future, bool, Any]] = []
+        started = time.perf_counter()
+        async with self.Session() as session:
+            conn = await session.connection()
+            # the driver runs in autocommit mode; take the write lock up front
+            await conn.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                for mutation, fut in batch:
+                    if fut.done():      # caller gave up
+                        continue
+                    try:
+                        async with session.begin_nested():
+                            value = await mutation(session)
+                    except Exception as e:
+                        outcomes.append((fut, False, e))
+                    else:
+                        outcomes.append((fut, True, value))
+                await session.commit()
+            except BaseException:
+                await session.rollback()
+                raise
+        if self.on_commit is not None:
+            self.on_commit()
+
+        self.stats["batches"] += 1
+        self.stats["mutations"] += len(outcomes)
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(outcomes))
+        self.stats["commit_ms"] += (time.perf_counter() - started) * 1000
+        for fut, ok, value in outcomes:
+            if fut.done():
+                continue
+            if ok:
+                fut.set_result(value)
+            else:
+                self.stats["failed"] += 1
+                fut.set_exception(value)
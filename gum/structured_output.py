@@ -0,0 +1,236 @@
+# structured_output.py
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Optional, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from .schemas import get_schema
+
+logger = logging.getLogger("gum.structured_output")
+
+T = TypeVar("T", bound=BaseModel)
+
+_CLOSERS = {"{": "}", "[": "]"}
+_MAX_STARTS = 8
+
+# Process-wide counters; read them with get_parse_stats().
+_STATS: dict[str, int] = {
+    "parsed": 0,          # responses that produced a JSON value
+    "direct": 0,          # ... straight from json.loads
+    "fenced": 0,          # wrapped in a ``` code block
+    "extracted": 0,       # surrounded by prose
+    "truncated": 0,       # cut off mid-value and closed again
+    "trailing_commas": 0, # dangling commas dropped
+    "failed": 0,          # no JSON value could be recovered
+    "invalid": 0,         # decoded, but did not match the schema
+    "dropped_items": 0,   # list items discarded during salvage
+}
+
+
+def get_parse_stats() -> dict[str, int]:
+    """Snapshot of the structured-output repair counters."""
+    return dict(_STATS)
+
+
+def reset_parse_stats() -> None:
+    for key in _STATS:
+        _STATS[key] = 0
+
+
+def response_format_for(schema: Type[BaseModel]) -> dict:
+    """``response_format`` payload asking the provider for ``schema``-shaped JSON."""
+    return get_schema(schema.model_json_schema())
+
+
+def _strip_fence(text: str) -> tuple[str, bool]:
+    start = text.find("```")
+    if start < 0:
+        return text, False
+    body = text[start + 3:]
+    if body[:4].lower() == "json":
+        body = body[4:]
+    end = body.find("```")
+    return (body if end < 0 else body[:end]), True
+
+
+def _first_open(text: str, pos: int = 0) -> int:
+    return min((i for i in (text.find("{", pos), text.find("[", pos)) if i >= 0), default=-1)
+
+
+def _scan(text: str, start: int) -> tuple[Optional[str], set[str]]:
+    """Copy the JSON object/array starting at ``text[start]`` in one pass.
+
+    Dangling commas are dropped on the way. If the text ends before the value
+    is closed, the copy is cut back to the last complete element and the open
+    containers are closed.
+
+    Returns:
+        tuple[Optional[str], set[str]]: The JSON text (or None) and the repairs applied.
+    """
+    repairs: set[str] = set()
+    out: list[str] = []
+    stack: list[str] = []
+    # (length of ``out``, open containers) at the last point where the copy
+    # could be closed into valid JSON
+    safe: tuple[int, tuple[str, ...]] = (0, ())
+    in_string = escaped = pending_comma = False
+
+    for ch in text[start:]:
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch in " \t\r\n":
+            continue
+
+        if pending_comma:
+            pending_comma = False
+            if ch in "}]":
+                repairs.add("trailing_commas")
+            else:
+                out.append(",")
+
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in "{[":
+            stack.append(ch)
+            out.append(ch)
+            # an empty list is a fine stand-in; an empty nested object is not
+            if ch == "[" or len(stack) == 1:
+                safe = (len(out), tuple(stack))
+        elif ch in "}]":
+            if not stack or _CLOSERS[stack[-1]] != ch:
+                break
+            stack.pop()
+            out.append(ch)
+            if not stack:
+                return "".join(out), repairs
+            safe = (len(out), tuple(stack))
+        elif ch == ",":
+            safe = (len(out), tuple(stack))
+            pending_comma = True
+        else:
+            out.append(ch)
+
+    # ran out of text with containers still open
+    length, open_stack = safe
+    if not open_stack:
+        return None, repairs
+    repairs.add("truncated")
+    closing = "".join(_CLOSERS[c] for c in reversed(open_stack))
+    return "".join(out[:length]) + closing, repairs
+
+
+def decode_json(text: str) -> Any:
+    """Decode the JSON value in an LLM response, repairing it if necessary.
+
+    Handles markdown fences, surrounding prose, dangling commas and output that
+    was cut off by the token limit.
+
+    Args:
+        text (str): Raw response content.
+
+    Returns:
+        Any: The decoded value, or None if nothing could be recovered.
+    """
+    text = (text or "").strip()
+    try:
+        value = json.loads(text)
+        _STATS["parsed"] += 1
+        _STATS["direct"] += 1
+        return value
+    except json.JSONDecodeError:
+        pass
+
+    body, fenced = _strip_fence(text)
+    start = _first_open(body)
+    # a bracket in leading prose ("[note]") is not the payload; try the next one
+    for _ in range(_MAX_STARTS):
+        if start < 0:
+            break
+        candidate, repairs = _scan(body, start)
+        if candidate is not None:
+            try:
+                value = json.loads(candidate)
+            except json.JSONDecodeError:
+                pass
+            else:
+                _STATS["parsed"] += 1
+                _STATS["fenced" if fenced else "extracted"] += 1
+                for repair in repairs:
+                    _STATS[repair] += 1
+                return value
+        start = _first_open(body, start + 1)
+
+    _STATS["failed"] += 1
+    logger.warning(f"No JSON found in model response ({len(text)} chars)")
+    logger.debug(f"Unparseable response: {text[:500]}")
+    return None
+
+
+def _list_field(schema: Type[BaseModel]) -> Optional[tuple[str, Type[BaseModel]]]:
+    """``(name, item model)`` if ``schema`` is a single list-of-models field."""
+    if len(schema.model_fields) != 1:
+        return None
+    name, info = next(iter(schema.model_fields.items()))
+    args = getattr(info.annotation, "__args__", ())
+    if len(args) == 1 and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+        return name, args[0]
+    return None
+
+
+def parse_structured(text: str, schema: Type[T]) -> Optional[T]:
+    """Decode an LLM response and validate it against ``schema``.
+
+    Bare lists are wrapped for single-list schemas such as ``PropositionSchema``
+    and ``RelationSchema``; if such a list contains invalid items they are
+    dropped instead of failing the whole response.
+
+    Args:
+        text (str): Raw response content.
+        schema (Type[BaseModel]): Pydantic model the response should match.
+
+    Returns:
+        Optional[BaseModel]: The validated model, or None.
+    """
+    value = decode_json(text)
+    if value is None:
+        return None
+
+    list_field = _list_field(schema)
+    if list_field is not None and isinstance(value, list):
+        value = {list_field[0]: value}
+
+    try:
+        return schema.model_validate(value)
+    except ValidationError as e:
+        if list_field is None or not isinstance(value, dict):
+            _STATS["invalid"] += 1
+            logger.warning(f"Response does not match {schema.__name__}: {e.error_count()} error(s)")
+            return None
+
+    name, item_model = list_field
+    items = value.get(name)
+    if not isinstance(items, list):
+        _STATS["invalid"] += 1
+        logger.warning(f"Response does not match {schema.__name__}: missing '{name}' list")
+        return None
+
+    kept = []
+    for item in items:
+        try:
+            kept.append(item_model.model_validate(item))
+        except ValidationError:
+            _STATS["dropped_items"] += 1
+    return schema(**{name: kept})
@@ -12,7 +12,8 @@ import re
 import json
 import asyncio
 import logging
-from typing import List, Dict, Any, Tuple, Set, Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 from datetime import datetime, timezone
 from dataclasses import dataclass
 from collections import defaultdict, Counter
@@ -23,6 +24,7 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
 from gum.models import Proposition
+from gum.mmr import mmr_select
 
 logger = logging.getLogger(__name__)
 
@@ -110,6 +112,7 @@ class BundleCreator:
         # Get high-confidence facts (anchor propositions)
         facts_stmt = (
             select(Proposition)
+            .where(Proposition.is_leaf)
             .where(Proposition.confidence >= 8)
             .order_by(desc(Proposition.confidence), desc(Proposition.created_at))
             .limit(30)  # Get more facts than bundles to ensure diversity
@@ -120,6 +123,7 @@ class BundleCreator:
         # Get medium and low confidence inferences
         inferences_stmt = (
             select(Proposition)
+            .where(Proposition.is_leaf)
             .where(Proposition.confidence.between(3, 7))
             .order_by(desc(Proposition.created_at))
             .limit(200)  # Get large pool of inferences
@@ -271,6 +275,24 @@ class SuggestionDeduplicator:
             stop_words='english',
             ngram_range=(1, 2)
         )
+        self._fitted: Optional[Tuple[Dict[str, int], Any]] = None
+    
+    def _tfidf(self, suggestions: List[ScoredSuggestion]):
+        """L2-normalised TF-IDF rows, reusing the last fit when it covers every text.
+
+        ``select_diverse_suggestions`` runs on a subset of what was just
+        deduplicated, so its rows come from the same fit instead of a refit.
+        Those rows keep the superset's vocabulary and IDF weights, so MMR
+        similarities on the subset can differ slightly from a fresh fit on it.
+        """
+        texts = [f"{sugg.title} {sugg.description}" for sugg in suggestions]
+        if self._fitted is not None:
+            index, matrix = self._fitted
+            if all(text in index for text in texts):
+                return matrix[[index[text] for text in texts]]
+        matrix = self.vectorizer.fit_transform(texts)
+        self._fitted = ({text: i for i, text in enumerate(texts)}, matrix)
+        return matrix
     
     def deduplicate_suggestions(self, suggestions: List[ScoredSuggestion], 
                               similarity_threshold: float = 0.92) -> List[ScoredSuggestion]:
@@ -279,12 +301,9 @@ class SuggestionDeduplicator:
         if len(suggestions) <= 1:
             return suggestions
         
-        # Create text representations for similarity comparison
-        texts = [f"{sugg.title} {sugg.description}" for sugg in suggestions]
-        
         try:
             # Calculate TF-IDF embeddings
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
+            tfidf_matrix = self._tfidf(suggestions)
             
             # Calculate pairwise similarities
             similarities = cosine_similarity(tfidf_matrix)
@@ -344,48 +363,9 @@ class SuggestionDeduplicator:
         """Apply Modified Maximal Marginal Relevance for diversity."""
         
         try:
-            # Create text representations
-            texts = [f"{sugg.title} {sugg.description}" for sugg in suggestions]
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
-            
-            selected = []
-            remaining = list(range(len(suggestions)))
-            
-            # Select first suggestion (highest priority)
-            if remaining:
-                first_idx = max(remaining, key=lambda i: suggestions[i].priority)
-                selected.append(first_idx)
-                remaining.remove(first_idx)
-            
-            # Select remaining suggestions using MMR
-            while len(selected) < k and remaining:
-                best_score = -float('inf')
-                best_idx = None
-                
-                for i in remaining:
-                    # Relevance score (priority)
-                    relevance = suggestions[i].priority
-                    
-                    # Diversity score (minimum similarity to selected)
-                    if selected:
-                        similarities = [cosine_similarity(tfidf_matrix[i], tfidf_matrix[j])[0][0] for j in selected]
-                        max_similarity = max(similarities)
-                    else:
-                        max_similarity = 0
-                    
-                    # MMR score
-                    mmr_score = lambda_param * relevance - (1 - lambda_param) * max_similarity
-                    
-                    if mmr_score > best_score:
-                        best_score = mmr_score
-                        best_idx = i
-                
-                if best_idx is not None:
-                    selected.append(best_idx)
-                    remaining.remove(best_idx)
-                else:
-                    break
-            
+            tfidf_matrix = self._tfidf(suggestions)
+            priorities = np.array([sugg.priority for sugg in suggestions], dtype=float)
+            selected = mmr_select(priorities, tfidf_matrix, k, lambda_param)
             return [suggestions[i] for i in selected]
             
         except Exception as e:
@@ -575,8 +555,13 @@ class EnhancedSuggestionEngine:
         self.scorer = UtilityScorer()
     
     async def generate_suggestions(self, session, ai_client, user_name: str = "User", 
-                                 max_suggestions: int = 8) -> List[Dict[str, Any]]:
-        """Generate enhanced suggestions using the bundle-aware system."""
+                                 max_suggestions: int = 8,
+                                 write: Optional[Callable[..., Awaitable[Any]]] = None) -> List[Dict[str, Any]]:
+        """Generate enhanced suggestions using the bundle-aware system.
+
+        ``write`` is the running gum instance's ``write``; the suggestions are
+        saved through it (and not saved at all without it).
+        """
         
         try:
             # Step 1: Create proposition bundles
@@ -640,18 +625,13 @@ class EnhancedSuggestionEngine:
             logger.info(f"Returning {len(api_suggestions)} final enhanced suggestions")
             
             # Save suggestions to database so frontend can display them
-            try:
-                # Save suggestions directly to database (same pattern as controller)
+            if write is None:
+                logger.warning("No gum writer given; suggestions not saved")
+            else:
                 try:
-                    # Get database session
-                    from gum.gum import gum
-                    gum_inst = gum(user_name=user_name)
-                    await gum_inst.connect_db()
-                    
-                    async with gum_inst._session() as session:
-                        from gum.models import Suggestion
-                        
-                        # Save each suggestion directly to database
+                    from gum.models import Suggestion
+
+                    async def _save_suggestions(session):
                         suggestions_saved = 0
                         for suggestion_data in api_suggestions:
                             suggestion = Suggestion(
@@ -667,14 +647,12 @@ class EnhancedSuggestionEngine:
                             )
                             session.add(suggestion)
                             suggestions_saved += 1
-                        
-                        await session.commit()
-                        logger.info(f"💾 SAVED {suggestions_saved} SUGGESTIONS DIRECTLY TO DATABASE")
-                        
+                        return suggestions_saved
+
+                    suggestions_saved = await write(_save_suggestions)
+                    logger.info(f"💾 SAVED {suggestions_saved} SUGGESTIONS DIRECTLY TO DATABASE")
                 except Exception as save_error:
                     logger.error(f"❌ FAILED TO SAVE SUGGESTIONS TO DATABASE: {save_error}")
-            except Exception as save_error:
-                logger.error(f"❌ FAILED TO SAVE SUGGESTIONS TO DATABASE: {save_error}")
             
             return api_suggestions
             
@@ -0,0 +1,236 @@
+# term_vectors.py
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Observation, Proposition, observation_proposition, proposition_vectors
+
+N_FEATURES = 2 ** 18
+MAX_OBSERVATIONS = 10   # observations folded into a proposition's vector
+
+# Same tokenisation as TfidfVectorizer's defaults; raw counts so that the text
+# and observation parts can be summed and re-weighted at query time.
+_vectorizer = HashingVectorizer(
+    n_features=N_FEATURES,
+    alternate_sign=False,
+    norm=None,
+)
+
+
+def _counts(docs: list[str]) -> sparse.csr_matrix:
+    return _vectorizer.transform(docs).astype(np.float32).tocsr()
+
+
+def _encode(row: sparse.csr_matrix) -> tuple[bytes, bytes]:
+    return row.indices.astype(np.int32).tobytes(), row.data.astype(np.float32).tobytes()
+
+
+def _decode(indices: bytes, counts: bytes) -> tuple[np.ndarray, np.ndarray]:
+    return np.frombuffer(indices, dtype=np.int32), np.frombuffer(counts, dtype=np.float32)
+
+
+async def refresh_term_vectors(
+    session: AsyncSession,
+    proposition_ids: Iterable[int],
+    *,
+    force: bool = False,
+) -> int:
+    """(Re)compute the stored term counts of the given propositions.
+
+    A proposition's vector covers its text, its reasoning and its first
+    ``MAX_OBSERVATIONS`` observations (by id), so once that many are linked the
+    vector is final and it is skipped unless ``force`` is set.
+
+    Args:
+        session (AsyncSession): Session whose transaction receives the writes.
+        proposition_ids (Iterable[int]): Propositions whose links or text changed.
+        force (bool): Recompute complete vectors too.
+
+    Returns:
+        int: Number of vectors written.
+    """
+    ids = set(proposition_ids)
+    if not ids:
+        return 0
+
+    if not force:
+        complete = await session.execute(
+            select(proposition_vectors.c.proposition_id)
+            .where(proposition_vectors.c.proposition_id.in_(ids))
+            .where(proposition_vectors.c.obs_count >= MAX_OBSERVATIONS)
+        )
+        ids -= set(complete.scalars())
+        if not ids:
+            return 0
+
+    rows = await _vector_rows(session, ids)
+    if rows:
+        await session.execute(insert(proposition_vectors).prefix_with("OR REPLACE"), rows)
+    return len(rows)
+
+
+async def _vector_rows(session: AsyncSession, ids: set[int]) -> list[dict]:
+    """``proposition_vectors`` rows for ``ids``, computed from the current text and links."""
+    props = (await session.execute(
+        select(Proposition.id, Proposition.text, Proposition.reasoning)
+        .where(Proposition.id.in_(ids))
+        .order_by(Proposition.id)
+    )).all()
+    if not props:
+        return []
+
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=observation_proposition.c.proposition_id,
+            order_by=observation_proposition.c.observation_id,
+        )
+        .label("rank")
+    )
+    linked = (
+        select(
+            observation_proposition.c.proposition_id.label("pid"),
+            observation_proposition.c.observation_id.label("oid"),
+            rank,
+        )
+        .where(observation_proposition.c.proposition_id.in_(ids))
+        .subquery()
+    )
+    obs_text: dict[int, list[str]] = {}
+    # full_content, so that bodies in cold storage are decompressed; only
+    # for the observations that make it into the vector
+    for pid, content in await session.execute(
+        select(linked.c.pid, Observation.full_content)
+        .join(Observation, Observation.id == linked.c.oid)
+        .where(linked.c.rank <= MAX_OBSERVATIONS)
+        .order_by(linked.c.pid, linked.c.rank)
+    ):
+        obs_text.setdefault(pid, []).append(content)
+
+    text_vecs = _counts([f"{p.text} {p.reasoning}" for p in props])
+    obs_vecs = _counts([" ".join(obs_text.get(p.id, ())) for p in props])
+
+    rows = []
+    for i, p in enumerate(props):
+        text_idx, text_cnt = _encode(text_vecs[i])
+        obs_idx, obs_cnt = _encode(obs_vecs[i])
+        rows.append({
+            "proposition_id": p.id,
+            "text_indices": text_idx,
+            "text_counts": text_cnt,
+            "obs_indices": obs_idx,
+            "obs_counts": obs_cnt,
+            "obs_count": len(obs_text.get(p.id, ())),
+        })
+    return rows
+
+
+async def load_term_counts(
+    session: AsyncSession,
+    proposition_ids: list[int],
+    *,
+    include_observations: bool = True,
+) -> sparse.csr_matrix:
+    """Raw hashed term counts for ``proposition_ids``, one row each.
+
+    Missing vectors are computed once and stored; on a read-only session
+    (``session.info["read_only"]``) they are computed but not stored.
+
+    Args:
+        session (AsyncSession): Open session.
+        proposition_ids (list[int]): Row order of the returned matrix.
+        include_observations (bool): Add the linked observations' terms.
+
+    Returns:
+        scipy.sparse.csr_matrix: Matrix of shape ``(len(proposition_ids), N_FEATURES)``.
+    """
+    cols = proposition_vectors.c
+    query = select(
+        cols.proposition_id,
+        cols.text_indices, cols.text_counts,
+        cols.obs_indices, cols.obs_counts,
+    ).where(cols.proposition_id.in_(proposition_ids))
+
+    stored = {row[0]: row[1:] for row in await session.execute(query)}
+    missing = [pid for pid in proposition_ids if pid not in stored]
+    if missing and session.info.get("read_only"):
+        stored.update(
+            (row["proposition_id"], (
+                row["text_indices"], row["text_counts"], row["obs_indices"], row["obs_counts"]
+            ))
+            for row in await _vector_rows(session, set(missing))
+        )
+    elif missing and await refresh_term_vectors(session, missing, force=True):
+        stored.update(
+            (row[0], row[1:])
+            for row in await session.execute(query.where(cols.proposition_id.in_(missing)))
+        )
+
+    indptr = [0]
+    indices: list[np.ndarray] = []
+    data: list[np.ndarray] = []
+    for pid in proposition_ids:
+        parts = stored.get(pid)
+        nnz = indptr[-1]
+        if parts is not None:
+            pairs = [(parts[0], parts[1])]
+            if include_observations:
+                pairs.append((parts[2], parts[3]))
+            for raw_idx, raw_cnt in pairs:
+                idx, cnt = _decode(raw_idx, raw_cnt)
+                indices.append(idx)
+                data.append(cnt)
+                nnz += len(idx)
+        indptr.append(nnz)
+
+    matrix = sparse.csr_matrix(
+        (
+            np.concatenate(data) if data else np.zeros(0, np.float32),
+            np.concatenate(indices) if indices else np.zeros(0, np.int32),
+            np.asarray(indptr),
+        ),
+        shape=(len(proposition_ids), N_FEATURES),
+    )
+    matrix.sum_duplicates()
+    return matrix
+
+
+def tfidf_rows(counts: sparse.csr_matrix) -> sparse.csr_matrix:
+    """TF-IDF weight and L2-normalise count rows.
+
+    IDF is taken over the given rows only, which is what fitting a
+    ``TfidfVectorizer`` on the same documents would do.
+    """
+    matrix = counts.astype(np.float32)
+    # smooth idf, as in TfidfVectorizer(smooth_idf=True)
+    n = matrix.shape[0]
+    df = np.bincount(matrix.indices, minlength=N_FEATURES)
+    idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+    matrix.data *= idf[matrix.indices].astype(np.float32)
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+async def load_term_matrix(
+    session: AsyncSession,
+    proposition_ids: list[int],
+    *,
+    include_observations: bool = True,
+) -> sparse.csr_matrix:
+    """TF-IDF weighted, L2-normalised vectors for ``proposition_ids``, one row each.
+
+    See :func:`load_term_counts` and :func:`tfidf_rows`; no text is tokenised.
+    """
+    counts = await load_term_counts(
+        session, proposition_ids, include_observations=include_observations
+    )
+    return tfidf_rows(counts)
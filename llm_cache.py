@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache
+
+Two-tier cache for deterministic completions: an in-memory LRU in front of an
+SQLite file with a TTL and an entry cap. Keys are hashes of the provider, the
+model and the full request, so only byte-identical requests share a response.
+
+The disk tier stores responses in plain text. Prompts are only hashed, but the
+responses describe what they were about, including screen contents, so the
+file is as sensitive as the GUM database itself. It is off unless
+LLM_CACHE_DISK=true (or the CLI's --llm-disk-cache) asks for it; set
+LLM_CACHE_ENABLED=false (or pass --no-llm-cache) to cache nothing at all.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Memory + SQLite cache of completion responses."""
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 memory_entries: int = 512,
+                 ttl_seconds: float = 7 * 24 * 3600,
+                 max_disk_entries: int = 50_000,
+                 prune_every: int = 100):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite file for the disk tier; None keeps the cache in memory only
+            memory_entries: Capacity of the in-memory LRU tier
+            ttl_seconds: Age after which an entry is ignored and eventually deleted
+            max_disk_entries: Entries kept on disk; the least recently used are evicted
+            prune_every: Number of writes between disk prunes
+        """
+        self.memory_entries = memory_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self.prune_every = prune_every
+
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        # memory tier and counters; the SQLite connection has its own lock so
+        # that a disk lookup in a worker thread never blocks a memory hit
+        self._lock = threading.RLock()
+        self._disk_lock = threading.RLock()
+        self._writes_since_prune = 0
+
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'evictions': 0,
+        }
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            path = os.path.expanduser(path)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key         TEXT PRIMARY KEY,
+                    response    TEXT NOT NULL,
+                    created_at  REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_responses_accessed ON responses (accessed_at)"
+            )
+
+    @staticmethod
+    def make_key(provider: str, model: str, messages: Any, **params: Any) -> str:
+        """Hash a request into a cache key."""
+        payload = json.dumps(
+            {'provider': provider, 'model': model, 'messages': messages, 'params': params},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss."""
+        hit = self._memory_get(key)
+        return hit if hit is not None else self._disk_get(key)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Like :meth:`get`, with the disk lookup in a worker thread."""
+        hit = self._memory_get(key)
+        if hit is not None or self._conn is None:
+            return hit if hit is not None else self._disk_get(key)
+        return await asyncio.to_thread(self._disk_get, key)
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response in both tiers."""
+        now = self._memory_put(key, response)
+        self._disk_put(key, response, now)
+
+    async def aput(self, key: str, response: str) -> None:
+        """Like :meth:`put`, with the disk write in a worker thread."""
+        now = self._memory_put(key, response)
+        if self._conn is not None:
+            await asyncio.to_thread(self._disk_put, key, response, now)
+
+    def discard(self, key: str) -> None:
+        """Drop one entry from both tiers."""
+        with self._lock:
+            self._memory.pop(key, None)
+        self._disk_discard(key)
+
+    async def adiscard(self, key: str) -> None:
+        """Like :meth:`discard`, with the disk delete in a worker thread."""
+        with self._lock:
+            self._memory.pop(key, None)
+        if self._conn is not None:
+            await asyncio.to_thread(self._disk_discard, key)
+
+    def prune(self) -> int:
+        """Delete expired entries and enforce the disk cap. Returns the number removed."""
+        with self._disk_lock:
+            self._writes_since_prune = 0
+            if self._conn is None:
+                return 0
+            removed = self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,),
+            ).rowcount
+            removed += self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "  SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?"
+                ")",
+                (self.max_disk_entries,),
+            ).rowcount
+        with self._lock:
+            self._stats['evictions'] += removed
+        return removed
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] < self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return entry[0]
+            if entry is not None:
+                del self._memory[key]
+            return None
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        now = time.time()
+        row = None
+        with self._disk_lock:
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl_seconds:
+                    self._conn.execute(
+                        "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                    )
+                else:
+                    row = None
+        with self._lock:
+            if row is None:
+                self._stats['misses'] += 1
+                return None
+            self._remember(key, row[0], row[1])
+            self._stats['disk_hits'] += 1
+            return row[0]
+
+    def _memory_put(self, key: str, response: str) -> float:
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            self._stats['writes'] += 1
+        return now
+
+    def _disk_put(self, key: str, response: str, now: float) -> None:
+        with self._disk_lock:
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= self.prune_every:
+                self.prune()
+
+    def _disk_discard(self, key: str) -> None:
+        with self._disk_lock:
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus current tier sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+            stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+            stats['memory_entries'] = len(self._memory)
+        with self._disk_lock:
+            if self._conn is not None:
+                stats['disk_entries'] = self._conn.execute(
+                    "SELECT COUNT(*) FROM responses"
+                ).fetchone()[0]
+        return stats
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._memory.clear()
+        with self._disk_lock:
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._disk_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _remember(self, key: str, response: str, created_at: float) -> None:
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+
+def cache_from_env() -> Optional[ResponseCache]:
+    """Build the default cache from LLM_CACHE_* environment variables.
+
+    LLM_CACHE_ENABLED (default true) turns caching on at all; responses are
+    then kept in memory only. LLM_CACHE_DISK (default false) adds the SQLite
+    tier at LLM_CACHE_PATH (default ~/.cache/gum/llm_cache.db), which holds
+    model responses derived from screen contents for up to
+    LLM_CACHE_TTL_SECONDS (7 days by default). LLM_CACHE_MAX_ENTRIES caps it.
+    """
+    if os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    disk = os.getenv("LLM_CACHE_DISK", "false").lower() in ("1", "true", "yes")
+    return ResponseCache(
+        path=os.getenv("LLM_CACHE_PATH", "~/.cache/gum/llm_cache.db") if disk else None,
+        ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+        max_disk_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", 50_000)),
+    )
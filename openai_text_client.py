@@ -9,7 +9,7 @@ with proper error handling and logging.
 import asyncio
 import os
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 
@@ -68,7 +68,8 @@ class OpenAITextClient:
         self,
         messages: List[Dict[str, Any]],
         max_tokens: int = 1000,
-        temperature: float = 0.1
+        temperature: float = 0.1,
+        response_format: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         Send a chat completion request to OpenAI.
@@ -77,6 +78,7 @@ class OpenAITextClient:
             messages: List of message dictionaries
             max_tokens: Maximum tokens to generate
             temperature: Temperature for generation
+            response_format: Optional structured-output request (e.g. a JSON schema)
             
         Returns:
             The AI response content as a string
@@ -88,11 +90,13 @@ class OpenAITextClient:
         logger.info(f"   Max tokens: {max_tokens}")
         
         try:
+            extra_kwargs = {"response_format": response_format} if response_format else {}
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,  # type: ignore
                 max_tokens=max_tokens,
-                temperature=temperature
+                temperature=temperature,
+                **extra_kwargs
             )
             
             content = response.choices[0].message.content
@@ -126,7 +130,8 @@ async def get_openai_text_client() -> OpenAITextClient:
 async def openai_text_completion(
     messages: List[Dict[str, Any]],
     max_tokens: int = 1000,
-    temperature: float = 0.1
+    temperature: float = 0.1,
+    response_format: Optional[Dict[str, Any]] = None
 ) -> str:
     """
     Convenience function for OpenAI text completion.
@@ -135,9 +140,10 @@ async def openai_text_completion(
         messages: List of message dictionaries
         max_tokens: Maximum tokens to generate
         temperature: Temperature for generation
+        response_format: Optional structured-output request (e.g. a JSON schema)
         
     Returns:
         The AI response content as a string
     """
     client = await get_openai_text_client()
-    return await client.chat_completion(messages, max_tokens, temperature)
+    return await client.chat_completion(messages, max_tokens, temperature, response_format)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for search_propositions_bm25_many.
+
+The batched search must return what the per-query search returns while
+sending far fewer statements to SQLite.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event
+
+from gum.db_utils import LinkBatch, search_propositions_bm25, search_propositions_bm25_many
+from gum.models import Observation, Proposition, init_db
+
+TOPICS = ["python asyncio", "rust borrow checker", "chess openings", "sourdough bread",
+          "marathon training", "python typing", "bread flour", "chess endgames"]
+QUERIES = ["python asyncio tasks", "bread baking", "chess", "rust lifetimes", "!!!"]
+
+
+async def _compare(include_observations):
+    engine, Session = await init_db("batch.db", tempfile.mkdtemp())
+    async with Session() as session, session.begin():
+        props = [
+            Proposition(text=f"User studies {t}", reasoning=f"Read about {t} {n}",
+                        confidence=5, decay=1, revision_group=f"g{n}")
+            for n, t in enumerate(TOPICS * 3)
+        ]
+        obs = Observation(observer_name="Screen", content="kneading bread dough",
+                          content_type="input_text")
+        session.add_all(props + [obs])
+        await session.flush()
+        await LinkBatch().add([obs.id], [props[4].id]).flush(session)
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda *args: statements.append(args[2]))
+
+    kwargs = dict(limit=3, include_observations=include_observations)
+    async with Session() as session:
+        single = [await search_propositions_bm25(session, q, **kwargs) for q in QUERIES]
+        n_single = len(statements)
+        many = await search_propositions_bm25_many(session, QUERIES, **kwargs)
+        n_many = len(statements) - n_single
+    await engine.dispose()
+
+    as_ids = lambda results: [[(p.id, round(s, 6)) for p, s in hits] for hits in results]
+    return as_ids(single), as_ids(many), n_single, n_many
+
+
+def test_batch_matches_single_queries():
+    print("🧪 Testing batched proposition search...")
+    for include_observations in (False, True):
+        single, many, n_single, n_many = asyncio.run(_compare(include_observations))
+        assert many == single
+        assert any(single)
+        print(f"   observations={include_observations}: {n_single} statements -> {n_many}")
+        assert n_many * 2 <= n_single
+    print("✅ Batched proposition search passed")
+
+
+if __name__ == "__main__":
+    test_batch_matches_single_queries()
+    print("🎉 All batch search tests passed!")
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Test script for compressed cold storage of observation bodies.
+
+Old observations must keep only a preview inline while full-text search,
+``full_content`` and deletes still see the complete text.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import delete, func, insert, select, text
+
+from gum import gum
+from gum.cold_storage import cold_storage_stats, move_to_cold_storage
+from gum.db_utils import get_related_observations
+from gum.models import (
+    PREVIEW_CHARS,
+    Observation,
+    Proposition,
+    fts_content_of,
+    init_db,
+    observation_blobs,
+    observation_proposition,
+    purge_fts_tombstones,
+)
+
+OLD, RECENT = 40, 5
+
+
+def _transcript(i):
+    lines = [f"**Application Name:** Visual Studio Code\n**Document:** module_{i % 7}.py\n"]
+    lines += [f"- line {n}: editing function handle_request and its tests\n" for n in range(80)]
+    lines.append(f"Closing tab after reviewing zqtail{i}\n")
+    return "".join(lines)
+
+
+async def _seed(Session):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    async with Session() as session, session.begin():
+        ids = (await session.execute(insert(Observation).returning(Observation.id), [
+            dict(observer_name="Screen", content=_transcript(i), content_type="input_text",
+                 created_at=now - timedelta(days=60 if i < OLD else 1))
+            for i in range(OLD + RECENT)
+        ])).scalars().all()
+        prop = Proposition(text="User edits request handlers", reasoning="r", revision_group="g")
+        session.add(prop)
+        await session.flush()
+        await session.execute(insert(observation_proposition), [
+            dict(observation_id=oid, proposition_id=prop.id) for oid in ids[:3]
+        ])
+        return ids, prop.id
+
+
+def _integrity(conn):
+    # rank 1 also compares the index with its content (the observation_texts view)
+    conn.execute(text(
+        "INSERT INTO observations_fts(observations_fts, rank) VALUES('integrity-check', 1)"
+    ))
+
+
+async def _round_trip():
+    g = gum("TestUser", "test-model", data_directory=tempfile.mkdtemp(),
+            fts_maintenance_interval=None, cold_storage_days=30, verbosity=logging.WARNING)
+    await g.connect_db()
+    ids, pid = await _seed(g.Session)
+    raw_bytes = sum(len(_transcript(i).encode()) for i in range(OLD))
+
+    moved = await g.move_to_cold_storage()
+    again = await g.move_to_cold_storage()
+
+    async with g._read_session() as session:
+        inline = dict((await session.execute(
+            select(Observation.id, func.length(Observation.content))
+        )).all())
+        full = dict((await session.execute(
+            select(Observation.id, Observation.full_content)
+        )).all())
+        tail_hits = (await session.execute(text(
+            "SELECT rowid FROM observations_fts WHERE observations_fts MATCH 'zqtail3'"
+        ))).scalars().all()
+        related = await get_related_observations(session, pid)
+        stats = await cold_storage_stats(session)
+
+    async with g.Session() as session, session.begin():
+        await session.execute(delete(Observation).where(Observation.id == ids[0]))
+        blobs_left = (await session.execute(select(func.count()).select_from(observation_blobs))).scalar()
+        conn = await session.connection()
+        await conn.run_sync(purge_fts_tombstones)
+        await conn.run_sync(_integrity)
+    await g.__aexit__(None, None, None)
+    return ids, moved, again, inline, full, tail_hits, related, stats, blobs_left, raw_bytes
+
+
+def test_cold_storage_round_trip():
+    print("🧪 Testing cold storage of observation bodies...")
+    (ids, moved, again, inline, full, tail_hits, related,
+     stats, blobs_left, raw_bytes) = asyncio.run(_round_trip())
+
+    assert moved == OLD and again == 0
+    assert all(inline[oid] == PREVIEW_CHARS for oid in ids[:OLD])
+    assert all(inline[oid] > PREVIEW_CHARS for oid in ids[OLD:])
+    assert all(full[oid] == _transcript(i) for i, oid in enumerate(ids))
+    assert tail_hits == [ids[3]]
+    assert sorted(o.content for o in related) == sorted(_transcript(i) for i in range(3))
+    assert stats["observations"] == OLD
+    assert stats["compressed_bytes"] * 5 < raw_bytes
+    assert blobs_left == OLD - 1
+    print(f"✅ {OLD} bodies moved, {raw_bytes} → {stats['compressed_bytes']} bytes, index intact")
+
+
+async def _open(directory):
+    engine, Session = await init_db("legacy.db", directory)
+    async with Session() as session:
+        content = await (await session.connection()).run_sync(fts_content_of, "observations_fts")
+        hits = (await session.execute(text(
+            "SELECT rowid FROM observations_fts WHERE observations_fts MATCH 'zqtail0'"
+        ))).scalars().all()
+    await engine.dispose()
+    return content, hits
+
+
+def test_legacy_index_is_rebuilt_on_view():
+    print("🧪 Testing the observation index migration...")
+    directory = tempfile.mkdtemp()
+    asyncio.run(_open(directory))
+    # an index from before cold storage read the observations table directly
+    conn = sqlite3.connect(os.path.join(directory, "legacy.db"))
+    conn.executescript(f"""
+        DROP TABLE observations_fts;
+        CREATE VIRTUAL TABLE observations_fts USING fts5(
+            content, content='observations', content_rowid='id', tokenize='porter ascii'
+        );
+        INSERT INTO observations(observer_name, content, content_type)
+        VALUES ('Screen', '{_transcript(0)}', 'input_text');
+    """)
+    conn.commit()
+    conn.close()
+
+    content, hits = asyncio.run(_open(directory))
+    assert content == "observation_texts"
+    assert hits == [1]
+    print("✅ Observation index migration passed")
+
+
+async def _cold_rows(directory):
+    engine, Session = await init_db("foreign.db", directory)
+    old = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=60)
+    async with Session() as session, session.begin():
+        await session.execute(insert(Observation), [
+            dict(observer_name="Screen", content=_transcript(i), content_type="input_text",
+                 created_at=old)
+            for i in range(2)
+        ])
+        await move_to_cold_storage(session, old + timedelta(days=1))
+    await engine.dispose()
+
+
+async def _reopen(directory):
+    engine, Session = await init_db("foreign.db", directory)
+    async with Session() as session:
+        conn = await session.connection()
+        await conn.run_sync(_integrity)
+        hits = {
+            tail: (await session.execute(text(
+                f"SELECT rowid FROM observations_fts WHERE observations_fts MATCH '{tail}'"
+            ))).scalars().all()
+            for tail in ("zqtail1", "zqtail9")
+        }
+        left = (await session.execute(text("SELECT count(*) FROM observation_fts_tombstones"))).scalar()
+    await engine.dispose()
+    return hits, left
+
+
+def test_delete_without_gum_functions():
+    print("🧪 Testing deletes of cold observations from a plain sqlite3 connection...")
+    directory = tempfile.mkdtemp()
+    asyncio.run(_cold_rows(directory))
+    # no gum_inflate here, as in the sqlite3 shell or a backup tool
+    conn = sqlite3.connect(os.path.join(directory, "foreign.db"))
+    conn.execute("DELETE FROM observations WHERE id = 2")
+    # the freed id is taken by a new observation before GUM runs again
+    conn.execute(
+        "INSERT INTO observations(observer_name, content, content_type) VALUES ('Screen', ?, 'input_text')",
+        (_transcript(9),),
+    )
+    conn.commit()
+    conn.close()
+
+    hits, left = asyncio.run(_reopen(directory))
+    assert hits == {"zqtail1": [], "zqtail9": [2]}
+    assert left == 0
+    print("✅ Foreign deletes passed")
+
+
+if __name__ == "__main__":
+    test_cold_storage_round_trip()
+    test_legacy_index_is_rebuilt_on_view()
+    test_delete_without_gum_functions()
+    print("🎉 All cold storage tests passed!")
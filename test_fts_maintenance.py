@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test script for FTS5 maintenance and tokenizer selection.
+
+Checks that update triggers skip rows whose text did not change, that the
+tokenizer can be switched with a re-index (also on a running gum), and that a maintenance round
+merges segments without breaking search.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import func, select, text, update
+
+from gum import gum
+from gum.db_utils import search_propositions_bm25
+from gum.fts import FtsMaintenance, reindex_fts
+from gum.models import Proposition, fts_tokenizer_of, init_db
+
+
+def _prop(text):
+    return Proposition(text=text, reasoning="seen on screen", confidence=5, decay=0,
+                       revision_group=text[:30])
+
+
+async def _changes(session, stmt):
+    before = (await session.execute(text("SELECT total_changes()"))).scalar()
+    await session.execute(stmt)
+    return (await session.execute(text("SELECT total_changes()"))).scalar() - before
+
+
+async def _triggers():
+    engine, Session = await init_db("fts.db", tempfile.mkdtemp())
+    async with Session() as session, session.begin():
+        session.add(_prop("User reads Tolstoy"))
+    async with Session() as session, session.begin():
+        touched = await _changes(session, update(Proposition).values(updated_at=func.now()))
+        edited = await _changes(session, update(Proposition).values(text="User reads Chekhov"))
+        hits = await search_propositions_bm25(session, "chekhov", enable_mmr=False)
+    await engine.dispose()
+    return touched, edited, [p.text for p, _ in hits]
+
+
+async def _tokenizers():
+    directory = tempfile.mkdtemp()
+    engine, Session = await init_db("fts.db", directory)
+    async with Session() as session, session.begin():
+        session.add(_prop("Пользователь читает новости о Москве"))
+    async with Session() as session:
+        before = await search_propositions_bm25(session, "москв", enable_mmr=False)
+    await engine.dispose()
+
+    engine, Session = await init_db("fts.db", directory, fts_tokenizer="trigram")
+    async with Session() as session:
+        after = await search_propositions_bm25(session, "москв", enable_mmr=False)
+    rebuilt = await reindex_fts(engine, "unicode61")
+    async with engine.connect() as conn:
+        spec = await conn.run_sync(fts_tokenizer_of, "propositions_fts")
+    async with Session() as session:
+        whole_word = await search_propositions_bm25(session, "москве", enable_mmr=False)
+    await engine.dispose()
+    return len(before), len(after), rebuilt, spec, len(whole_word)
+
+
+async def _gum_reindex():
+    g = gum("TestUser", "test-model", data_directory=tempfile.mkdtemp(),
+            fts_maintenance_interval=None, verbosity=logging.WARNING)
+    await g.connect_db()
+
+    async def add(session):
+        session.add(_prop("Пользователь читает новости о Москве"))
+
+    await g.write(add)
+    generation = g.data_generation
+    rebuilt = await g.reindex_fts("trigram")
+    again = await g.reindex_fts("trigram")
+    async with g._read_session() as session:
+        hits = await search_propositions_bm25(session, "москв", enable_mmr=False)
+    try:
+        await g.reindex_fts("unicode61' x")
+        rejected = False
+    except ValueError:
+        rejected = True
+    bumped = g.data_generation > generation
+    await g.__aexit__(None, None, None)
+    return rebuilt, again, len(hits), rejected, bumped
+
+
+async def _maintenance():
+    engine, Session = await init_db("fts.db", tempfile.mkdtemp())
+    for n in range(40):
+        # one statement per row leaves one small segment each
+        async with Session() as session, session.begin():
+            session.add(_prop(f"User edits spreadsheet {n}"))
+
+    maintenance = FtsMaintenance(engine, interval=3600)
+    await maintenance.configure()
+    steps = await maintenance.run_once(optimize_now=True)
+    async with Session() as session:
+        hits = await search_propositions_bm25(session, "spreadsheet", limit=50, enable_mmr=False)
+    await engine.dispose()
+    return steps, maintenance.stats, len(hits)
+
+
+def test_update_trigger_skips_unchanged_text():
+    print("🧪 Testing FTS update triggers...")
+    touched, edited, hits = asyncio.run(_triggers())
+    assert touched == 1               # only the propositions row itself
+    assert edited > 1                 # row plus FTS delete/insert
+    assert hits == ["User reads Chekhov"]
+    print("✅ FTS update triggers passed")
+
+
+def test_tokenizer_switch_reindexes():
+    print("🧪 Testing tokenizer selection...")
+    before, after, rebuilt, spec, whole_word = asyncio.run(_tokenizers())
+    assert before == 0                # porter ascii cannot match a Cyrillic prefix
+    assert after == 1                 # trigram matches substrings
+    assert rebuilt == ["propositions_fts", "observations_fts"]
+    assert spec == "unicode61 remove_diacritics 2"
+    assert whole_word == 1
+    print("✅ Tokenizer selection passed")
+
+
+def test_gum_reindex_through_writer():
+    print("🧪 Testing online re-index on a running gum...")
+    rebuilt, again, n_hits, rejected, bumped = asyncio.run(_gum_reindex())
+    assert rebuilt == ["propositions_fts", "observations_fts"]
+    assert again == []
+    assert n_hits == 1
+    assert rejected
+    assert bumped
+    print("✅ Online re-index passed")
+
+
+def test_maintenance_round():
+    print("🧪 Testing FTS maintenance...")
+    steps, stats, n_hits = asyncio.run(_maintenance())
+    assert steps["propositions_fts"] >= 1
+    assert stats["optimizes"] == 1
+    assert n_hits == 40
+    print("✅ FTS maintenance passed")
+
+
+if __name__ == "__main__":
+    test_update_trigger_skips_unchanged_text()
+    test_tokenizer_switch_reindexes()
+    test_gum_reindex_through_writer()
+    test_maintenance_round()
+    print("🎉 All FTS maintenance tests passed!")
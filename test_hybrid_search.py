@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Test script for hybrid (BM25 + dense) proposition retrieval.
+
+Uses the offline hashing embedder and a tiny keyword embedder, so no model
+download is needed.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from sqlalchemy import delete
+
+from gum.db_utils import search_propositions_bm25
+from gum.embeddings import EmbeddingIndex, FlatIndex, IVFIndex
+from gum.models import Proposition, init_db
+
+TEXTS = [
+    ("User is planning a holiday in Lisboa", "Searched hotels in Lisboa"),
+    ("User writes Rust services", "Edited Cargo.toml files"),
+    ("User is learning the cello", "Watched bowing technique videos"),
+]
+
+
+class KeywordEmbedder:
+    """Maps a few synonyms onto shared axes, standing in for a semantic model."""
+
+    name = "keywords"
+    dim = 3
+    AXES = [("vacation", "holiday", "trip"), ("rust", "cargo"), ("cello", "music")]
+
+    def embed(self, texts):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            words = text.lower().split()
+            for axis, keys in enumerate(self.AXES):
+                out[i, axis] = sum(w in words for w in keys)
+            norm = np.linalg.norm(out[i])
+            if norm:
+                out[i] /= norm
+        return out
+
+
+async def _search(index, query, mode="HYBRID"):
+    engine, Session = await init_db("hybrid.db", tempfile.mkdtemp())
+    async with Session() as session, session.begin():
+        session.add_all([
+            Proposition(text=t, reasoning=r, confidence=5, decay=0, revision_group=f"g{i}")
+            for i, (t, r) in enumerate(TEXTS)
+        ])
+    if index is not None:
+        # gum syncs after its writes; searches never do
+        async with Session() as session:
+            await index.sync(session)
+    async with Session() as session, session.begin():
+        hits = await search_propositions_bm25(
+            session, query, limit=1, mode=mode, enable_mmr=False,
+            enable_decay=False, embedding_index=index)
+    await engine.dispose()
+    return [p.text for p, _ in hits]
+
+
+async def _cleanup_then_ingest(index, reset):
+    engine, Session = await init_db("hybrid.db", tempfile.mkdtemp())
+
+    async def _ingest(texts):
+        async with Session() as session, session.begin():
+            session.add_all([
+                Proposition(text=t, reasoning=r, confidence=5, decay=0, revision_group=f"g{i}")
+                for i, (t, r) in enumerate(texts)
+            ])
+        async with Session() as session:
+            await index.sync(session)
+
+    async def _top(query):
+        async with Session() as session, session.begin():
+            hits = await search_propositions_bm25(
+                session, query, limit=1, mode="HYBRID", enable_mmr=False,
+                enable_decay=False, embedding_index=index)
+        return [p.text for p, _ in hits]
+
+    await _ingest(TEXTS)
+    before = await _top("vacation")
+    # like DELETE /database/cleanup: ids start over at 1 for other texts
+    async with Session() as session, session.begin():
+        await session.execute(delete(Proposition))
+    if reset:
+        await index.reset()
+    await _ingest(TEXTS[::-1])
+    after = await _top("vacation")
+    await engine.dispose()
+    return before, after, len(index.index)
+
+
+def test_hybrid_finds_paraphrase():
+    print("🧪 Testing hybrid retrieval...")
+    # one index per database, as gum keeps one next to each database file
+    assert asyncio.run(_search(EmbeddingIndex(KeywordEmbedder()), "vacation", mode="OR")) == []
+    assert asyncio.run(_search(EmbeddingIndex(KeywordEmbedder()), "vacation")) == [TEXTS[0][0]]
+    # no index configured: HYBRID falls back to lexical search
+    assert asyncio.run(_search(None, "cello")) == [TEXTS[2][0]]
+    print("✅ Hybrid retrieval passed")
+
+
+def test_index_follows_cleanup():
+    print("🧪 Testing the dense index after a database cleanup...")
+    for reset in (True, False):
+        before, after, size = asyncio.run(_cleanup_then_ingest(EmbeddingIndex(KeywordEmbedder()), reset))
+        assert before == after == [TEXTS[0][0]]
+        assert size == len(TEXTS)
+    print("✅ Cleanup handling passed")
+
+
+def test_hashing_embedder_persists():
+    print("🧪 Testing the on-disk flat index...")
+    path = tempfile.mkdtemp()
+    index = EmbeddingIndex(path=path)
+    assert asyncio.run(_search(index, "Lisbon hotel")) == [TEXTS[0][0]]
+    assert len(index.index) == len(TEXTS)
+
+    reopened = EmbeddingIndex(path=path)
+    assert reopened.last_id == index.last_id
+    assert len(reopened.index) == len(TEXTS)
+    print("✅ On-disk flat index passed")
+
+
+async def _sync_twice(index, vectors, marker):
+    engine, Session = await init_db("append.db", tempfile.mkdtemp())
+
+    async def _round(texts):
+        async with Session() as session, session.begin():
+            session.add_all([
+                Proposition(text=t, reasoning=r, revision_group=t) for t, r in texts
+            ])
+        async with Session() as session:
+            # a search leaves the index alone
+            await search_propositions_bm25(session, "cello", mode="HYBRID", embedding_index=index)
+            before_sync = len(index.index)
+            added = await index.sync(session)
+        return before_sync, added
+
+    first = await _round(TEXTS[:2])
+    # a rewrite of the file would lose this
+    with open(vectors, "r+b") as f:
+        f.write(marker)
+    second = await _round(TEXTS[2:])
+    await engine.dispose()
+    return first, second
+
+
+def test_sync_appends_to_files():
+    print("🧪 Testing incremental saves of the dense index...")
+    path = tempfile.mkdtemp()
+    index = EmbeddingIndex(KeywordEmbedder(), path=path)
+    vectors = os.path.join(path, "vectors.f32")
+    row_bytes = KeywordEmbedder.dim * 4
+    marker = np.float32([7, 7, 7]).tobytes()
+
+    first, second = asyncio.run(_sync_twice(index, vectors, marker))
+    assert first == (0, 2) and second == (2, 1)
+    with open(vectors, "rb") as f:
+        data = f.read()
+    assert len(data) == 3 * row_bytes and data[:row_bytes] == marker
+
+    # rows written after the last meta.json commit are dropped on load
+    with open(vectors, "ab") as f:
+        f.write(b"\0" * row_bytes)
+    reopened = EmbeddingIndex(KeywordEmbedder(), path=path)
+    assert len(reopened.index) == 3
+    assert os.path.getsize(vectors) == 3 * row_bytes
+    assert list(reopened.index.ids) == [1, 2, 3]
+    print("✅ Incremental saves passed")
+
+
+def test_ivf_matches_flat():
+    print("🧪 Testing the IVF index...")
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(16, 32))
+    vecs = centers[rng.integers(0, 16, 2000)] + 0.05 * rng.normal(size=(2000, 32))
+    vecs = (vecs / np.linalg.norm(vecs, axis=1, keepdims=True)).astype(np.float32)
+    ids = np.arange(1, 2001)
+
+    flat, ivf = FlatIndex(32), IVFIndex(32, n_lists=16, n_probe=4)
+    flat.add(ids, vecs)
+    ivf.add(ids, vecs)
+    assert ivf.centroids is not None
+
+    recall = []
+    for q in vecs[:50]:
+        truth = {i for i, _ in flat.search(q, 10)}
+        recall.append(len(truth & {i for i, _ in ivf.search(q, 10)}) / 10)
+    assert np.mean(recall) >= 0.9
+    print(f"   recall@10: {np.mean(recall):.2f}")
+    print("✅ IVF index passed")
+
+
+if __name__ == "__main__":
+    test_hybrid_finds_paraphrase()
+    test_index_follows_cleanup()
+    test_hashing_embedder_persists()
+    test_sync_appends_to_files()
+    test_ivf_matches_flat()
+    print("🎉 All hybrid search tests passed!")
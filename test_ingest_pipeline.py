@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Test script for the staged ingest pipeline.
+
+Runs updates through gum with a scripted AI client (no network) and checks
+that observations, propositions and links are written, and that coalescing
+merges bursts into a single proposition call.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import select, func
+
+from gum import gum
+from gum.db_utils import LinkBatch
+from gum.ingest import STAGES, IngestPipeline
+from gum.journal import JournaledQueue, UpdateJournal
+from gum.models import Observation, Proposition, observation_proposition
+from gum.observers import Observer, get_api_observer
+from gum.schemas import Update
+
+
+class ScriptedClient:
+    """Stand-in for UnifiedAIClient that answers each gum prompt deterministically."""
+
+    def __init__(self):
+        self.calls = {"propose": 0, "similar": 0, "revise": 0}
+
+    async def text_completion(self, messages, max_tokens=1000, temperature=0.1, cache=False, response_format=None, validate=None):
+        prompt = messages[0]["content"]
+        await asyncio.sleep(0.01)
+        if "Proposition 1:" in prompt:
+            self.calls["revise"] += 1
+            return json.dumps({"propositions": [
+                {"proposition": "User writes Python daily", "reasoning": "revised", "confidence": 7, "decay": 3}
+            ]})
+        if "[id=" in prompt:
+            self.calls["similar"] += 1
+            ids = [int(x) for x in re.findall(r"\[id=(\d+)\]", prompt)]
+            relations = [{"source": ids[0], "label": "SIMILAR", "target": ids[1:2]}]
+            relations += [{"source": i, "label": "UNRELATED", "target": []} for i in ids[2:]]
+            return json.dumps({"relations": relations})
+        self.calls["propose"] += 1
+        return json.dumps({"propositions": [
+            {"proposition": "User writes Python code", "reasoning": "VS Code is open", "confidence": 6, "decay": 3},
+            {"proposition": "User reads documentation", "reasoning": "Browser shows docs", "confidence": 5, "decay": 3},
+        ]})
+
+
+class BurstObserver(Observer):
+    """Observer that emits a fixed burst of text updates."""
+
+    def __init__(self, name, count):
+        self._count = count
+        super().__init__(name)
+
+    async def _worker(self):
+        for i in range(self._count):
+            await self.update_queue.put(Update(content=f"Editing main.py line {i}", content_type="input_text"))
+        while self._running:
+            await asyncio.sleep(1)
+
+
+class FailingClient(ScriptedClient):
+    """Simulates a provider outage: every proposition call fails."""
+
+    async def text_completion(self, messages, max_tokens=1000, temperature=0.1, cache=False, response_format=None, validate=None):
+        raise RuntimeError("provider unavailable")
+
+
+class HangingClient(ScriptedClient):
+    """Never answers, so jobs stay in flight until the process goes away."""
+
+    async def text_completion(self, messages, max_tokens=1000, temperature=0.1, cache=False, response_format=None, validate=None):
+        await asyncio.Event().wait()
+
+
+async def _counts(g):
+    async with g._session() as session:
+        n_obs = (await session.execute(select(func.count(Observation.id)))).scalar()
+        n_props = (await session.execute(select(func.count(Proposition.id)))).scalar()
+        n_links = (await session.execute(select(func.count()).select_from(observation_proposition))).scalar()
+    return n_obs, n_props, n_links
+
+
+async def _run_direct():
+    g = gum("TestUser", "test-model", data_directory=tempfile.mkdtemp(), verbosity=logging.WARNING)
+    g.ai_client = ScriptedClient()
+    await g.connect_db()
+
+    class _Named:
+        name = "direct"
+
+    await asyncio.gather(*[
+        g._default_handler(_Named(), Update(content=f"Python session {i}", content_type="input_text"))
+        for i in range(4)
+    ])
+    counts = await _counts(g)
+    await g.__aexit__(None, None, None)
+    return g, counts
+
+
+async def _run_loop(coalesce_window_ms):
+    g = gum(
+        "TestUser", "test-model",
+        BurstObserver("screen", 8), BurstObserver("api", 4),
+        data_directory=tempfile.mkdtemp(),
+        verbosity=logging.WARNING,
+        coalesce_window_ms=coalesce_window_ms,
+    )
+    g.ai_client = ScriptedClient()
+    async with g:
+        await asyncio.sleep(0.6)
+    counts = await _counts(g)
+    return g, counts
+
+
+async def _run_journal_restart():
+    data_dir = tempfile.mkdtemp()
+
+    # first run: the model is down, so nothing gets past the propose stage
+    g1 = gum("TestUser", "test-model", BurstObserver("screen", 5),
+             data_directory=data_dir, verbosity=logging.CRITICAL, journal_enabled=True)
+    g1.ai_client = FailingClient()
+    async with g1:
+        await asyncio.sleep(0.3)
+    journal = UpdateJournal(os.path.join(data_dir, "ingest_journal.db"))
+    pending_after_outage = journal.pending
+    journal.close()
+
+    # second run: unacknowledged updates are replayed on entry
+    g2 = gum("TestUser", "test-model", BurstObserver("screen", 0),
+             data_directory=data_dir, verbosity=logging.WARNING, journal_enabled=True)
+    g2.ai_client = ScriptedClient()
+    async with g2:
+        await asyncio.sleep(0.3)
+    journal = UpdateJournal(os.path.join(data_dir, "ingest_journal.db"))
+    pending_after_replay = journal.pending
+    journal.close()
+    return g2, pending_after_outage, pending_after_replay
+
+
+async def _run_crash_restart():
+    data_dir = tempfile.mkdtemp()
+
+    # first run: updates are still queued in the observer when gum starts, and
+    # the model hangs, so some jobs stop after persist and the rest never leave the queue
+    g1 = gum("TestUser", "test-model", BurstObserver("screen", 8),
+             data_directory=data_dir, verbosity=logging.CRITICAL, journal_enabled=True,
+             stage_concurrency={"persist": 1, "propose": 1}, stage_queue_size=1)
+    g1.ai_client = HangingClient()
+    await g1.__aenter__()
+    await asyncio.sleep(0.3)
+    journaled = g1._journal._conn.execute("SELECT COUNT(*) FROM pending_updates").fetchone()[0]
+    pending = g1._journal.pending
+    stored_before_crash = (await _counts(g1))[0]
+
+    # crash: in-flight jobs are abandoned without being acknowledged
+    await g1.stop_update_loop()
+    await g1._pipeline.stop()
+    await g1.__aexit__(None, None, None)
+
+    g2 = gum("TestUser", "test-model", BurstObserver("screen", 0),
+             data_directory=data_dir, verbosity=logging.WARNING, journal_enabled=True)
+    g2.ai_client = ScriptedClient()
+    async with g2:
+        await asyncio.sleep(0.5)
+    counts = await _counts(g2)
+    async with g2._session() as session:
+        unlinked = (await session.execute(
+            select(func.count(Observation.id)).where(
+                Observation.id.not_in(select(observation_proposition.c.observation_id)))
+        )).scalar()
+    journal = UpdateJournal(os.path.join(data_dir, "ingest_journal.db"))
+    left = journal._conn.execute("SELECT COUNT(*) FROM pending_updates").fetchone()[0]
+    journal.close()
+    return g2, journaled, pending, stored_before_crash, counts, unlinked, left
+
+
+async def _run_failed_job():
+    g = gum("TestUser", "test-model", data_directory=tempfile.mkdtemp(), verbosity=logging.CRITICAL)
+    g.ai_client = FailingClient()
+    await g.connect_db()
+    try:
+        await g.ingest(Update(content="Editing main.py", content_type="input_text"))
+        raised = False
+    except RuntimeError:
+        raised = True
+    counts = await _counts(g)
+    await g.__aexit__(None, None, None)
+    return raised, counts
+
+
+async def _run_watermarks():
+    journal = UpdateJournal(os.path.join(tempfile.mkdtemp(), "journal.db"),
+                            high_watermark=4, low_watermark=2)
+    queue = JournaledQueue(journal, "screen")
+    for i in range(4):
+        await queue.put(Update(content=f"u{i}", content_type="input_text"))
+
+    blocked = asyncio.create_task(queue.put(Update(content="u4", content_type="input_text")))
+    await asyncio.sleep(0.05)
+    paused = not blocked.done()
+
+    # acknowledging down to the low watermark lets the observer continue
+    journal.ack([queue.get_nowait()._journal_id for _ in range(2)])
+    await asyncio.wait_for(blocked, 1)
+    journal.close()
+    return paused, queue.qsize()
+
+
+async def _run_batch_with_statement_count():
+    g = gum("TestUser", "test-model", data_directory=tempfile.mkdtemp(), verbosity=logging.WARNING)
+    g.ai_client = ScriptedClient()
+    await g.connect_db()
+
+    link_statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if "observation_proposition" in statement and statement.lstrip().upper().startswith("INSERT"):
+            link_statements.append(executemany)
+
+    from sqlalchemy import event
+    event.listen(g.engine.sync_engine, "before_cursor_execute", _count)
+
+    frames = [Update(content=f"Video frame analysis (Frame {i}): editor open", content_type="input_text")
+              for i in range(5)]
+    await g.ingest(frames, observer_name="video")
+    counts = await _counts(g)
+
+    # LinkBatch ignores pairs that already exist
+    async with g._session() as session:
+        again = await LinkBatch().add([1, 1], [1, 2]).flush(session)
+    counts_after = await _counts(g)
+    await g.__aexit__(None, None, None)
+    return g, counts, counts_after, again, link_statements
+
+
+def test_direct_handler_runs_all_stages():
+    print("🧪 Testing direct ingest through all stages...")
+    g, (n_obs, n_props, n_links) = asyncio.run(_run_direct())
+    print(f"   observations={n_obs}, propositions={n_props}, links={n_links}")
+    assert n_obs == 4
+    assert n_props > 0 and n_links > 0
+    assert all(stats["failed"] == 0 for stats in g._pipeline.stats.values())
+    assert g.ai_client.calls["propose"] == 4
+    print("✅ Direct ingest passed")
+
+
+def test_coalescing_merges_bursts():
+    print("🧪 Testing coalesced proposition generation...")
+    g, (n_obs, _, n_links) = asyncio.run(_run_loop(coalesce_window_ms=200))
+    print(f"   observations={n_obs}, propose calls={g.ai_client.calls['propose']}")
+    # one observation row per update, but one propose call per observer burst
+    assert n_obs == 12
+    assert g.ai_client.calls["propose"] == 2
+    assert n_links >= n_obs
+    print("✅ Coalescing passed")
+
+
+def test_without_coalescing_one_call_per_update():
+    print("🧪 Testing update loop without coalescing...")
+    g, (n_obs, _, _) = asyncio.run(_run_loop(coalesce_window_ms=None))
+    assert n_obs == 12
+    assert g.ai_client.calls["propose"] == 12
+    print("✅ Uncoalesced loop passed")
+
+
+async def _run_frames_side_by_side():
+    g = gum("TestUser", "test-model", data_directory=tempfile.mkdtemp(), verbosity=logging.WARNING)
+    g.ai_client = ScriptedClient()
+    await g.connect_db()
+    futures = [
+        await g.ingest(Update(content=f"Video frame analysis (Frame {i}): editor open",
+                              content_type="input_text"), observer_name="video", wait=False)
+        for i in range(5)
+    ]
+    await asyncio.gather(*futures)
+    counts = await _counts(g)
+    stats = g.write_stats
+    await g.__aexit__(None, None, None)
+    return g, counts, stats
+
+
+def test_frames_keep_their_own_proposition_call():
+    print("🧪 Testing frames ingested side by side...")
+    g, (n_obs, _, n_links), stats = asyncio.run(_run_frames_side_by_side())
+    print(f"   writes={stats['mutations']} in {stats['batches']} commits")
+    assert n_obs == 5 and n_links >= n_obs
+    assert g.ai_client.calls["propose"] == 5
+    # concurrent jobs share commits instead of one per write
+    assert stats["batches"] < stats["mutations"]
+    print("✅ Side-by-side frames passed")
+
+
+def test_batch_links_written_in_bulk():
+    print("🧪 Testing bulk link writes for a batch of frames...")
+    g, (n_obs, n_props, n_links), counts_after, again, link_statements = asyncio.run(
+        _run_batch_with_statement_count())
+    print(f"   link statements={len(link_statements)}, links={n_links}")
+    assert n_obs == 5
+    assert g.ai_client.calls["propose"] == 1
+    assert n_links >= n_obs * 2
+    # one executemany for the candidate pool, at most one more for the revise stage
+    assert 1 <= len(link_statements) <= 3
+    assert again == 2 and counts_after == (n_obs, n_props, n_links)
+    print("✅ Bulk link writes passed")
+
+
+async def _run_api_ingest():
+    g = gum("TestUser", "test-model", data_directory=tempfile.mkdtemp(), verbosity=logging.WARNING)
+    g.ai_client = ScriptedClient()
+    await g.connect_db()
+    tasks_before = len(asyncio.all_tasks())
+    for i in range(20):
+        observer = get_api_observer("api_controller")
+        await g.ingest(Update(content=f"API text {i}", content_type="input_text"),
+                       observer_name=observer.name, wait=False)
+    await g._pipeline.join()
+    tasks_after = len(asyncio.all_tasks())
+    counts = await _counts(g)
+    await g.__aexit__(None, None, None)
+    return counts, tasks_before, tasks_after
+
+
+def test_api_ingest_keeps_task_count_flat():
+    print("🧪 Testing push-style ingest...")
+    assert get_api_observer("api_controller") is get_api_observer("api_controller")
+    (n_obs, _, _), tasks_before, tasks_after = asyncio.run(_run_api_ingest())
+    print(f"   tasks before={tasks_before}, after={tasks_after}")
+    assert n_obs == 20
+    # only the pipeline workers (started lazily) are added, not one task per request
+    assert tasks_after - tasks_before <= len(STAGES) * 4
+    print("✅ Push-style ingest passed")
+
+
+def test_journal_replays_unacknowledged_updates():
+    print("🧪 Testing journal replay after a failed run...")
+    g, pending_after_outage, pending_after_replay = asyncio.run(_run_journal_restart())
+    print(f"   pending after outage={pending_after_outage}, after replay={pending_after_replay}")
+    assert pending_after_outage == 5
+    assert pending_after_replay == 0
+    assert g.ai_client.calls["propose"] == 5
+    print("✅ Journal replay passed")
+
+
+def test_journal_survives_crash_with_queued_updates():
+    print("🧪 Testing journal replay after a crash...")
+    g, journaled, pending, stored, (n_obs, _, _), unlinked, left = asyncio.run(_run_crash_restart())
+    print(f"   journaled={journaled}, stored before crash={stored}, observations after={n_obs}")
+    # queued updates are journaled once and not replayed on top of the queue
+    assert journaled == 8 and pending == 8
+    assert stored > 0
+    # replayed jobs reuse the rows the first run committed
+    assert n_obs == 8 and unlinked == 0
+    assert g.ai_client.calls["propose"] == 8
+    assert left == 0
+    print("✅ Crash replay passed")
+
+
+def test_failed_job_leaves_no_orphan_observation():
+    print("🧪 Testing cleanup after a failed update...")
+    raised, counts = asyncio.run(_run_failed_job())
+    # the observation committed by the persist stage is removed again
+    assert raised
+    assert counts == (0, 0, 0)
+    print("✅ Failed update cleanup passed")
+
+
+def test_journal_watermarks_pause_observers():
+    print("🧪 Testing journal watermarks...")
+    paused, size = asyncio.run(_run_watermarks())
+    assert paused
+    assert size == 3
+    print("✅ Journal watermarks passed")
+
+
+async def _run_search_sessions():
+    # the package exports the gum class under the module's name
+    gum_module = sys.modules["gum.gum"]
+    seen = []
+    search = gum_module.search_propositions_bm25_many
+
+    async def recording(session, *args, **kwargs):
+        seen.append(session.info.get("read_only"))
+        return await search(session, *args, **kwargs)
+
+    gum_module.search_propositions_bm25_many = recording
+    try:
+        g, counts = await _run_direct()
+    finally:
+        gum_module.search_propositions_bm25_many = search
+    return seen, counts
+
+
+def test_candidate_search_outside_writer():
+    print("🧪 Testing the candidate search runs on the read pool...")
+    seen, (_n_obs, n_props, n_links) = asyncio.run(_run_search_sessions())
+    assert seen and all(seen)
+    assert n_props > 0 and n_links > 0
+    print("✅ Candidate search outside the writer passed")
+
+
+async def _run_in_flight():
+    release = asyncio.Event()
+
+    async def slow(job):
+        await release.wait()
+        return True
+
+    pipeline = IngestPipeline([("slow", slow, 1)])
+    fut = await pipeline.submit("Screen", Update(content="hi", content_type="input_text"))
+    await asyncio.sleep(0.01)       # the worker has taken the job off its queue
+    during = (dict(pipeline.depths()), pipeline.in_flight)
+    release.set()
+    await fut
+    after = pipeline.in_flight
+    await pipeline.stop()
+    return during, after
+
+
+def test_in_flight_counts_jobs_inside_workers():
+    print("🧪 Testing in-flight job count...")
+    (depths, in_flight), after = asyncio.run(_run_in_flight())
+    assert depths == {"slow": 0}
+    assert in_flight == 1
+    assert after == 0
+    print("✅ In-flight count passed")
+
+
+if __name__ == "__main__":
+    test_direct_handler_runs_all_stages()
+    test_coalescing_merges_bursts()
+    test_without_coalescing_one_call_per_update()
+    test_batch_links_written_in_bulk()
+    test_frames_keep_their_own_proposition_call()
+    test_api_ingest_keeps_task_count_flat()
+    test_journal_replays_unacknowledged_updates()
+    test_journal_survives_crash_with_queued_updates()
+    test_failed_job_leaves_no_orphan_observation()
+    test_journal_watermarks_pause_observers()
+    test_in_flight_counts_jobs_inside_workers()
+    test_candidate_search_outside_writer()
+    print("🎉 All ingest pipeline tests passed!")
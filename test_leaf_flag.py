@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for the materialized is_leaf flag on propositions.
+
+Checks that revising a proposition clears its flag, that search and the
+listing endpoints skip superseded revisions, and that older databases are
+back-filled.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import delete, select, text
+
+from gum import gum
+from gum.db_utils import search_propositions_bm25
+from gum.models import Proposition, init_db, proposition_parent
+
+
+def _prop(text, group="g", version=1, **kw):
+    return Proposition(text=text, reasoning="because", confidence=5, decay=0,
+                       revision_group=group, version=version, **kw)
+
+
+async def _revise():
+    engine, Session = await init_db("leaf.db", tempfile.mkdtemp())
+    async with Session() as session, session.begin():
+        parent = _prop("User drinks coffee")
+        session.add(parent)
+        await session.flush()
+        child = _prop("User drinks coffee every morning", version=2, parents={parent})
+        session.add(child)
+
+    async with Session() as session, session.begin():
+        flags = dict((await session.execute(select(Proposition.text, Proposition.is_leaf))).all())
+        hits = await search_propositions_bm25(session, "coffee", limit=5, enable_mmr=False)
+        recent = await search_propositions_bm25(session, "", limit=5, enable_mmr=False)
+        plan = " ".join(
+            str(row[-1]) for row in await session.execute(text(
+                "EXPLAIN QUERY PLAN SELECT id FROM propositions "
+                "WHERE is_leaf = 1 ORDER BY created_at DESC LIMIT 5"))
+        )
+
+    async with Session() as session, session.begin():
+        await session.execute(delete(proposition_parent))
+    async with Session() as session:
+        restored = (await session.execute(
+            select(Proposition.is_leaf).where(Proposition.text == "User drinks coffee")
+        )).scalar_one()
+    await engine.dispose()
+    return flags, hits, recent, plan, restored
+
+
+async def _listing():
+    import controller
+    import pytz
+
+    g = gum("APIUser", "test-model", data_directory=tempfile.mkdtemp(),
+            verbosity=logging.WARNING)
+    await g.connect_db()
+
+    async def revise(session):
+        parent = _prop("User drinks coffee")
+        session.add(parent)
+        await session.flush()
+        session.add(_prop("User drinks coffee every morning", version=2, parents={parent}))
+
+    await g.write(revise)
+    previous, controller.gum_instance = controller.gum_instance, g
+    try:
+        today = datetime.now(pytz.timezone("US/Pacific")).strftime("%Y-%m-%d")
+        listing = await controller.get_propositions_by_hour(user_name="APIUser", date=today)
+    finally:
+        controller.gum_instance = previous
+        await g.__aexit__(None, None, None)
+    return [p["text"] for group in listing["hourly_groups"] for p in group["propositions"]]
+
+
+async def _migrate(directory):
+    engine, Session = await init_db("old.db", directory)
+    async with Session() as session:
+        flags = dict((await session.execute(select(Proposition.id, Proposition.is_leaf))).all())
+    await engine.dispose()
+    return flags
+
+
+def test_revision_clears_leaf_flag():
+    print("🧪 Testing is_leaf maintenance...")
+    flags, hits, recent, plan, restored = asyncio.run(_revise())
+    assert flags == {"User drinks coffee": False, "User drinks coffee every morning": True}
+    assert [p.text for p, _ in hits] == ["User drinks coffee every morning"]
+    assert [p.text for p, _ in recent] == ["User drinks coffee every morning"]
+    assert "ix_propositions_leaf_created" in plan
+    assert restored is True
+    print("✅ is_leaf maintenance passed")
+
+
+def test_listing_skips_superseded():
+    print("🧪 Testing is_leaf in the by-hour listing...")
+    assert asyncio.run(_listing()) == ["User drinks coffee every morning"]
+    print("✅ by-hour listing passed")
+
+
+def test_backfill_on_old_database():
+    print("🧪 Testing the is_leaf back-fill...")
+    directory = tempfile.mkdtemp()
+    conn = sqlite3.connect(os.path.join(directory, "old.db"))
+    conn.executescript("""
+        CREATE TABLE propositions (
+            id INTEGER PRIMARY KEY, text TEXT NOT NULL, reasoning TEXT NOT NULL,
+            confidence INTEGER, decay INTEGER,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+            revision_group VARCHAR(36) NOT NULL, version INTEGER DEFAULT 1 NOT NULL
+        );
+        CREATE TABLE proposition_parent (
+            child_id INTEGER NOT NULL, parent_id INTEGER NOT NULL,
+            PRIMARY KEY (child_id, parent_id)
+        );
+        INSERT INTO propositions (id, text, reasoning, revision_group) VALUES
+            (1, 'old', 'r', 'g'), (2, 'new', 'r', 'g'), (3, 'other', 'r', 'h');
+        INSERT INTO proposition_parent VALUES (2, 1);
+    """)
+    conn.close()
+
+    assert asyncio.run(_migrate(directory)) == {1: False, 2: True, 3: True}
+    print("✅ is_leaf back-fill passed")
+
+
+if __name__ == "__main__":
+    test_revision_clears_leaf_flag()
+    test_listing_skips_superseded()
+    test_backfill_on_old_database()
+    print("🎉 All leaf-flag tests passed!")
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM response cache.
+
+Covers the memory and SQLite tiers, TTL expiry, the disk cap, and the
+opt-in caching path of UnifiedAIClient.text_completion (provider call stubbed).
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from llm_cache import ResponseCache, cache_from_env
+from unified_ai_client import UnifiedAIClient
+
+
+def test_disk_tier_survives_restart():
+    print("🧪 Testing disk tier...")
+    path = os.path.join(tempfile.mkdtemp(), "cache.db")
+    key = ResponseCache.make_key("azure", "gpt-4o", [{"role": "user", "content": "hi"}], temperature=0.1)
+
+    cache = ResponseCache(path)
+    assert cache.get(key) is None
+    cache.put(key, '{"propositions": []}')
+    cache.close()
+
+    cache = ResponseCache(path)
+    assert cache.get(key) == '{"propositions": []}'
+    assert cache.get(key) == '{"propositions": []}'
+    stats = cache.get_stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+    print("✅ Disk tier passed")
+
+
+def test_ttl_and_size_caps():
+    print("🧪 Testing TTL and size caps...")
+    cache = ResponseCache(os.path.join(tempfile.mkdtemp(), "cache.db"),
+                          memory_entries=2, ttl_seconds=0.2, max_disk_entries=3)
+    for i in range(5):
+        cache.put(f"k{i}", f"v{i}")
+    assert cache.get_stats()["memory_entries"] == 2
+    cache.prune()
+    assert cache.get_stats()["disk_entries"] == 3
+
+    time.sleep(0.25)
+    assert cache.get("k4") is None
+    cache.prune()
+    assert cache.get_stats()["disk_entries"] == 0
+    print("✅ TTL and size caps passed")
+
+
+async def _async_disk_round_trip(path):
+    cache = ResponseCache(path)
+    loop_thread = threading.get_ident()
+    disk_threads = set()
+    disk_get = cache._disk_get
+
+    def recording(key):
+        disk_threads.add(threading.get_ident())
+        return disk_get(key)
+
+    cache._disk_get = recording
+    await cache.aput("k", "v")
+    cache._memory.clear()
+    first = await cache.aget("k")
+    await cache.adiscard("k")
+    cache._memory.clear()
+    second = await cache.aget("k")
+    cache.close()
+    return first, second, loop_thread in disk_threads, bool(disk_threads)
+
+
+def test_async_disk_access_off_the_loop():
+    print("🧪 Testing async disk access...")
+    path = os.path.join(tempfile.mkdtemp(), "cache.db")
+    first, second, on_loop, used_disk = asyncio.run(_async_disk_round_trip(path))
+    assert (first, second) == ("v", None)
+    assert used_disk and not on_loop
+    print("✅ Async disk access passed")
+
+
+def test_disk_tier_is_opt_in():
+    print("🧪 Testing cache settings from the environment...")
+    path = os.path.join(tempfile.mkdtemp(), "cache.db")
+    saved = {k: os.environ.pop(k, None) for k in ("LLM_CACHE_ENABLED", "LLM_CACHE_DISK", "LLM_CACHE_PATH")}
+    try:
+        os.environ["LLM_CACHE_PATH"] = path
+        assert cache_from_env()._conn is None
+        assert not os.path.exists(path)
+        os.environ["LLM_CACHE_DISK"] = "true"
+        cache = cache_from_env()
+        assert cache._conn is not None
+        cache.close()
+        os.environ["LLM_CACHE_ENABLED"] = "false"
+        assert cache_from_env() is None
+    finally:
+        for k, v in saved.items():
+            os.environ.pop(k, None)
+            if v is not None:
+                os.environ[k] = v
+    print("✅ Disk tier opt-in passed")
+
+
+async def _client_calls():
+    client = UnifiedAIClient(cache=ResponseCache(memory_entries=8))
+    calls = []
+
+    async def fake_completion(messages, max_tokens, temperature, response_format=None):
+        calls.append(messages)
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    client._text_completion = fake_completion
+    messages = [{"role": "user", "content": "label these"}]
+
+    # concurrent identical requests share one provider call
+    await asyncio.gather(*[client.text_completion(messages, cache=True) for _ in range(3)])
+    await client.text_completion(messages, cache=True)
+    cached_calls = len(calls)
+    await client.text_completion(messages)  # not opted in
+    return cached_calls, len(calls), client.cache_stats()
+
+
+def test_client_opt_in():
+    print("🧪 Testing UnifiedAIClient caching...")
+    cached_calls, total_calls, stats = asyncio.run(_client_calls())
+    assert cached_calls == 1
+    assert total_calls == 2
+    assert stats["memory_hits"] == 1
+    print("✅ Client caching passed")
+
+
+async def _client_validation():
+    client = UnifiedAIClient(cache=ResponseCache(memory_entries=8))
+    answers = iter(['{"propositions": [', '{"propositions": []}'])
+    calls = []
+
+    async def fake_completion(messages, max_tokens, temperature, response_format=None):
+        calls.append(messages)
+        return next(answers)
+
+    client._text_completion = fake_completion
+    messages = [{"role": "user", "content": "propose"}]
+
+    def parses(text):
+        return text.endswith("}")
+
+    first = await client.text_completion(messages, cache=True, validate=parses)
+    # the truncated answer was not cached, so the retry reaches the provider
+    second = await client.text_completion(messages, cache=True, validate=parses)
+    third = await client.text_completion(messages, cache=True, validate=parses)
+
+    # an entry that fails validation is dropped and fetched again
+    key = ResponseCache.make_key(client.text_provider, client._text_model(), messages,
+                                 max_tokens=1000, temperature=0.1, response_format=None)
+    client.cache.put(key, "not json")
+    answers = iter(['{"propositions": []}'])
+    fourth = await client.text_completion(messages, cache=True, validate=parses)
+    return first, second, third, fourth, len(calls)
+
+
+def test_client_caches_only_valid_responses():
+    print("🧪 Testing that unparsable responses are not cached...")
+    first, second, third, fourth, n_calls = asyncio.run(_client_validation())
+    assert first == '{"propositions": ['
+    assert second == third == fourth == '{"propositions": []}'
+    assert n_calls == 3
+    print("✅ Response validation passed")
+
+
+if __name__ == "__main__":
+    test_disk_tier_survives_restart()
+    test_ttl_and_size_caps()
+    test_async_disk_access_off_the_loop()
+    test_disk_tier_is_opt_in()
+    test_client_opt_in()
+    test_client_caches_only_valid_responses()
+    print("🎉 All LLM cache tests passed!")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared MMR selection.
+
+The vectorized selection must pick the same suggestions as the old
+per-pair cosine_similarity loop. Timing is left to ``benchmark()``, which
+only runs when this file is executed directly.
+"""
+
+import os
+import random
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from gum.mmr import mmr_select
+from gum.suggestion_engine import ScoredSuggestion, SuggestionDeduplicator
+
+WORDS = ("focus deadline review code email meeting design chess notes budget "
+         "travel draft slides client refactor tests deploy invoice research").split()
+
+
+def _suggestions(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        ScoredSuggestion(
+            title=" ".join(rng.sample(WORDS, 3)),
+            description=" ".join(rng.choices(WORDS, k=12)),
+            evidence="", benefit=0.5, false_negative_cost=0.5, novelty=0.5, decay=0.5,
+            priority=rng.random(), tool="gum_suggestions", action_items=[],
+            category="workflow", priority_explanation="", bundle_info={},
+        )
+        for _ in range(n)
+    ]
+
+
+def _loop_mmr(suggestions, k, lambda_param=0.7):
+    """The per-pair selection SuggestionDeduplicator used before."""
+    texts = [f"{s.title} {s.description}" for s in suggestions]
+    tfidf_matrix = TfidfVectorizer(max_features=1000, stop_words="english",
+                                   ngram_range=(1, 2)).fit_transform(texts)
+    remaining = list(range(len(suggestions)))
+    first = max(remaining, key=lambda i: suggestions[i].priority)
+    selected = [first]
+    remaining.remove(first)
+    while len(selected) < k and remaining:
+        best_score, best_idx = -float("inf"), None
+        for i in remaining:
+            max_similarity = max(
+                cosine_similarity(tfidf_matrix[i], tfidf_matrix[j])[0][0] for j in selected
+            )
+            score = lambda_param * suggestions[i].priority - (1 - lambda_param) * max_similarity
+            if score > best_score:
+                best_score, best_idx = score, i
+        selected.append(best_idx)
+        remaining.remove(best_idx)
+    return selected
+
+
+def benchmark(n=200, k=8):
+    """Time the old loop against the shared selection; returns (loop_s, vectorized_s)."""
+    suggestions = _suggestions(n)
+    started = time.perf_counter()
+    expected = _loop_mmr(suggestions, k)
+    loop_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    chosen = SuggestionDeduplicator()._apply_mmr(suggestions, k)
+    vectorized_s = time.perf_counter() - started
+
+    assert [suggestions.index(s) for s in chosen] == expected
+    return loop_s, vectorized_s
+
+
+def test_mmr_select_basics():
+    print("🧪 Testing mmr_select...")
+    vecs = np.array([[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]])
+    # the duplicate of the top row loses to the orthogonal one
+    assert mmr_select(np.array([1.0, 0.9, 0.5]), vecs, 2) == [0, 2]
+    assert mmr_select(np.array([1.0, 0.9, 0.5]), vecs, 2, lambda_param=1.0) == [0, 1]
+    assert mmr_select(np.array([0.2, 0.1]), vecs[:2], 5) == [0, 1]
+    assert mmr_select(np.array([]), np.zeros((0, 2)), 3) == []
+    print("✅ mmr_select passed")
+
+
+def test_matches_loop():
+    print("🧪 Testing MMR against the per-pair loop...")
+    for n, k in ((1, 3), (12, 5), (60, 8)):
+        suggestions = _suggestions(n, seed=n)
+        chosen = SuggestionDeduplicator()._apply_mmr(suggestions, k)
+        assert [suggestions.index(s) for s in chosen] == _loop_mmr(suggestions, k)
+    print("✅ Vectorized MMR matches the loop")
+
+
+def test_selection_reuses_dedup_fit():
+    print("🧪 Testing the TF-IDF fit is shared...")
+    dedup = SuggestionDeduplicator()
+    suggestions = _suggestions(30, seed=1)
+    kept = dedup.deduplicate_suggestions(suggestions)
+    fitted = dedup._fitted
+    dedup.select_diverse_suggestions(kept, max_suggestions=5, max_per_category=30)
+    assert dedup._fitted is fitted
+    print("✅ TF-IDF fit reused")
+
+
+if __name__ == "__main__":
+    test_mmr_select_basics()
+    test_matches_loop()
+    test_selection_reuses_dedup_fit()
+    loop_s, vectorized_s = benchmark()
+    print(f"⏱️  MMR at n=200: loop {loop_s * 1000:.1f}ms, vectorized "
+          f"{vectorized_s * 1000:.1f}ms ({loop_s / vectorized_s:.0f}x)")
+    print("🎉 All MMR tests passed!")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test script for content-addressed observation deduplication.
+
+Checks the hashing helpers and that a repeated screen transcription is stored
+and linked to the earlier propositions without another round of model calls.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import select
+
+from gum import gum
+from gum.dedup import DedupPolicy, simhash, similarity
+from gum.models import observation_proposition
+from gum.schemas import Update
+from test_ingest_pipeline import ScriptedClient
+
+
+class _Named:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_simhash_ignores_noise():
+    print("🧪 Testing SimHash normalization...")
+    a = simhash("Reading the asyncio docs - 10:01 AM, tab 3 of 7")
+    b = simhash("reading the   asyncio docs -- 10:02 am, tab 4 of 7")
+    c = simhash("Composing an email to the landlord about the heating")
+    assert similarity(a, b) == 1.0
+    assert similarity(a, c) < 0.95
+    print("✅ SimHash normalization passed")
+
+
+def test_simhash_other_scripts():
+    print("🧪 Testing SimHash on non-Latin text...")
+    a = simhash("用户正在编写电子邮件给同事")
+    b = simhash("用户正在阅读异步编程文档")
+    assert a is not None and b is not None
+    assert similarity(a, b) < 0.95
+    assert similarity(simhash("Пользователь читает документацию"),
+                      simhash("Пользователь пишет письмо коллеге")) < 0.95
+    # nothing left after normalization, or too little for one shingle: never near-matched
+    assert simhash("12:30 45% 2026") is None
+    assert simhash("Inbox") is None
+    print("✅ Non-Latin SimHash passed")
+
+
+async def _run(policies):
+    g = gum("TestUser", "test-model", data_directory=tempfile.mkdtemp(),
+            verbosity=logging.WARNING, dedup_policies=policies)
+    g.ai_client = ScriptedClient()
+    await g.connect_db()
+
+    screen = _Named("Screen")
+    for minute in (1, 2, 3):
+        await g._default_handler(screen, Update(
+            content=f"Reading the asyncio docs at 10:0{minute}", content_type="input_text"))
+
+    async with g._session() as session:
+        links = (await session.execute(select(observation_proposition))).all()
+    await g.__aexit__(None, None, None)
+
+    by_obs = {}
+    for obs_id, prop_id in links:
+        by_obs.setdefault(obs_id, set()).add(prop_id)
+    return g, by_obs
+
+
+async def _run_concurrent():
+    g = gum("TestUser", "test-model", data_directory=tempfile.mkdtemp(),
+            verbosity=logging.WARNING, dedup_policies={"Screen": DedupPolicy(window_seconds=60)})
+    g.ai_client = ScriptedClient()
+    await g.connect_db()
+
+    def docs(minute):
+        return Update(content=f"Reading the asyncio docs at 10:0{minute}", content_type="input_text")
+
+    def email(minute):
+        return Update(content=f"Composing an email to the landlord at 10:0{minute}", content_type="input_text")
+
+    # all admitted before the first job has any propositions to copy
+    futures = [await g.ingest(docs(m), observer_name="Screen", wait=False) for m in range(1, 5)]
+    futures.append(await g.ingest([docs(5), docs(6)], observer_name="Screen", wait=False))
+    futures.append(await g.ingest([email(1), email(2)], observer_name="Screen", wait=False))
+    await asyncio.gather(*futures)
+
+    async with g._session() as session:
+        links = (await session.execute(select(observation_proposition))).all()
+    await g.__aexit__(None, None, None)
+
+    by_obs = {}
+    for obs_id, prop_id in links:
+        by_obs.setdefault(obs_id, set()).add(prop_id)
+    return g, by_obs
+
+
+def test_duplicates_reuse_propositions():
+    print("🧪 Testing duplicate observations skip the model...")
+    g, by_obs = asyncio.run(_run({"Screen": DedupPolicy(window_seconds=60)}))
+    assert g.ai_client.calls["propose"] == 1
+    assert g.dedup_stats == {"checked": 3, "duplicates": 2}
+    # every copy points at the propositions of the first observation
+    assert len(by_obs) == 3
+    assert by_obs[2] == by_obs[3] and by_obs[2] <= by_obs[1]
+    print("✅ Duplicate reuse passed")
+
+
+def test_concurrent_duplicates_wait_for_original():
+    print("🧪 Testing duplicates of observations still being ingested...")
+    g, by_obs = asyncio.run(_run_concurrent())
+    assert g.ai_client.calls["propose"] == 2
+    assert g.dedup_stats == {"checked": 8, "duplicates": 6}
+    # no copy is left without the propositions of its original
+    assert sorted(by_obs) == list(range(1, 9))
+    # the email job may revise a docs proposition and link the child to any of
+    # the docs rows, so only compare what the docs rows do not share with it
+    docs_only = by_obs[1] - by_obs[7]
+    assert docs_only and all(docs_only <= by_obs[i] for i in range(2, 7))
+    assert by_obs[8]
+    print("✅ Concurrent duplicates passed")
+
+
+def test_dedup_is_per_observer():
+    print("🧪 Testing observers without a policy...")
+    g, _ = asyncio.run(_run({"Other": DedupPolicy()}))
+    assert g.ai_client.calls["propose"] == 3
+    assert g.dedup_stats["checked"] == 0
+    print("✅ Per-observer policy passed")
+
+
+if __name__ == "__main__":
+    test_simhash_ignores_noise()
+    test_simhash_other_scripts()
+    test_duplicates_reuse_propositions()
+    test_concurrent_duplicates_wait_for_original()
+    test_dedup_is_per_observer()
+    print("🎉 All observation dedup tests passed!")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script for the gum.query result cache.
+
+Repeated queries must be answered from memory, and any proposition or link
+write must invalidate what was cached, including results read while the
+write was still uncommitted.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gum import gum
+from gum.db_utils import LinkBatch
+from gum.models import Observation, Proposition
+from gum.query_cache import QueryCache
+
+
+def _prop(text):
+    return Proposition(text=text, reasoning="seen on screen", confidence=5, decay=0,
+                       revision_group=text[:30])
+
+
+async def _run(**kwargs):
+    g = gum("TestUser", "test-model", data_directory=tempfile.mkdtemp(),
+            verbosity=logging.WARNING, **kwargs)
+    await g.connect_db()
+    async with g._session() as session:
+        session.add(_prop("User is learning Go"))
+
+    statuses = []
+    for query in ("learning go", "  Learning   GO "):
+        _, status = await g.query_with_cache_status(query, limit=5)
+        statuses.append(status)
+
+    async with g._session() as session:
+        prop = _prop("User is learning Go generics")
+        obs = Observation(observer_name="Screen", content="go.dev", content_type="input_text")
+        session.add_all([prop, obs])
+        await session.flush()
+        await LinkBatch().add([obs.id], [prop.id]).flush(session)
+
+    results, status = await g.query_with_cache_status("learning go", limit=5)
+    statuses.append(status)
+    await g.__aexit__(None, None, None)
+    return statuses, len(results), g
+
+
+async def _read_during_write():
+    g = gum("TestUser", "test-model", data_directory=tempfile.mkdtemp(),
+            verbosity=logging.WARNING)
+    await g.connect_db()
+    await g.write(lambda session: _add(session, _prop("User is learning Go")))
+
+    async def add_and_read(session):
+        session.add(_prop("User is learning Go generics"))
+        await session.flush()
+        # the reader still sees the committed snapshot with one match
+        results, _ = await g.query_with_cache_status("learning go", limit=5)
+        return len(results)
+
+    during = await g.write(add_and_read)
+    results, status = await g.query_with_cache_status("learning go", limit=5)
+    await g.__aexit__(None, None, None)
+    return during, len(results), status
+
+
+async def _add(session, row):
+    session.add(row)
+
+
+def test_repeated_queries_hit_the_cache():
+    print("🧪 Testing the query result cache...")
+    statuses, n_results, g = asyncio.run(_run())
+    assert statuses == ["MISS", "HIT", "MISS"]
+    assert n_results == 2
+    assert g.query_cache_stats["hits"] == 1
+    assert g.data_generation > 0
+    print("✅ Query result cache passed")
+
+
+def test_read_during_uncommitted_write_is_not_served():
+    print("🧪 Testing a cached read taken while a write was uncommitted...")
+    during, after, status = asyncio.run(_read_during_write())
+    assert during == 1
+    assert status == "MISS"
+    assert after == 2
+    print("✅ Uncommitted write invalidation passed")
+
+
+def test_cache_can_be_disabled():
+    print("🧪 Testing a disabled query cache...")
+    statuses, _, g = asyncio.run(_run(query_cache_size=0))
+    assert statuses == ["BYPASS"] * 3
+    assert g.query_cache_stats == {}
+    print("✅ Disabled query cache passed")
+
+
+def test_lru_and_ttl():
+    print("🧪 Testing cache bounds...")
+    cache = QueryCache(max_entries=2, ttl_seconds=60)
+    for n in range(3):
+        cache.put(n, 0, [n])
+    assert cache.get(0, 0) is None
+    assert cache.get(2, 0) == [2]
+    assert cache.get(2, 1) is None          # newer data generation
+
+    expired = QueryCache(ttl_seconds=0)
+    expired.put("q", 0, [1])
+    assert expired.get("q", 0) is None
+    print("✅ Cache bounds passed")
+
+
+if __name__ == "__main__":
+    test_repeated_queries_hit_the_cache()
+    test_read_during_uncommitted_write_is_not_served()
+    test_cache_can_be_disabled()
+    test_lru_and_ttl()
+    print("🎉 All query cache tests passed!")
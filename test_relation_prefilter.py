@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for the local relation prefilter.
+
+Checks that near-verbatim propositions are labelled IDENTICAL, clearly
+different ones UNRELATED, and that only the ambiguous band reaches the model.
+"""
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gum.models import Proposition
+from gum.relations import LocalRelationClassifier
+
+
+def _prop(pid, text):
+    return Proposition(id=pid, text=text, reasoning="")
+
+
+def test_identical_and_unrelated_are_settled_locally():
+    print("🧪 Testing clear-cut labels...")
+    clf = LocalRelationClassifier()
+    props = [
+        _prop(1, "Arnav is building a FastAPI backend for his startup"),
+        _prop(2, "Arnav is building a FastAPI backend for his startup."),
+        _prop(3, "Enjoys cooking spicy Thai curries on weekends"),
+    ]
+    local = clf.classify(props)
+    assert local.identical == {1, 2}
+    assert local.unrelated == {3}
+    assert local.ambiguous == []
+    assert clf.stats["llm_calls_avoided"] == 1
+    print("✅ Clear-cut labels passed")
+
+
+def test_middle_band_goes_to_model():
+    print("🧪 Testing ambiguous candidates...")
+    clf = LocalRelationClassifier()
+    props = [
+        _prop(1, "Arnav writes Python code in VS Code"),
+        _prop(2, "Arnav debugs Python tests in the terminal"),
+        _prop(3, "Enjoys cooking spicy Thai curries on weekends"),
+    ]
+    local = clf.classify(props)
+    assert {p.id for p in local.ambiguous} == {1, 2}
+    assert local.unrelated == {3}
+    assert clf.stats["llm_calls"] == 1
+    print("✅ Ambiguous candidates passed")
+
+
+def test_threshold_validation():
+    print("🧪 Testing threshold validation...")
+    try:
+        LocalRelationClassifier(identical_threshold=0.2, unrelated_threshold=0.5)
+    except ValueError:
+        print("✅ Threshold validation passed")
+        return
+    raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    test_identical_and_unrelated_are_settled_locally()
+    test_middle_band_goes_to_model()
+    test_threshold_validation()
+    print("🎉 All relation prefilter tests passed!")
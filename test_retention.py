@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test script for the retention engine and the monthly archives.
+
+Old observations, superseded propositions and delivered suggestions must
+move to per-month archive databases that stay searchable, while live
+revisions keep their leaf flags and the freed pages are given back.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import func, insert, select
+
+from gum import gum
+from gum.db_maintenance import DatabaseMaintenance
+from gum.models import (
+    Observation,
+    Proposition,
+    Suggestion,
+    observation_blobs,
+    observation_proposition,
+    proposition_parent,
+)
+from gum.retention import RetentionPolicy, archive_months, archive_path
+
+OLD, RECENT = 30, 5
+POLICIES = {
+    "observations": RetentionPolicy(max_age_days=180, batch_size=8),
+    "propositions": RetentionPolicy(max_age_days=90),
+    "suggestions": RetentionPolicy(max_age_days=30),
+}
+
+
+def _transcript(i):
+    body = "".join(f"- step {n}: reviewing the quarterly budget sheet\n" for n in range(150))
+    return f"**Application Name:** Excel\n{body}Saved workbook zqtail{i}\n"
+
+
+async def _seed(Session):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    async with Session() as session, session.begin():
+        obs_ids = (await session.execute(insert(Observation).returning(Observation.id), [
+            dict(observer_name="Screen", content=_transcript(i), content_type="input_text",
+                 created_at=now - timedelta(days=(200 if i % 2 else 240) if i < OLD else 1))
+            for i in range(OLD + RECENT)
+        ])).scalars().all()
+
+        def prop(text, days, **kw):
+            return Proposition(text=text, reasoning="r", confidence=6, revision_group="budget",
+                               created_at=now - timedelta(days=days), **kw)
+
+        old_parent = prop("User maintains a quarterly budget", 120)
+        recent_parent = prop("User reviews spreadsheets weekly", 10)
+        session.add_all([old_parent, recent_parent])
+        await session.flush()
+        child = prop("User maintains a quarterly budget in Excel", 120, version=2,
+                     parents={old_parent, recent_parent})
+        session.add(child)
+        await session.flush()
+        await session.execute(insert(observation_proposition), [
+            dict(observation_id=obs_ids[0], proposition_id=old_parent.id),
+            dict(observation_id=obs_ids[-1], proposition_id=child.id),
+        ])
+        session.add_all([
+            Suggestion(title="Automate the budget export", description="d", category="workflow",
+                       rationale="r", batch_id="b", delivered=True,
+                       created_at=now - timedelta(days=60)),
+            Suggestion(title="Pin the budget sheet", description="d", category="workflow",
+                       rationale="r", batch_id="b", delivered=False,
+                       created_at=now - timedelta(days=60)),
+        ])
+        return obs_ids, old_parent.id, recent_parent.id, child.id
+
+
+async def _integrity(engine):
+    async with engine.connect() as conn:
+        for table in ("observations_fts", "propositions_fts"):
+            await conn.exec_driver_sql(
+                f"INSERT INTO {table}({table}, rank) VALUES('integrity-check', 1)"
+            )
+
+
+async def _page_count(engine):
+    async with engine.connect() as conn:
+        return (await conn.exec_driver_sql("PRAGMA page_count")).scalar()
+
+
+async def _retain():
+    directory = tempfile.mkdtemp()
+    g = gum("TestUser", "test-model", data_directory=directory, fts_maintenance_interval=None,
+            cold_storage_days=30, retention_policies=POLICIES, verbosity=logging.WARNING)
+    await g.connect_db()
+    obs_ids, old_parent, recent_parent, child = await _seed(g.Session)
+    cold = await g.move_to_cold_storage()
+    pages_before = await _page_count(g.engine)
+
+    moved = await g.apply_retention()
+    again = await g.apply_retention()
+
+    async with g._read_session() as session:
+        live = {
+            "observations": (await session.execute(select(Observation.id))).scalars().all(),
+            "blobs": (await session.execute(select(func.count()).select_from(observation_blobs))).scalar(),
+            "propositions": dict((await session.execute(
+                select(Proposition.id, Proposition.is_leaf))).all()),
+            "parents": (await session.execute(select(proposition_parent))).all(),
+            "suggestions": (await session.execute(select(Suggestion.title))).scalars().all(),
+        }
+    await _integrity(g.engine)
+
+    maintenance = DatabaseMaintenance(g.engine, vacuum_pages=100_000)
+    await maintenance.run_once()
+    pages_after = await _page_count(g.engine)
+    async with g.engine.connect() as conn:
+        auto_vacuum = (await conn.exec_driver_sql("PRAGMA auto_vacuum")).scalar()
+
+    hits = await g.search_archive("zqtail3")
+    prop_hits = await g.search_archive("quarterly budget", include_observations=False)
+    months = archive_months(g.archive_directory)
+    paths = [archive_path(g.archive_directory, m) for m in months]
+    await g.__aexit__(None, None, None)
+    return dict(
+        ids=(obs_ids, old_parent, recent_parent, child), cold=cold, moved=moved, again=again,
+        live=live, pages=(pages_before, pages_after), auto_vacuum=auto_vacuum,
+        free_pages=maintenance.stats["free_pages"], hits=hits, prop_hits=prop_hits,
+        months=months, paths=paths,
+    )
+
+
+def test_retention_archives_by_month():
+    print("🧪 Testing the retention engine...")
+    r = asyncio.run(_retain())
+    obs_ids, old_parent, recent_parent, child = r["ids"]
+
+    assert r["cold"] == OLD
+    assert r["moved"] == {"observations": OLD, "propositions": 1, "suggestions": 1}
+    assert r["again"] == {"observations": 0, "propositions": 0, "suggestions": 0}
+
+    live = r["live"]
+    assert sorted(live["observations"]) == sorted(obs_ids[OLD:])
+    assert live["blobs"] == 0
+    # the child stays a leaf, its remaining live parent stays superseded
+    assert live["propositions"] == {recent_parent: False, child: True}
+    assert [tuple(row) for row in live["parents"]] == [(child, recent_parent)]
+    assert live["suggestions"] == ["Pin the budget sheet"]
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    assert r["months"] == sorted({
+        (now - timedelta(days=days)).strftime("%Y-%m") for days in (240, 200, 120, 60)
+    })
+    archived = {}
+    for path in r["paths"]:
+        # archives are self-contained: full text, readable without gum
+        conn = sqlite3.connect(path)
+        for table in ("observations", "propositions", "suggestions", "proposition_parent"):
+            archived.setdefault(table, []).extend(conn.execute(f"SELECT * FROM {table}").fetchall())
+        archived.setdefault("contents", []).extend(
+            row[0] for row in conn.execute("SELECT content FROM observations"))
+        conn.close()
+    assert len(archived["observations"]) == OLD
+    assert sorted(archived["contents"]) == sorted(_transcript(i) for i in range(OLD))
+    assert len(archived["propositions"]) == 1 and len(archived["suggestions"]) == 1
+    assert (child, old_parent) in archived["proposition_parent"]
+
+    assert [(h["kind"], h["id"]) for h in r["hits"]] == [("observation", obs_ids[3])]
+    assert [h["id"] for h in r["prop_hits"]] == [old_parent]
+
+    pages_before, pages_after = r["pages"]
+    assert r["auto_vacuum"] == 2
+    assert r["free_pages"] == 0 and pages_after < pages_before
+    print(f"✅ Archived into {len(r['months'])} months, {pages_before} → {pages_after} pages")
+
+
+if __name__ == "__main__":
+    test_retention_archives_by_month()
+    print("🎉 All retention tests passed!")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test script for recency decay applied inside the candidate query.
+
+A stale proposition with a stronger BM25 match must not take the only
+candidate slot from a fresh one once decay is taken into account.
+"""
+
+import asyncio
+import math
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import func, select
+
+from gum.db_utils import K_DECAY, search_propositions_bm25
+from gum.models import Proposition, init_db
+
+
+async def _search(enable_decay):
+    engine, Session = await init_db("decay.db", tempfile.mkdtemp())
+    now = datetime.now(timezone.utc)
+    async with Session() as session, session.begin():
+        session.add_all([
+            Proposition(text="User plays chess chess chess", reasoning="chess openings",
+                        confidence=5, decay=1, revision_group="old",
+                        created_at=now - timedelta(days=3)),
+            Proposition(text="User plays chess online", reasoning="a blitz game",
+                        confidence=5, decay=1, revision_group="new",
+                        created_at=now - timedelta(hours=1)),
+        ])
+    async with Session() as session:
+        hits = await search_propositions_bm25(
+            session, "chess", limit=1, enable_mmr=False, enable_decay=enable_decay)
+        factor = (await session.execute(select(func.gum_decay(1, 3.0, K_DECAY)))).scalar_one()
+    await engine.dispose()
+    return [p.revision_group for p, _ in hits], factor
+
+
+def test_decay_chooses_the_pool():
+    print("🧪 Testing decay-aware candidate selection...")
+    assert asyncio.run(_search(enable_decay=False))[0] == ["old"]
+    groups, factor = asyncio.run(_search(enable_decay=True))
+    assert groups == ["new"]
+    assert math.isclose(factor, math.exp(-1 * K_DECAY * 3.0))
+    print("✅ Decay-aware candidate selection passed")
+
+
+if __name__ == "__main__":
+    test_decay_chooses_the_pool()
+    print("🎉 All search decay tests passed!")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for profiled proposition search.
+
+A profiled search must return the same results as a plain one, time each
+stage, tag every statement with its stage and explain the candidate query.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gum.db_utils import search_propositions_bm25
+from gum.models import Proposition, init_db
+from gum.search_profile import SearchProfile
+
+
+async def _search():
+    engine, Session = await init_db("profile.db", tempfile.mkdtemp())
+    now = datetime.now(timezone.utc)
+    async with Session() as session, session.begin():
+        session.add_all([
+            Proposition(text=f"User plays chess variant {i}", reasoning="chess openings",
+                        confidence=5, decay=1, revision_group=f"g{i}",
+                        created_at=now - timedelta(hours=i))
+            for i in range(6)
+        ])
+    async with Session() as session:
+        plain = await search_propositions_bm25(session, "chess", limit=3)
+        profile = SearchProfile()
+        profiled = await search_propositions_bm25(session, "chess", limit=3, profile=profile)
+    await engine.dispose()
+    return plain, profiled, profile
+
+
+def test_profiled_search():
+    print("🧪 Testing profiled search...")
+    plain, profiled, profile = asyncio.run(_search())
+    assert [p.id for p, _ in plain] == [p.id for p, _ in profiled]
+
+    report = profile.as_dict()
+    assert {"candidates", "scoring", "term_vectors", "mmr"} <= set(report["stages_ms"])
+    assert report["rows"] == {"candidates": 6, "returned": 3}
+    assert report["statements"]
+    assert all(s["stage"] for s in report["statements"])
+    assert any("propositions_fts" in line for line in report["plan"])
+    print("✅ Profiled search passed")
+
+
+if __name__ == "__main__":
+    test_profiled_search()
+    print("🎉 All search profile tests passed!")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test script for slim proposition loading.
+
+Loading propositions must not pull their observations or parents along:
+statements and ORM rows are counted while listing and searching a
+proposition with hundreds of linked observations.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from collections import Counter
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import selectinload
+
+from gum.db_utils import PROPOSITION_SUMMARY, search_propositions_bm25, search_propositions_bm25_many
+from gum.models import Observation, Proposition, init_db, observation_proposition, proposition_parent
+
+LINKED = 300
+
+
+class LoadCounter:
+    """Counts SQL statements and the ORM instances they materialise."""
+
+    def __init__(self, engine):
+        self.statements = 0
+        self.instances = Counter()
+        event.listen(engine.sync_engine, "after_cursor_execute", self._statement)
+        for cls in (Observation, Proposition):
+            event.listen(cls, "load", self._load)
+
+    def _statement(self, *args):
+        self.statements += 1
+
+    def _load(self, target, _context):
+        self.instances[type(target).__name__] += 1
+
+    def reset(self):
+        self.statements = 0
+        self.instances.clear()
+
+    def close(self, engine):
+        event.remove(engine.sync_engine, "after_cursor_execute", self._statement)
+        for cls in (Observation, Proposition):
+            event.remove(cls, "load", self._load)
+
+
+async def _seed(Session):
+    async with Session() as session, session.begin():
+        parents = [Proposition(text=f"User drinks tea {i}", reasoning="r", confidence=5,
+                               revision_group="tea") for i in range(2)]
+        session.add_all(parents)
+        await session.flush()
+        popular = Proposition(text="User drinks green tea while coding", reasoning="r",
+                              confidence=8, version=2, revision_group="tea", parents=set(parents))
+        session.add(popular)
+        await session.flush()
+        obs_ids = (await session.execute(
+            insert(Observation).returning(Observation.id),
+            [dict(observer_name="screen", content=f"Tea cup next to editor {i}",
+                  content_type="input_text") for i in range(LINKED)],
+        )).scalars().all()
+        await session.execute(insert(observation_proposition), [
+            dict(observation_id=o, proposition_id=popular.id) for o in obs_ids
+        ])
+        return popular.id
+
+
+async def _load_paths():
+    engine, Session = await init_db("slim.db", tempfile.mkdtemp())
+    pid = await _seed(Session)
+    counter = LoadCounter(engine)
+    loads = {}
+
+    async with Session() as session:
+        counter.reset()
+        props = (await session.execute(select(Proposition))).scalars().all()
+        loads["entity"] = (counter.statements, dict(counter.instances))
+        try:
+            props[0].observations
+            loads["raises"] = False
+        except InvalidRequestError:
+            loads["raises"] = True
+
+    async with Session() as session:
+        counter.reset()
+        rows = (await session.execute(select(*PROPOSITION_SUMMARY))).all()
+        loads["summary"] = (counter.statements, dict(counter.instances), rows[0]._fields)
+
+    async with Session() as session:
+        counter.reset()
+        hits = await search_propositions_bm25(session, "tea", limit=3)
+        await search_propositions_bm25_many(session, ["tea", "coding"], limit=3)
+        loads["search"] = (len(hits), dict(counter.instances))
+
+    async with Session() as session:
+        counter.reset()
+        popular = (await session.execute(
+            select(Proposition).where(Proposition.id == pid)
+            .options(selectinload(Proposition.observations), selectinload(Proposition.parents))
+        )).scalar_one()
+        loads["explicit"] = (len(popular.observations), len(popular.parents),
+                             dict(counter.instances))
+
+    counter.close(engine)
+    async with Session() as session:
+        loads["links"] = len((await session.execute(select(proposition_parent))).all())
+    await engine.dispose()
+    return loads
+
+
+def test_relationships_are_not_loaded_implicitly():
+    print("🧪 Testing slim proposition loading...")
+    loads = asyncio.run(_load_paths())
+
+    statements, instances = loads["entity"]
+    assert statements == 1
+    assert instances == {"Proposition": 3}
+    assert loads["raises"]
+
+    statements, instances, fields = loads["summary"]
+    assert statements == 1 and instances == {}
+    assert fields == ("id", "text", "reasoning", "confidence", "created_at")
+
+    found, instances = loads["search"]
+    assert found >= 1
+    assert "Observation" not in instances
+
+    observations, parents, instances = loads["explicit"]
+    assert (observations, parents) == (LINKED, 2)
+    assert instances["Observation"] == LINKED
+    assert loads["links"] == 2
+    print(f"✅ Listing and search loaded 0 of {LINKED} linked observations")
+
+
+if __name__ == "__main__":
+    test_relationships_are_not_loaded_implicitly()
+    print("🎉 All slim loading tests passed!")
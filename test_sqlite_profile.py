@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for SQLite performance profiles and WAL maintenance.
+
+Every pooled connection must carry the profile's PRAGMAs, and the
+maintenance round must shrink a WAL that grew past its limit.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import insert
+
+from gum.db_maintenance import DatabaseMaintenance, wal_size
+from gum.models import SQLITE_PROFILES, Proposition, init_db, resolve_sqlite_profile
+from gum.storage import create_reader
+
+PRAGMAS = ("synchronous", "cache_size", "mmap_size", "temp_store",
+           "wal_autocheckpoint", "journal_size_limit", "page_size")
+
+
+async def _pragmas(engine):
+    async with engine.connect() as conn:
+        return {
+            name: (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar()
+            for name in PRAGMAS
+        }
+
+
+async def _profile(name):
+    engine, _Session = await init_db("profile.db", tempfile.mkdtemp(), sqlite_profile=name)
+    reader, _ReadSession = create_reader(engine, sqlite_profile=name)
+    writer_pragmas, reader_pragmas = await _pragmas(engine), await _pragmas(reader)
+    await reader.dispose()
+    await engine.dispose()
+    return writer_pragmas, reader_pragmas
+
+
+def test_profiles_apply_to_every_connection():
+    print("🧪 Testing SQLite profiles...")
+    synchronous = {"FULL": 2, "NORMAL": 1, "OFF": 0}
+    for name, settings in SQLITE_PROFILES.items():
+        for pragmas in asyncio.run(_profile(name)):
+            assert pragmas["synchronous"] == synchronous[settings["synchronous"]], name
+            assert pragmas["cache_size"] == settings["cache_size"]
+            assert pragmas["wal_autocheckpoint"] == settings["wal_autocheckpoint"]
+            assert pragmas["journal_size_limit"] == settings["journal_size_limit"]
+            assert pragmas["page_size"] == settings["page_size"]
+    try:
+        resolve_sqlite_profile("fastest")
+        raise AssertionError("unknown profile accepted")
+    except ValueError:
+        pass
+    print("✅ SQLite profiles passed")
+
+
+async def _grow_and_truncate():
+    engine, Session = await init_db("wal.db", tempfile.mkdtemp(), sqlite_profile="throughput")
+    async with Session() as session, session.begin():
+        await session.execute(insert(Proposition), [
+            dict(text="User reviews a pull request " * 20, reasoning="r" * 200,
+                 revision_group=f"g{i}") for i in range(2000)
+        ])
+    grown = wal_size(engine)
+    maintenance = DatabaseMaintenance(engine, wal_limit_bytes=grown // 2)
+    round_ = await maintenance.run_once(optimize_now=True)
+    await engine.dispose()
+    return grown, round_, maintenance.stats
+
+
+def test_maintenance_truncates_wal():
+    print("🧪 Testing WAL maintenance...")
+    grown, round_, stats = asyncio.run(_grow_and_truncate())
+    assert grown > 0 and round_["before"] == grown
+    assert round_["after"] == 0
+    assert stats["truncations"] == 1 and stats["optimizes"] == 1
+    print(f"✅ WAL truncated from {grown} bytes")
+
+
+if __name__ == "__main__":
+    test_profiles_apply_to_every_connection()
+    test_maintenance_truncates_wal()
+    print("🎉 All SQLite profile tests passed!")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test script for the read-only pool and the single writer task.
+
+Concurrent writes must be committed in shared transactions, a failing write
+must not take its batch down, and reader connections must refuse writes.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import OperationalError
+
+from gum import gum
+from gum.models import Proposition, init_db
+from gum.storage import SQLiteWriter, create_reader
+
+
+def _insert(i):
+    async def mutation(session):
+        prop = Proposition(text=f"User note {i}", reasoning="r", revision_group=f"g{i}")
+        session.add(prop)
+        await session.flush()
+        if i == 7:
+            raise ValueError("rejected")
+        return prop.id
+    return mutation
+
+
+async def _group_commit():
+    engine, Session = await init_db("writer.db", tempfile.mkdtemp())
+    reader, ReadSession = create_reader(engine)
+    writer = SQLiteWriter(Session)
+    results = await asyncio.gather(
+        *(writer.submit(_insert(i)) for i in range(100)), return_exceptions=True
+    )
+    async with ReadSession() as session:
+        count = (await session.execute(select(func.count(Proposition.id)))).scalar()
+        try:
+            await session.execute(text("DELETE FROM propositions"))
+            refused = False
+        except OperationalError:
+            refused = True
+    await writer.stop()
+    await reader.dispose()
+    await engine.dispose()
+    return results, count, refused, writer.stats
+
+
+def test_group_commit():
+    print("🧪 Testing group commit...")
+    results, count, refused, stats = asyncio.run(_group_commit())
+    assert isinstance(results[7], ValueError)
+    assert all(isinstance(r, int) for i, r in enumerate(results) if i != 7)
+    assert count == 99
+    assert stats["mutations"] == 100 and stats["failed"] == 1
+    assert stats["batches"] < 10
+    assert refused
+    print(f"✅ 100 writes in {stats['batches']} commits, reader refused writes")
+
+
+async def _exclusive_between_batches():
+    engine, Session = await init_db("exclusive.db", tempfile.mkdtemp())
+    writer = SQLiteWriter(Session)
+    order = []
+
+    def _mark(i):
+        async def mutation(session):
+            order.append(i)
+        return mutation
+
+    async def checkpoint(conn):
+        # autocommit and no batch open, so the WAL can be reset
+        order.append("checkpoint")
+        return (await conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")).one()[0]
+
+    results = await asyncio.gather(
+        writer.submit(_mark(1)), writer.run_exclusive(checkpoint), writer.submit(_mark(2))
+    )
+    await writer.stop()
+    await engine.dispose()
+    return results, order, writer.stats
+
+
+def test_run_exclusive_between_batches():
+    print("🧪 Testing exclusive writer operations...")
+    results, order, stats = asyncio.run(_exclusive_between_batches())
+    assert results[1] == 0          # not busy: nothing held the write lock
+    assert order == [1, "checkpoint", 2]
+    assert stats["batches"] == 2
+    print("✅ Exclusive operations run between batches")
+
+
+async def _mixed_load(use_writer, clients=8, rounds=25):
+    engine, Session = await init_db("mixed.db", tempfile.mkdtemp())
+    reader, ReadSession = create_reader(engine)
+    writer = SQLiteWriter(Session)
+    write_ms, read_ms = [], []
+
+    async def write_client(c):
+        for r in range(rounds):
+            started = time.perf_counter()
+            if use_writer:
+                await writer.submit(_insert(1000 + c * rounds + r))
+            else:
+                async with Session() as session, session.begin():
+                    await _insert(1000 + c * rounds + r)(session)
+            write_ms.append((time.perf_counter() - started) * 1000)
+
+    async def read_client():
+        for _ in range(rounds):
+            started = time.perf_counter()
+            async with (ReadSession() if use_writer else Session()) as session:
+                await session.execute(
+                    select(Proposition).order_by(Proposition.created_at.desc()).limit(20)
+                )
+            read_ms.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(
+        *(write_client(c) for c in range(clients)), *(read_client() for _ in range(clients))
+    )
+    await writer.stop()
+    await reader.dispose()
+    await engine.dispose()
+    return float(np.mean(write_ms)), float(np.percentile(read_ms, 99))
+
+
+def benchmark():
+    """Mean write latency and p99 read latency, direct sessions vs reader pool + writer."""
+    return {
+        "direct": asyncio.run(_mixed_load(use_writer=False)),
+        "writer": asyncio.run(_mixed_load(use_writer=True)),
+    }
+
+
+def test_mixed_load():
+    print("🧪 Benchmarking mixed read/write load...")
+    for name, (write_mean, read_p99) in benchmark().items():
+        print(f"   {name:<7} write mean {write_mean:7.1f}ms   read p99 {read_p99:7.1f}ms")
+    print("✅ Mixed load completed")
+
+
+async def _gum_sessions():
+    g = gum("TestUser", "test-model", data_directory=tempfile.mkdtemp(),
+            fts_maintenance_interval=None, verbosity=logging.WARNING)
+    await g.connect_db()
+
+    async def add(session):
+        session.add(Proposition(text="User likes tea", reasoning="r", revision_group="tea"))
+
+    await g.write(add)
+    async with g._read_session() as session:
+        rows = (await session.execute(select(Proposition.text))).scalars().all()
+        read_only = session.info.get("read_only")
+    stats = g.write_stats
+    await g.__aexit__(None, None, None)
+    try:
+        await g.write(add)
+        restarted = True
+    except RuntimeError:
+        restarted = False
+    return rows, read_only, stats, restarted
+
+
+def test_gum_routes_writes_through_writer():
+    print("🧪 Testing gum reader/writer sessions...")
+    rows, read_only, stats, restarted = asyncio.run(_gum_sessions())
+    assert rows == ["User likes tea"]
+    assert read_only is True
+    assert stats["mutations"] == 1
+    # a stopped writer refuses work instead of starting a task nobody joins
+    assert not restarted
+    print("✅ gum reader/writer sessions passed")
+
+
+if __name__ == "__main__":
+    test_group_commit()
+    test_run_exclusive_between_batches()
+    test_mixed_load()
+    test_gum_routes_writes_through_writer()
+    print("🎉 All storage tests passed!")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared structured-output parser.
+
+Feeds typical malformed model replies (markdown fences, prose, dangling
+commas, truncated output) through decode_json / parse_structured.
+"""
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gum.schemas import PropositionSchema, RelationSchema
+from gum.structured_output import (
+    decode_json,
+    get_parse_stats,
+    parse_structured,
+    reset_parse_stats,
+)
+
+PROP = '{"proposition": "User writes Python", "reasoning": "VS Code", "confidence": 7, "decay": 3}'
+
+
+def test_decode_variants():
+    print("🧪 Testing tolerant decoding...")
+    reset_parse_stats()
+    assert decode_json('{"a": [1, 2]}') == {"a": [1, 2]}
+    assert decode_json('```json\n{"a": [1, 2,],}\n```') == {"a": [1, 2]}
+    assert decode_json('See [note]: here you go {"a": "b [c]"} thanks') == {"a": "b [c]"}
+    assert decode_json('{"a": [{"b": 1}, {"b": "tru') == {"a": [{"b": 1}]}
+    assert decode_json("no json at all") is None
+
+    stats = get_parse_stats()
+    assert stats["direct"] == 1 and stats["fenced"] == 1 and stats["extracted"] == 2
+    assert stats["trailing_commas"] == 1 and stats["truncated"] == 1 and stats["failed"] == 1
+    print("✅ Tolerant decoding passed")
+
+
+def test_truncated_propositions_are_salvaged():
+    print("🧪 Testing truncated proposition output...")
+    reply = '```json\n{"propositions": [' + PROP + ', {"proposition": "User reads do'
+    parsed = parse_structured(reply, PropositionSchema)
+    assert parsed is not None
+    assert [p.proposition for p in parsed.propositions] == ["User writes Python"]
+    print("✅ Truncated propositions passed")
+
+
+def test_invalid_items_dropped():
+    print("🧪 Testing schema validation...")
+    reset_parse_stats()
+    reply = '[{"source": 1, "label": "SIMILAR", "target": [2]}, {"source": 3, "label": "MAYBE"}]'
+    parsed = parse_structured(reply, RelationSchema)
+    assert [r.source for r in parsed.relations] == [1]
+    assert get_parse_stats()["dropped_items"] == 1
+    assert parse_structured('"just a string"', RelationSchema) is None
+    print("✅ Schema validation passed")
+
+
+if __name__ == "__main__":
+    test_decode_variants()
+    test_truncated_propositions_are_salvaged()
+    test_invalid_items_dropped()
+    print("🎉 All structured output tests passed!")
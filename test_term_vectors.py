@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for stored proposition term vectors.
+
+Checks that linking observations keeps the side table current, that vectors
+missing from older databases are filled in on demand, and that MMR re-ranking
+still spreads results across distinct topics.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sqlalchemy import delete, select
+
+from gum.db_utils import LinkBatch, search_propositions_bm25
+from gum.models import Observation, Proposition, init_db, proposition_vectors
+from gum.term_vectors import MAX_OBSERVATIONS, load_term_matrix
+
+TOPICS = [
+    ("User is debugging asyncio code", "They read asyncio event loop docs"),
+    ("User is debugging asyncio tasks", "They read asyncio task cancellation docs"),
+    ("User is planning a trip to Lisbon", "They compared flights to Lisbon"),
+]
+
+
+async def _setup():
+    engine, Session = await init_db("vectors.db", tempfile.mkdtemp())
+    async with Session() as session, session.begin():
+        props = [
+            Proposition(text=t, reasoning=r, confidence=5, decay=0, revision_group=f"g{i}")
+            for i, (t, r) in enumerate(TOPICS)
+        ]
+        obs = [
+            Observation(observer_name="Screen", content=f"asyncio stack trace {i}",
+                        content_type="input_text")
+            for i in range(MAX_OBSERVATIONS + 2)
+        ]
+        session.add_all(props + obs)
+        await session.flush()
+        await LinkBatch().add((o.id for o in obs), [props[0].id]).flush(session)
+        await LinkBatch().add([obs[0].id], [props[1].id, props[2].id]).flush(session)
+    return engine, Session, [p.id for p in props]
+
+
+async def _maintained():
+    engine, Session, ids = await _setup()
+    async with Session() as session:
+        rows = {r.proposition_id: r for r in await session.execute(select(proposition_vectors))}
+    await engine.dispose()
+    return ids, rows
+
+
+async def _lazy_fill_and_mmr():
+    engine, Session, ids = await _setup()
+    async with Session() as session, session.begin():
+        await session.execute(delete(proposition_vectors))
+
+    async with Session() as session, session.begin():
+        matrix = await load_term_matrix(session, ids, include_observations=False)
+        refilled = len((await session.execute(select(proposition_vectors))).all())
+        hits = await search_propositions_bm25(
+            session, "asyncio Lisbon", limit=2, include_observations=False, enable_decay=False)
+    await engine.dispose()
+    return matrix, refilled, hits
+
+
+def test_vectors_follow_links():
+    print("🧪 Testing term-vector maintenance...")
+    ids, rows = asyncio.run(_maintained())
+    assert set(rows) == set(ids)
+    # observations beyond the cap are not folded in
+    assert rows[ids[0]].obs_count == MAX_OBSERVATIONS
+    assert rows[ids[2]].obs_count == 1
+    print("✅ Term-vector maintenance passed")
+
+
+def test_lazy_fill_matches_tfidf():
+    print("🧪 Testing on-demand vectors and MMR...")
+    matrix, refilled, hits = asyncio.run(_lazy_fill_and_mmr())
+    assert refilled == len(TOPICS)
+
+    docs = [f"{t} {r}" for t, r in TOPICS]
+    ref = TfidfVectorizer().fit_transform(docs)
+    expected = (ref @ ref.T).toarray()
+    got = (matrix @ matrix.T).toarray()
+    assert np.allclose(got, expected, atol=1e-4)
+
+    # the two asyncio propositions are near-duplicates; MMR keeps one of them
+    texts = [p.text for p, _ in hits]
+    assert any("Lisbon" in t for t in texts)
+    print("✅ On-demand vectors and MMR passed")
+
+
+if __name__ == "__main__":
+    test_vectors_follow_links()
+    test_lazy_fill_matches_tfidf()
+    print("🎉 All term-vector tests passed!")
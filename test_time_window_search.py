@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for time-window search plans and the created_at indexes.
+
+Narrow windows are searched range-first (created_at index, then FTS probes),
+wide ones FTS-first; both must return the propositions inside the window,
+including those that only match through an observation.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import insert, text
+
+from gum.db_utils import plan_time_window, search_propositions_bm25
+from gum.models import Observation, Proposition, init_db, observation_proposition
+from gum.search_profile import SearchProfile
+
+HOURS = 300
+
+
+async def _seed(Session, now):
+    async with Session() as session, session.begin():
+        await session.execute(insert(Proposition), [
+            dict(text=f"User edits chess notes {i}" if i % 2 else f"User writes report {i}",
+                 reasoning="from the screen", confidence=i % 10, decay=1,
+                 revision_group=f"g{i}", created_at=now - timedelta(hours=i, minutes=30))
+            for i in range(HOURS)
+        ])
+        await session.execute(insert(Observation), [
+            dict(observer_name="Screen", content=f"chess board {i}", content_type="input_text",
+                 created_at=now - timedelta(hours=i, minutes=30))
+            for i in range(HOURS)
+        ])
+        await session.execute(insert(observation_proposition), [
+            dict(observation_id=i + 1, proposition_id=i + 1) for i in range(HOURS)
+        ])
+
+
+async def _run():
+    engine, Session = await init_db("window.db", tempfile.mkdtemp())
+    now = datetime.now(timezone.utc)
+    await _seed(Session, now)
+    day = now - timedelta(days=1)
+    out = {}
+    async with Session() as session:
+        out["plans"] = (
+            await plan_time_window(session, day, now),
+            await plan_time_window(session, None, now),
+            await plan_time_window(session, now - timedelta(days=30), now, max_rows=100),
+        )
+        for include_observations in (True, False):
+            for start in (day, now - timedelta(days=30)):
+                profile = SearchProfile()
+                hits = await search_propositions_bm25(
+                    session, "chess", limit=HOURS, start_time=start, enable_mmr=False,
+                    include_observations=include_observations, profile=profile)
+                out[include_observations, start is day] = (
+                    profile.strategy, {p.revision_group for p, _ in hits}, profile.plan)
+
+        out["day_view"] = (await session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM observations "
+            "WHERE created_at >= '2025-01-01' AND created_at < '2025-01-02' ORDER BY created_at"
+        ))).all()[-1][-1]
+    await engine.dispose()
+    return out
+
+
+def test_window_plans():
+    print("🧪 Testing time-window search plans...")
+    out = asyncio.run(_run())
+    assert out["plans"] == ("range", "fts", "fts")
+
+    in_day = {f"g{i}" for i in range(24)}
+    strategy, groups, plan = out[True, True]
+    assert strategy == "range"
+    # every proposition in the day matches, the even ones only through observations
+    assert groups == in_day
+    assert any("ix_propositions_leaf_created" in line for line in plan)
+
+    strategy, groups, _plan = out[False, True]
+    assert strategy == "range"
+    assert groups == {g for g in in_day if int(g[1:]) % 2}
+
+    strategy, groups, _plan = out[True, False]
+    assert strategy == "range"
+    assert len(groups) == HOURS
+    assert "ix_observations_created" in out["day_view"]
+    print("✅ Time-window search plans passed")
+
+
+if __name__ == "__main__":
+    test_window_plans()
+    print("🎉 All time-window search tests passed!")
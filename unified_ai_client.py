@@ -11,7 +11,7 @@ import asyncio
 import logging
 import random
 import time
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 from dotenv import load_dotenv
 
 # Import aiohttp for error handling
@@ -24,6 +24,7 @@ except ImportError:
 from azure_text_client import azure_text_completion
 from openai_text_client import openai_text_completion
 from openrouter_vision_client import openrouter_vision_completion
+from llm_cache import ResponseCache, cache_from_env
 import os
 
 # Load environment variables at module level
@@ -41,7 +42,8 @@ class UnifiedAIClient:
                  base_delay: float = 1.0,
                  max_delay: float = 60.0,
                  backoff_factor: float = 2.0,
-                 jitter_factor: float = 0.1):
+                 jitter_factor: float = 0.1,
+                 cache: Optional[ResponseCache] = None):
         """
         Initialize the unified AI client with retry configuration.
         
@@ -51,12 +53,19 @@ class UnifiedAIClient:
             max_delay: Maximum delay in seconds between retries
             backoff_factor: Exponential backoff multiplier
             jitter_factor: Random jitter factor to avoid thundering herd
+            cache: Response cache used by calls made with cache=True
         """
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.backoff_factor = backoff_factor
         self.jitter_factor = jitter_factor
+        self.cache = cache
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Structured output (response_format) is requested unless disabled or
+        # the provider has rejected it once
+        self.structured_output = os.getenv("STRUCTURED_OUTPUT", "true").lower() not in ("0", "false", "no")
         
         # Get text provider from environment (default to azure)
         self.text_provider = os.getenv("TEXT_PROVIDER", "azure").lower()
@@ -155,11 +164,19 @@ class UnifiedAIClient:
         # Don't retry on authentication errors, invalid requests, etc.
         return False
 
+    def _text_model(self) -> str:
+        if self.text_provider == "openai":
+            return os.getenv("OPENAI_MODEL", "gpt-4o")
+        return os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o")
+
     async def text_completion(
         self,
         messages: List[Dict[str, Any]],
         max_tokens: int = 1000,
-        temperature: float = 0.1
+        temperature: float = 0.1,
+        cache: bool = False,
+        response_format: Optional[Dict[str, Any]] = None,
+        validate: Optional[Callable[[str], bool]] = None
     ) -> str:
         """
         Handle text-only completion using the configured text provider.
@@ -168,20 +185,88 @@ class UnifiedAIClient:
             messages: List of message dictionaries (standard OpenAI format)
             max_tokens: Maximum tokens to generate
             temperature: Temperature for generation
+            cache: Serve identical requests from the response cache. Only
+                opt in for deterministic prompts.
+            response_format: JSON-schema output request, sent to providers that
+                accept it and silently dropped otherwise
+            validate: With cache=True, called with each response; only responses
+                it accepts are cached, and a cached one it rejects is fetched again.
+                Without it, any non-empty response is cached
             
         Returns:
             The AI response content as a string
         """
-        if self.text_provider == "openai":
-            logger.info("Routing to OpenAI for text completion")
-            return await openai_text_completion(
+        if not self.structured_output:
+            response_format = None
+
+        if not cache or self.cache is None:
+            return await self._text_completion(messages, max_tokens, temperature, response_format)
+
+        key = ResponseCache.make_key(
+            self.text_provider, self._text_model(), messages,
+            max_tokens=max_tokens, temperature=temperature, response_format=response_format
+        )
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            if validate is None or validate(cached):
+                return cached
+            await self.cache.adiscard(key)
+
+        # identical requests already on the wire share one provider call
+        pending = self._inflight.get(key)
+        if pending is not None:
+            response = await asyncio.shield(pending)
+            if validate is not None:
+                validate(response)
+            return response
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self._text_completion(messages, max_tokens, temperature, response_format)
+            # a response that does not parse would be replayed on every retry
+            if response and (validate is None or validate(response)):
+                await self.cache.aput(key, response)
+            future.set_result(response)
+            return response
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # mark retrieved so a request without followers does not warn
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics of the response cache (empty if caching is off)."""
+        return self.cache.get_stats() if self.cache is not None else {}
+
+    async def _text_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        max_tokens: int,
+        temperature: float,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> str:
+        completion = openai_text_completion if self.text_provider == "openai" else azure_text_completion
+        logger.info(f"Routing to {'OpenAI' if self.text_provider == 'openai' else 'Azure OpenAI'} for text completion")
+        try:
+            return await completion(
                 messages=messages,
                 max_tokens=max_tokens,
-                temperature=temperature
+                temperature=temperature,
+                response_format=response_format
             )
-        else:  # Default to Azure OpenAI
-            logger.info("Routing to Azure OpenAI for text completion")
-            return await azure_text_completion(
+        except Exception as e:
+            # Older API versions / deployments reject response_format; stop sending it
+            if response_format is None or "response_format" not in str(e):
+                raise
+            logger.warning("Provider rejected response_format; falling back to plain JSON prompting")
+            self.structured_output = False
+            return await completion(
                 messages=messages,
                 max_tokens=max_tokens,
                 temperature=temperature
@@ -311,7 +396,7 @@ async def get_unified_client() -> UnifiedAIClient:
     """Get the global unified AI client instance."""
     global _unified_client
     if _unified_client is None:
-        _unified_client = UnifiedAIClient()
+        _unified_client = UnifiedAIClient(cache=cache_from_env())
     return _unified_client
 
 